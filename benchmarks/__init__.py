@@ -0,0 +1 @@
+"""pyiCloud benchmarks."""
@@ -0,0 +1,166 @@
+"""Runs the benchmarks, saves their results and compares them to saved ones.
+
+Usage:
+    python -m benchmarks                        # all the benchmarks
+    python -m benchmarks photos drive           # some of them
+    python -m benchmarks --save                 # to benchmarks/results/
+    python -m benchmarks --compare main         # to a commit, run first
+    python -m benchmarks --compare benchmarks/results/vm.json
+
+Timings are only comparable on one machine, under the same load: compare
+to a commit, run back to back with the working tree, rather than to saved
+results. Saved results are kept per machine, and not checked in.
+"""
+import argparse
+from datetime import datetime, timezone
+from importlib import import_module
+import json
+from os import makedirs, path
+import platform
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+from .common import RESULTS
+
+SUITES = (
+    "auth",
+    "session",
+    "findmyiphone",
+    "photos",
+    "drive",
+    "services",
+    "codec",
+)
+
+RESULTS_DIRECTORY = path.join(path.dirname(__file__), "results")
+
+
+def _get_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(filename):
+    """Saves the results, with the machine and commit they were measured
+    on."""
+    directory = path.dirname(filename)
+    if directory:
+        makedirs(directory, exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as results_file:
+        json.dump(
+            {
+                "date": datetime.now(timezone.utc).isoformat(),
+                "commit": _get_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.node(),
+                "results": RESULTS,
+            },
+            results_file,
+            indent=2,
+            sort_keys=True,
+        )
+        results_file.write("\n")
+    print(f"Results saved to {filename}")
+
+
+def run_commit(ref, suites, filename):
+    """Runs the benchmarks of a commit, in a temporary worktree, saving
+    their results."""
+    root = path.dirname(path.dirname(path.abspath(__file__)))
+    with TemporaryDirectory() as directory:
+        worktree = path.join(directory, "worktree")
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", worktree, ref],
+            check=True,
+            cwd=root,
+        )
+        try:
+            print(f"\n[{ref}]")
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks", "--save", filename, *suites],
+                check=True,
+                cwd=worktree,
+            )
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", worktree],
+                check=False,
+                cwd=root,
+            )
+
+
+def compare(filename, threshold):
+    """Prints the results against saved ones, returns the regressions slower
+    than `threshold` (a ratio)."""
+    with open(filename, encoding="utf-8") as results_file:
+        baseline = json.load(results_file)
+    print(f"\nCompared to {filename} ({baseline.get('commit')}, {baseline['date']})")
+
+    regressions = []
+    for name, seconds in RESULTS.items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        ratio = seconds / before
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<60} {ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    """Runs the benchmarks."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("suites", nargs="*", metavar="suite", help=", ".join(SUITES))
+    parser.add_argument(
+        "--save",
+        nargs="?",
+        const=path.join(RESULTS_DIRECTORY, f"{platform.node() or 'results'}.json"),
+        help="save the results, to benchmarks/results/<machine>.json by default",
+    )
+    parser.add_argument(
+        "--compare",
+        help="compare the results to saved ones, or to a commit run first",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="slowdown reported as a regression (default: 0.2, 20%%)",
+    )
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite {suite!r}")
+
+    with TemporaryDirectory() as directory:
+        baseline = args.compare
+        if baseline and not path.exists(baseline):
+            baseline = path.join(directory, "baseline.json")
+            run_commit(args.compare, args.suites, baseline)
+
+        for suite in args.suites or SUITES:
+            print(f"\n[{suite}]")
+            import_module(f".bench_{suite}", __package__).main()
+
+        if args.save:
+            save(args.save)
+        if baseline and compare(baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
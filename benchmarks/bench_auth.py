@@ -0,0 +1,67 @@
+"""Session construction and authentication, against recorded responses.
+
+Run with ``python -m benchmarks.bench_auth``.
+"""
+
+from pyicloud.base import PyiCloudService
+from pyicloud.store import MemorySessionStore
+
+from tests.const import AUTHENTICATED_USER, VALID_PASSWORD
+from tests.const_login import AUTH_OK, LOGIN_WORKING
+
+from .common import FixtureAdapter, measure, report
+
+
+def create_adapter():
+    """Returns an adapter answering the authentication requests."""
+    return FixtureAdapter(
+        {
+            "/signin": AUTH_OK,
+            "/accountLogin": LOGIN_WORKING,
+            "/validate": LOGIN_WORKING,
+        },
+        headers={"X-Apple-Session-Token": "token", "scnt": "scnt"},
+    )
+
+
+def create_service(adapter, session_store=None):
+    """Returns a service authenticated through an adapter."""
+    return PyiCloudService(
+        AUTHENTICATED_USER,
+        VALID_PASSWORD,
+        session_store=session_store or MemorySessionStore(),
+        transport_adapter=adapter,
+    )
+
+
+def _create_and_close(adapter, session_store=None):
+    create_service(adapter, session_store).close()
+
+
+def main():
+    """Runs the benchmarks."""
+    adapter = create_adapter()
+    report(
+        "PyiCloudService(), signing in",
+        measure(lambda: _create_and_close(adapter), number=100),
+    )
+
+    # The session token saved by the first service is validated by the others
+    session_store = MemorySessionStore()
+    _create_and_close(adapter, session_store)
+    report(
+        "PyiCloudService(), validating the session",
+        measure(lambda: _create_and_close(adapter, session_store), number=100),
+    )
+
+    api = create_service(adapter)
+    report("authenticate(), validating the session", measure(api.authenticate))
+    report(
+        "authenticate(force_refresh=True)",
+        measure(lambda: api.authenticate(force_refresh=True)),
+    )
+    api.close()
+
+
+if __name__ == "__main__":
+    main()
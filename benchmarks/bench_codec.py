@@ -0,0 +1,44 @@
+"""JSON codecs on recorded iCloud payloads.
+
+Run with ``python -m benchmarks.bench_codec``.
+"""
+from pyicloud.codec import CODECS
+
+from tests.const_drive import DRIVE_FOLDER_WORKING, DRIVE_ROOT_WORKING
+from tests.const_findmyiphone import FMI_FAMILY_WORKING
+
+from .common import measure, report
+
+PAYLOADS = {
+    "refreshClient (findmyiphone)": FMI_FAMILY_WORKING,
+    "retrieveItemDetailsInFolders root (drive)": DRIVE_ROOT_WORKING,
+    "retrieveItemDetailsInFolders folder (drive)": DRIVE_FOLDER_WORKING,
+}
+
+
+def main():
+    """Runs the benchmark."""
+    # pylint: disable=cell-var-from-loop
+    codecs = []
+    for codec_class in CODECS.values():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            print(f"{codec_class.name} is not installed")
+
+    for payload_name, payload in PAYLOADS.items():
+        encoded = CODECS["json"]().dumps(payload).encode()
+        print(f"{payload_name}, {len(encoded)} bytes")
+        for codec in codecs:
+            report(
+                f"{codec.name} loads, {payload_name}",
+                measure(lambda: codec.loads(encoded)),
+            )
+            report(
+                f"{codec.name} dumps, {payload_name}",
+                measure(lambda: codec.dumps(payload)),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""iCloud Drive tree walk, over a synthetic tree.
+
+Run with ``python -m benchmarks.bench_drive``.
+"""
+import json
+
+from pyicloud.services.drive import DriveService
+
+from .bench_auth import create_adapter, create_service
+from .common import FixtureAdapter, measure, report
+
+DEPTH = 3
+FOLDERS_PER_FOLDER = 5
+FILES_PER_FOLDER = 20
+URL = "https://p31-drivews.icloud.com:443"
+DOCUMENT_URL = "https://p31-docws.icloud.com:443"
+
+
+def _item(docwsid, parent_id, name, item_type):
+    item = {
+        "drivewsid": f"{item_type}::com.apple.CloudDocs::{docwsid}",
+        "docwsid": docwsid,
+        "zone": "com.apple.CloudDocs",
+        "name": name,
+        "parentId": parent_id,
+        "dateCreated": "2020-04-27T21:37:36Z",
+        "etag": "1",
+        "type": item_type,
+    }
+    if item_type == "FILE":
+        item.update(
+            {
+                "extension": "txt",
+                "dateModified": "2020-04-27T21:37:36Z",
+                "dateChanged": "2020-04-27T21:37:36Z",
+                "size": 1024,
+            }
+        )
+    return item
+
+
+def create_tree():
+    """Returns the encoded retrieveItemDetailsInFolders responses of the
+    folders, by drivewsid."""
+    folders = {}
+
+    def add_folder(docwsid, depth):
+        drivewsid = f"FOLDER::com.apple.CloudDocs::{docwsid}"
+        items = [
+            _item(f"{docwsid}-file{index}", drivewsid, f"file{index}", "FILE")
+            for index in range(FILES_PER_FOLDER)
+        ]
+        if depth < DEPTH:
+            for index in range(FOLDERS_PER_FOLDER):
+                child = f"{docwsid}-{index}"
+                items.append(_item(child, drivewsid, f"folder{index}", "FOLDER"))
+                add_folder(child, depth + 1)
+        folder = dict(_item(docwsid, None, docwsid, "FOLDER"), items=items)
+        folders[drivewsid] = json.dumps([folder]).encode()
+
+    add_folder("root", 0)
+    return folders
+
+
+def create_drive_adapter():
+    """Returns an adapter serving the synthetic tree."""
+    folders = create_tree()
+    return FixtureAdapter(
+        {
+            "/retrieveItemDetailsInFolders": lambda request: folders[
+                json.loads(request.body)[0]["drivewsid"]
+            ]
+        }
+    )
+
+
+def walk(node):
+    """Returns the number of nodes under a node."""
+    count = 1
+    if node.type != "file":
+        for child in node.get_children():
+            count += walk(child)
+    return count
+
+
+def main():
+    """Runs the benchmarks."""
+    api = create_service(create_adapter())
+    api.session.mount_transport(create_drive_adapter())
+    folder_count = len(create_tree())
+    report(
+        f"Drive tree walk, {folder_count} folders",
+        measure(
+            lambda: walk(DriveService(URL, DOCUMENT_URL, api.session, api.params).root),
+            number=5,
+        ),
+    )
+    api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Find My iPhone refreshClient parsing, for 1 to 500 devices.
+
+Run with ``python -m benchmarks.bench_findmyiphone``.
+"""
+import copy
+
+from pyicloud.services.findmyiphone import FindMyiPhoneServiceManager
+
+from tests.const_findmyiphone import FMI_FAMILY_WORKING
+
+from .bench_auth import create_adapter, create_service
+from .common import FixtureAdapter, measure, report
+
+DEVICE_COUNTS = (1, 50, 500)
+URL = "https://p31-fmipweb.icloud.com:443"
+
+
+def refresh_client_payload(device_count):
+    """Returns a refreshClient response listing `device_count` devices."""
+    devices = FMI_FAMILY_WORKING["content"]
+    payload = copy.deepcopy(FMI_FAMILY_WORKING)
+    payload["content"] = []
+    for index in range(device_count):
+        device = copy.deepcopy(devices[index % len(devices)])
+        device["id"] = f"device-{index}"
+        payload["content"].append(device)
+    return payload
+
+
+def main():
+    """Runs the benchmarks."""
+    # pylint: disable=cell-var-from-loop
+    api = create_service(create_adapter())
+    for device_count in DEVICE_COUNTS:
+        api.session.mount_transport(
+            FixtureAdapter({"/refreshClient": refresh_client_payload(device_count)})
+        )
+        number = max(10, 1000 // device_count)
+        report(
+            f"refreshClient, {device_count} devices (new manager)",
+            measure(
+                lambda: FindMyiPhoneServiceManager(URL, api.session, api.params),
+                number=number,
+            ),
+        )
+        manager = FindMyiPhoneServiceManager(URL, api.session, api.params)
+        report(
+            f"refreshClient, {device_count} devices (refresh)",
+            measure(manager.refresh_client, number=number),
+        )
+    api.close()
+
+
+if __name__ == "__main__":
+    main()
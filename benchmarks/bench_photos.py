@@ -0,0 +1,181 @@
+"""Photo library paging and parsing, over a synthetic library.
+
+Run with ``python -m benchmarks.bench_photos``.
+"""
+
+import json
+import tracemalloc
+
+from pyicloud.services.photos import PROJECTIONS, PhotoAsset, PhotosService
+
+from tests.server import photo_records
+
+from .bench_auth import create_adapter, create_service
+from .common import FixtureAdapter, measure, report
+
+PHOTO_COUNT = 100000
+PAGE_SIZE = 100
+# Photos listed with a simulated round trip time, serially and prefetched
+LATENCY_PHOTO_COUNT = 10000
+LATENCY = 0.02
+PREFETCH = 8
+# Distinct pages served, in turn, for the whole library
+PAGE_COUNT = 10
+URL = "https://p31-ckdatabasews.icloud.com:443"
+BASE_URL = "https://cvws.icloud-content.com"
+
+INDEXING_STATE = json.dumps(
+    {"records": [{"fields": {"state": {"value": "FINISHED"}}}]}
+).encode()
+EMPTY_PAGE = json.dumps({"records": []}).encode()
+
+
+def create_pages(desired_keys=None):
+    """Returns the encoded pages of the library, with the `desired_keys`
+    fields only if given."""
+    pages = []
+    for page in range(PAGE_COUNT):
+        records = []
+        for index in range(page * PAGE_SIZE, (page + 1) * PAGE_SIZE):
+            records.extend(
+                photo_records(index, BASE_URL, 2 * 1024 * 1024, desired_keys)
+            )
+        pages.append(json.dumps({"records": records}).encode())
+    return pages
+
+
+def create_photos_adapter(photo_count=PHOTO_COUNT, latency=0):
+    """Returns an adapter serving a synthetic library of `photo_count`
+    photos."""
+    pages = {}
+
+    def query(request):
+        body = json.loads(request.body)
+        if body["query"]["recordType"] == "CheckIndexingState":
+            return INDEXING_STATE
+        if body["query"]["recordType"] == "CPLAlbumByPositionLive":
+            return EMPTY_PAGE
+        offset = body["query"]["filterBy"][0]["fieldValue"]["value"]
+        if not 0 <= offset < photo_count:
+            return EMPTY_PAGE
+        desired_keys = frozenset(body["desiredKeys"])
+        if desired_keys not in pages:
+            pages[desired_keys] = create_pages(desired_keys)
+        return pages[desired_keys][offset // PAGE_SIZE % PAGE_COUNT]
+
+    count = {"itemCount": {"value": photo_count}}
+    return FixtureAdapter(
+        {
+            "/records/query/batch": {"batch": [{"records": [{"fields": count}]}]},
+            "/records/query": query,
+        },
+        latency=latency,
+    )
+
+
+def _iterate(album, photo_count=PHOTO_COUNT):
+    count = 0
+    for _ in album.photos:
+        count += 1
+    assert count == photo_count, count
+
+
+def _measure_memory(func):
+    """Returns the memory allocated by func and still held by its result,
+    in bytes."""
+    tracemalloc.start()
+    try:
+        result = func()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    """Runs the benchmarks."""
+    # pylint: disable=cell-var-from-loop
+    api = create_service(create_adapter())
+    api.session.mount_transport(create_photos_adapter())
+    photos = PhotosService(URL, api.session, api.params)
+    album = photos.albums["All Photos"]
+
+    report(
+        f"PhotoAlbum.photos, {PHOTO_COUNT} photos",
+        measure(lambda: _iterate(album), number=1, repeat=3),
+    )
+
+    api.session.mount_transport(
+        create_photos_adapter(LATENCY_PHOTO_COUNT, latency=LATENCY)
+    )
+    for prefetch in (0, PREFETCH):
+        album = PhotosService(URL, api.session, api.params).albums["All Photos"]
+        album.prefetch = prefetch
+        report(
+            f"PhotoAlbum.photos, {LATENCY_PHOTO_COUNT} photos, "
+            f"{LATENCY * 1000:.0f} ms latency, prefetch={prefetch}",
+            measure(
+                lambda: _iterate(album, LATENCY_PHOTO_COUNT),
+                number=1,
+                repeat=1,
+            ),
+        )
+
+    api.session.mount_transport(create_photos_adapter(LATENCY_PHOTO_COUNT))
+    for projection, desired_keys in PROJECTIONS.items():
+        album = PhotosService(URL, api.session, api.params).albums["All Photos"]
+        album.projection = projection
+        report(
+            f"PhotoAlbum.photos, {LATENCY_PHOTO_COUNT} photos, {projection}",
+            measure(lambda: _iterate(album, LATENCY_PHOTO_COUNT), number=1, repeat=3),
+        )
+        page_size = len(create_pages(set(desired_keys))[0])
+        print(f"{'  page of ' + str(PAGE_SIZE) + ' photos':<60} {page_size:>12} B")
+
+    page = json.loads(create_pages()[0])["records"]
+    records = list(zip(page[::2], page[1::2]))
+    report(
+        f"PhotoAsset.versions, {len(records)} photos",
+        measure(
+            lambda: [
+                PhotoAsset(photos, master, asset).versions for asset, master in records
+            ],
+            number=100,
+        ),
+    )
+    assets = [PhotoAsset(photos, master, asset) for asset, master in records]
+    report(
+        f"PhotoAsset.filename and dates, {len(records)} photos, 10 times",
+        measure(
+            lambda: [
+                (asset.filename, asset.asset_date, asset.added_date)
+                for _ in range(10)
+                for asset in assets
+            ],
+            number=100,
+        ),
+    )
+
+    # Memory held by a listing of the whole library, with and without the
+    # records of the photos
+    api.session.mount_transport(create_photos_adapter())
+    for keep_records in (True, False):
+        album = PhotosService(
+            URL, api.session, api.params, keep_records=keep_records
+        ).albums["All Photos"]
+        if not keep_records:
+            report(
+                f"PhotoAlbum.photos, {PHOTO_COUNT} photos, compact",
+                measure(lambda: _iterate(album), number=1, repeat=3),
+            )
+        size = _measure_memory(lambda: list(album.photos))
+        print(
+            f"{f'  {PHOTO_COUNT} photos, keep_records={keep_records}':<60} "
+            f"{size / 1024 / 1024:>12.1f} MB"
+        )
+    api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Contacts and reminders parsing, over synthetic accounts.
+
+Run with ``python -m benchmarks.bench_services``.
+"""
+
+from pyicloud.services.contacts import ContactsService
+from pyicloud.services.reminders import RemindersService
+
+from .bench_auth import create_adapter, create_service
+from .common import FixtureAdapter, measure, report
+
+CONTACT_COUNT = 1000
+COLLECTION_COUNT = 10
+REMINDER_COUNT = 1000
+CONTACTS_URL = "https://p31-contactsws.icloud.com:443"
+REMINDERS_URL = "https://p31-remindersws.icloud.com:443"
+
+
+def contacts_payload():
+    """Returns a contacts response of `CONTACT_COUNT` contacts."""
+    return {
+        "prefToken": "pref",
+        "syncToken": "sync",
+        "contacts": [
+            {
+                "contactId": f"contact-{index}",
+                "firstName": f"First{index}",
+                "lastName": f"Last{index}",
+                "phones": [{"label": "MOBILE", "field": f"+1555{index:07d}"}],
+                "emailAddresses": [
+                    {"label": "HOME", "field": f"contact{index}@example.com"}
+                ],
+                "etag": "1",
+            }
+            for index in range(CONTACT_COUNT)
+        ],
+    }
+
+
+def reminders_payload():
+    """Returns a reminders startup response of `REMINDER_COUNT` reminders in
+    `COLLECTION_COUNT` lists."""
+    return {
+        "Collections": [
+            {"title": f"List {index}", "guid": f"list-{index}", "ctag": "1"}
+            for index in range(COLLECTION_COUNT)
+        ],
+        "Reminders": [
+            {
+                "title": f"Reminder {index}",
+                "description": "Description",
+                "pGuid": f"list-{index % COLLECTION_COUNT}",
+                "dueDate": [20201231, 2020, 12, 31, 12, 0, 0] if index % 2 else None,
+            }
+            for index in range(REMINDER_COUNT)
+        ],
+    }
+
+
+def _refresh_contacts(contacts):
+    contacts.refresh_client()
+    return contacts.all()
+
+
+def main():
+    """Runs the benchmarks."""
+    api = create_service(create_adapter())
+    api.session.mount_transport(
+        FixtureAdapter(
+            {
+                "/co/startup": contacts_payload(),
+                "/co/contacts": contacts_payload(),
+                "/rd/startup": reminders_payload(),
+            }
+        )
+    )
+
+    contacts = ContactsService(CONTACTS_URL, api.session, api.params)
+    report(
+        f"contacts refresh, {CONTACT_COUNT} contacts",
+        measure(lambda: _refresh_contacts(contacts), number=20),
+    )
+    report(
+        f"reminders refresh, {REMINDER_COUNT} reminders",
+        measure(
+            lambda: RemindersService(REMINDERS_URL, api.session, api.params),
+            number=20,
+        ),
+    )
+    api.close()
+
+
+if __name__ == "__main__":
+    main()
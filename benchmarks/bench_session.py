@@ -0,0 +1,105 @@
+"""Per-request overhead of PyiCloudSession.
+
+Run with ``python -m benchmarks.bench_session``.
+"""
+import http.cookiejar as cookielib
+import inspect
+import logging
+import os
+from tempfile import TemporaryDirectory
+
+from requests import Session
+
+from pyicloud.base import PyiCloudPasswordFilter, PyiCloudSession
+from pyicloud.store import FileSessionStore
+
+from tests.const_findmyiphone import FMI_FAMILY_WORKING
+
+from .common import FakeAdapter, measure, report
+
+URL = "https://p01-fmipweb.icloud.com/fmipservice/client/web/refreshClient"
+
+
+class ServiceStub:
+    """Minimal service the session depends on."""
+
+    AUTH_ENDPOINT = "https://idmsa.apple.com/appleauth/auth"
+    SETUP_ENDPOINT = "https://setup.icloud.com/setup/ws/1"
+
+    def __init__(self, directory):
+        self.password_filter = PyiCloudPasswordFilter("password")
+        self.user = {"accountName": "user"}
+        self.session_data = {"client_id": "client"}
+        self.session_store = FileSessionStore(directory)
+        self.cookiejar_path = os.path.join(directory, "user")
+        self.requires_2sa = False
+
+
+def _mount(session):
+    session.mount("https://", FakeAdapter({"content": []}))
+    return session
+
+
+def _legacy_request_logger(service):
+    """Logger attribution as done before, walking the whole stack."""
+    callee = inspect.stack()[2]
+    module = inspect.getmodule(callee[0])
+    request_logger = logging.getLogger(module.__name__).getChild("http")
+    if service.password_filter not in request_logger.filters:
+        request_logger.addFilter(service.password_filter)
+    return request_logger
+
+
+def _legacy_request(service):
+    return _legacy_request_logger(service)
+
+
+def _legacy_filter(password, record):
+    """Password filter as done before, formatting every record."""
+    message = record.getMessage()
+    if password in message:
+        record.msg = message.replace(password, "*" * 8)
+        record.args = []
+    return True
+
+
+def _payload_record():
+    return logging.LogRecord(
+        "pyicloud.http", logging.DEBUG, __file__, 1, "%s", (FMI_FAMILY_WORKING,), None
+    )
+
+
+def main():
+    """Runs the benchmarks."""
+    with TemporaryDirectory() as directory:
+        service = ServiceStub(directory)
+        session = _mount(PyiCloudSession(service))
+        session.cookies = cookielib.LWPCookieJar(service.cookiejar_path)
+        plain_session = _mount(Session())
+
+        report("requests.Session.post", measure(lambda: plain_session.post(URL)))
+        report("PyiCloudSession.post", measure(lambda: session.post(URL)))
+
+        # pylint: disable=protected-access
+        report(
+            "request logger attribution (inspect.stack)",
+            measure(lambda: _legacy_request(service), number=200),
+        )
+        report(
+            "request logger attribution (frame globals)",
+            measure(lambda: session._get_request_logger(__name__)),
+        )
+
+        # A refreshClient payload record, dropped by the handlers
+        report(
+            "password filter, payload record (formatting)",
+            measure(lambda: _legacy_filter("password", _payload_record())),
+        )
+        report(
+            "password filter, payload record (lazy)",
+            measure(lambda: service.password_filter.filter(_payload_record())),
+        )
+
+
+if __name__ == "__main__":
+    main()
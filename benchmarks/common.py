@@ -0,0 +1,89 @@
+"""Benchmark helpers."""
+import json
+import time
+import timeit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+
+# Results of the benchmarks run in this process, by name, in seconds
+RESULTS = {}
+
+
+class FakeAdapter(BaseAdapter):
+    """Transport adapter answering every request with a canned JSON body."""
+
+    def __init__(self, payload=None, headers=None):
+        super().__init__()
+        self.content = json.dumps({} if payload is None else payload).encode()
+        self.headers = {"Content-Type": "application/json"}
+        self.headers.update(headers or {})
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers.update(self.headers)
+        response._content = self.content  # pylint: disable=protected-access
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class FixtureAdapter(BaseAdapter):
+    """Transport adapter answering requests from fixtures, by URL fragment.
+
+    Routes map URL fragments to a JSON payload, or to a callable returning
+    the encoded body of a request. Payloads are encoded once, up front, so
+    that only pyicloud is measured. `latency` simulates the round trips.
+    """
+
+    def __init__(self, routes, headers=None, latency=0):
+        super().__init__()
+        self.latency = latency
+        self.routes = [
+            (fragment, target if callable(target) else json.dumps(target).encode())
+            for fragment, target in routes.items()
+        ]
+        self.headers = {"Content-Type": "application/json"}
+        self.headers.update(headers or {})
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        if self.latency:
+            time.sleep(self.latency)
+        response = Response()
+        response.headers.update(self.headers)
+        response.url = request.url
+        response.request = request
+        for fragment, target in self.routes:
+            if fragment in request.url:
+                response.status_code = 200
+                response.reason = "OK"
+                # pylint: disable=protected-access
+                response._content = target(request) if callable(target) else target
+                return response
+        response.status_code = 404
+        response.reason = "Not Found"
+        response._content = b"{}"  # pylint: disable=protected-access
+        return response
+
+    def close(self):
+        pass
+
+
+def measure(func, number=1000, repeat=5):
+    """Returns the best time of a single call to func, in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(name, seconds):
+    """Prints a benchmark result, and records it."""
+    RESULTS[name] = seconds
+    print(f"{name:<60} {seconds * 1e6:>12.2f} us")
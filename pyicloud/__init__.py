@@ -1,5 +1,54 @@
-"""The pyiCloud library."""
+"""The pyiCloud library.
+
+Its classes are imported on first access, keeping `import pyicloud` cheap.
+"""
+from importlib import import_module
 import logging
-from pyicloud.base import PyiCloudService
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "PyiCloudService": "pyicloud.base",
+    "AccountPool": "pyicloud.pool",
+    "MemoryCacheBackend": "pyicloud.cache",
+    "ResponseCache": "pyicloud.cache",
+    "SQLiteCacheBackend": "pyicloud.cache",
+    "LatencyHistogram": "pyicloud.instrumentation",
+    "PhotoIndex": "pyicloud.photoindex",
+    "RateLimiter": "pyicloud.ratelimit",
+    "RetryPolicy": "pyicloud.retry",
+    "FileSessionStore": "pyicloud.store",
+    "MemorySessionStore": "pyicloud.store",
+    "SQLiteSessionStore": "pyicloud.store",
+    "TimeoutConfig": "pyicloud.transport",
+    "TransportConfig": "pyicloud.transport",
+}
+
+# Imported for the static analysis, lazily otherwise
+if TYPE_CHECKING:
+    from pyicloud.base import PyiCloudService
+    from pyicloud.cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+    from pyicloud.instrumentation import LatencyHistogram
+    from pyicloud.photoindex import PhotoIndex
+    from pyicloud.pool import AccountPool
+    from pyicloud.ratelimit import RateLimiter
+    from pyicloud.retry import RetryPolicy
+    from pyicloud.store import FileSessionStore, MemorySessionStore, SQLiteSessionStore
+    from pyicloud.transport import TimeoutConfig, TransportConfig
+
+__all__ = list(_EXPORTS)
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def __getattr__(name):
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,2 @@
+"""The pyiCloud asyncio client."""
+from pyicloud.aio.base import AsyncPyiCloudService
@@ -0,0 +1,871 @@
+"""Library asyncio base file."""
+import asyncio
+from email.message import Message
+import logging
+import sys
+from urllib.request import Request
+
+import aiohttp
+
+from pyicloud.aio import services
+from pyicloud.base import (
+    JSON_MIMETYPES,
+    REQUEST_LOGGER_MODULES,
+    _NOT_PARSED,
+    _get_body_size,
+    PyiCloudService,
+    PyiCloudSessionBase,
+    _SESSIONS,
+)
+from pyicloud.codec import get_codec
+from pyicloud.exceptions import (
+    PyiCloudAPIResponseException,
+    PyiCloudFailedLoginException,
+)
+from pyicloud.instrumentation import RequestEvent
+from pyicloud.transport import TimeoutConfig, TransportConfig
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncPyiCloudResponse:
+    """Response of the asyncio iCloud session.
+
+    The body is read unless the request was streamed, in which case it can be
+    read from `iter_content` or from the underlying `raw` aiohttp response.
+    """
+
+    def __init__(self, response, content=None, codec=None):
+        self.raw = response
+        self.status_code = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.content = content
+        self.codec = codec or get_codec("json")
+
+        self._parsed_json = _NOT_PARSED
+
+    def release(self):
+        """Releases the connection of the response."""
+        self.raw.release()
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """Returns True if the status code is less than 400."""
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        """Returns the decoded body."""
+        return self.content.decode(self.raw.get_encoding(), errors="replace")
+
+    def json(self):
+        """Returns the JSON decoded body, parsed once."""
+        if self._parsed_json is _NOT_PARSED:
+            self._parsed_json = self.codec.loads(self.content)
+        return self._parsed_json
+
+    async def iter_content(self, chunk_size=1024):
+        """Iterates over the streamed body."""
+        async for chunk in self.raw.content.iter_chunked(chunk_size):
+            yield chunk
+
+    def close(self):
+        """Releases the connection of a streamed response."""
+        self.raw.release()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} [{self.status_code}]>"
+
+
+class _CookieResponse:
+    """Exposes response headers the way http.cookiejar expects them."""
+
+    def __init__(self, headers):
+        self._message = Message()
+        for header in ("Set-Cookie", "Set-Cookie2"):
+            for value in headers.getall(header, []):
+                self._message[header] = value
+
+    def info(self):
+        """Returns the response headers."""
+        return self._message
+
+
+def _query_params(params):
+    """Returns query parameters the way requests would encode them."""
+    if not params:
+        return None
+    return {key: str(value) for key, value in params.items() if value is not None}
+
+
+def _client_timeout(timeout):
+    """Returns the aiohttp timeout of a requests-like (connect, read) timeout."""
+    if timeout is None or isinstance(timeout, aiohttp.ClientTimeout):
+        return timeout
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+
+
+class AsyncPyiCloudSession(PyiCloudSessionBase):
+    """asyncio iCloud session.
+
+    It shares the session data and the cookie jar format of `PyiCloudSession`,
+    and runs at most `max_concurrency` requests at once.
+    """
+
+    request_logger_modules = REQUEST_LOGGER_MODULES + (
+        "pyicloud.aio.base",
+        "pyicloud.aio.services.account",
+        "pyicloud.aio.services.calendar",
+        "pyicloud.aio.services.contacts",
+        "pyicloud.aio.services.drive",
+        "pyicloud.aio.services.findmyiphone",
+        "pyicloud.aio.services.photos",
+        "pyicloud.aio.services.reminders",
+        "pyicloud.aio.services.ubiquity",
+    )
+
+    def __init__(
+        self,
+        service,
+        max_concurrency=10,
+        persist_interval=0,
+        transport=None,
+        timeouts=None,
+        retry_policy=None,
+        rate_limiter=None,
+        codec=None,
+        listeners=None,
+        coalesce_requests=False,
+    ):
+        super().__init__(
+            service,
+            persist_interval=persist_interval,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            codec=codec,
+            listeners=listeners,
+            coalesce_requests=coalesce_requests,
+        )
+        self.headers = {}
+        self.cookies = None
+        self.verify = True
+        self.max_concurrency = max_concurrency
+        self.transport = transport or TransportConfig()
+        self.timeouts = timeouts or TimeoutConfig()
+
+        self._client = None
+        self._semaphore = None
+        self._auth_lock = None
+
+    def _get_client(self):
+        if self._client is None or self._client.closed:
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency,
+                    limit_per_host=self.transport.pool_maxsize,
+                    force_close=not self.transport.keep_alive,
+                    ssl=None if self.verify else False,
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def get(self, url, **kwargs):
+        """Sends a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, data=None, **kwargs):
+        """Sends a POST request."""
+        return await self.request("POST", url, data=data, **kwargs)
+
+    async def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        headers=None,
+        files=None,
+        stream=False,
+        **kwargs,
+    ):
+        """Sends a request, returns an `AsyncPyiCloudResponse`."""
+        # Charge logging to the right service endpoint
+        # pylint: disable=protected-access
+        caller_globals = sys._getframe(2).f_globals
+        request_logger = self._get_request_logger(caller_globals.get("__name__"))
+
+        if request_logger.isEnabledFor(logging.DEBUG):
+            request_logger.debug("%s %s %s", method, url, data or "")
+
+        endpoint_service = self._get_endpoint_service(url)
+        if "timeout" in kwargs:
+            kwargs["timeout"] = _client_timeout(kwargs["timeout"])
+        else:
+            kwargs["timeout"] = _client_timeout(
+                self.timeouts.get(endpoint_service, stream)
+            )
+
+        key = self._get_coalescing_key(
+            method,
+            url,
+            params,
+            data,
+            headers,
+            files,
+            stream,
+            kwargs.get("json"),
+        )
+        send = self._send_request(
+            method,
+            url,
+            params,
+            data,
+            headers,
+            files,
+            stream,
+            request_logger,
+            endpoint_service,
+            **kwargs,
+        )
+        if key is None:
+            return await send
+        return await self._coalesce(key, send)
+
+    async def _coalesce(self, key, send):
+        """Awaits the `send` coroutine, unless an identical request is in
+        flight: its response (or error) is then shared, once received."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(send)
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            send.close()
+            self.coalesced_requests += 1
+        # A cancelled waiter does not cancel the request of the others
+        return await asyncio.shield(task)
+
+    async def _send_request(
+        self,
+        method,
+        url,
+        params,
+        data,
+        headers,
+        files,
+        stream,
+        request_logger,
+        endpoint_service,
+        **kwargs,
+    ):
+        """Sends a request, reporting it to the listeners."""
+        event = RequestEvent(endpoint_service, method, url)
+        try:
+            response = await self._request_with_retries(
+                method,
+                url,
+                params,
+                data,
+                headers,
+                files,
+                stream,
+                request_logger,
+                endpoint_service,
+                event,
+                **kwargs,
+            )
+        except Exception as error:
+            if self.listeners:
+                event.finish(bytes_sent=_get_body_size(data), error=error)
+                self._notify_listeners(event)
+            raise
+
+        if self.listeners:
+            if response.content is not None:
+                bytes_received = len(response.content)
+            else:
+                bytes_received = int(response.headers.get("Content-Length", 0))
+            event.finish(response.status_code, _get_body_size(data), bytes_received)
+            self._notify_listeners(event)
+        return response
+
+    async def _request_with_retries(
+        self,
+        method,
+        url,
+        params,
+        data,
+        headers,
+        files,
+        stream,
+        request_logger,
+        endpoint_service,
+        event,
+        **kwargs,
+    ):
+        """Sends a request, retries it as needed, returns the response."""
+        has_retried = False
+        attempt = 1
+        while True:
+            auth_generation = self._auth_generation
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint_service)
+            try:
+                response = await self._send(
+                    method, url, params, data, headers, files, stream, **kwargs
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                delay = self._get_retry_delay(
+                    request_logger, method, url, attempt, error, files=files
+                )
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                event.retries += 1
+                continue
+
+            content_type = self._update_session_data(response)
+            await self._persist_async()
+
+            if not response.ok and self.retry_policy.is_retryable(response.status_code):
+                delay = self._get_retry_delay(
+                    request_logger,
+                    method,
+                    url,
+                    attempt,
+                    f"{response.reason} ({response.status_code})",
+                    headers=response.headers,
+                    files=files,
+                )
+                if delay is not None:
+                    response.release()
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    event.retries += 1
+                    continue
+
+            if (
+                not has_retried
+                and response.status_code == 401
+                and self._is_restored(endpoint_service)
+            ):
+                # Validate the account data restored from disk
+                LOGGER.debug("Validating restored session")
+                response.release()
+                await self._reauthenticate(auth_generation, self.service.authenticate)
+                has_retried = True
+                event.retries += 1
+                continue
+
+            if not response.ok and (
+                content_type not in JSON_MIMETYPES
+                or response.status_code in [421, 450, 500]
+            ):
+                if has_retried or response.status_code not in [421, 450, 500]:
+                    self._raise_error(response.status_code, response.reason)
+
+                service = self._get_reauthentication_service(response, url)
+                if service is not False:
+                    # Handle re-authentication for Find My iPhone
+                    LOGGER.debug("Re-authenticating Find My iPhone service")
+                    await self._reauthenticate(
+                        auth_generation, self.service.authenticate, True, service
+                    )
+                elif self._is_restored(endpoint_service):
+                    # Validate the account data restored from disk
+                    LOGGER.debug("Validating restored session")
+                    await self._reauthenticate(
+                        auth_generation, self.service.authenticate
+                    )
+                else:
+                    api_error = PyiCloudAPIResponseException(
+                        response.reason, response.status_code, retry=True
+                    )
+                    request_logger.debug(api_error)
+                response.release()
+                has_retried = True
+                event.retries += 1
+                continue
+
+            if content_type in JSON_MIMETYPES:
+                error = self._get_response_error(response, request_logger)
+                if error:
+                    code, reason = error
+                    if (
+                        not has_retried
+                        and code == "AUTHENTICATION_FAILED"
+                        and self._is_restored(endpoint_service)
+                    ):
+                        LOGGER.debug("Validating restored session")
+                        response.release()
+                        await self._reauthenticate(
+                            auth_generation, self.service.authenticate
+                        )
+                        has_retried = True
+                        event.retries += 1
+                        continue
+                    if self.retry_policy.is_retryable(code=code):
+                        delay = self._get_retry_delay(
+                            request_logger,
+                            method,
+                            url,
+                            attempt,
+                            f"{reason} ({code})",
+                            headers=response.headers,
+                            files=files,
+                        )
+                        if delay is not None:
+                            response.release()
+                            await asyncio.sleep(delay)
+                            attempt += 1
+                            event.retries += 1
+                            continue
+                    self._raise_error(code, reason)
+
+            return response
+
+    async def _reauthenticate(self, generation, authenticate, *args):
+        """Re-authenticates the session once for all the requests failing
+        after the `generation` authentication.
+
+        Concurrent requests wait for the re-authentication in progress,
+        rather than starting theirs, then replay.
+        """
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if generation != self._auth_generation:
+                LOGGER.debug("Session already re-authenticated")
+                return
+            try:
+                await authenticate(*args)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.debug("Re-authentication failed")
+            self._auth_generation += 1
+
+    async def _send(self, method, url, params, data, headers, files, stream, **kwargs):
+        """Sends a request once, with the session headers and cookies."""
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        cookie_request = Request(url, method=method)
+        self.cookies.add_cookie_header(cookie_request)
+        if cookie_request.has_header("Cookie"):
+            request_headers["Cookie"] = cookie_request.get_header("Cookie")
+
+        if files:
+            data = aiohttp.FormData()
+            for name, file_object in files.items():
+                data.add_field(name, file_object, filename=name)
+
+        client = self._get_client()
+        async with self._semaphore:
+            raw_response = await client.request(
+                method,
+                url,
+                params=_query_params(params),
+                data=data,
+                headers=request_headers,
+                **kwargs,
+            )
+            content = None
+            if (
+                not stream
+                or not raw_response.ok
+                or raw_response.content_type in JSON_MIMETYPES
+            ):
+                content = await raw_response.read()
+        response = AsyncPyiCloudResponse(raw_response, content, self.codec)
+
+        self.cookies.extract_cookies(_CookieResponse(response.headers), cookie_request)
+        return response
+
+    async def _persist_async(self, force=False):
+        """Persists the session from a thread, off the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self.persist, force)
+
+    async def close(self):
+        """Closes the session and writes any pending change."""
+        await self._persist_async(force=True)
+        _SESSIONS.discard(self)
+        self._release_request_loggers()
+        if self._client is not None:
+            await self._client.close()
+
+
+class AsyncPyiCloudService(PyiCloudService):
+    """
+    The asyncio counterpart of `PyiCloudService`.
+
+    Methods and properties which send requests are awaitable, everything else
+    behaves like `PyiCloudService`.
+
+    Usage:
+        from pyicloud.aio import AsyncPyiCloudService
+        async with AsyncPyiCloudService('username@apple.com', 'password') as api:
+            iphone = await api.iphone
+            await iphone.location()
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        apple_id,
+        password=None,
+        cookie_directory=None,
+        verify=True,
+        client_id=None,
+        with_family=True,
+        china_mainland=False,
+        session_persist_interval=0,
+        transport=None,
+        timeouts=None,
+        retry_policy=None,
+        rate_limiter=None,
+        json_codec=None,
+        request_listeners=None,
+        service_ttls=None,
+        validate_max_age=None,
+        session_store=None,
+        coalesce_requests=False,
+        max_concurrency=10,
+    ):
+        self._setup(
+            apple_id,
+            password,
+            cookie_directory,
+            client_id,
+            with_family,
+            china_mainland,
+            service_ttls,
+            validate_max_age,
+            session_store,
+        )
+
+        self.session = AsyncPyiCloudSession(
+            self,
+            max_concurrency=max_concurrency,
+            persist_interval=session_persist_interval,
+            transport=transport,
+            timeouts=timeouts,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            codec=json_codec,
+            listeners=request_listeners,
+            coalesce_requests=coalesce_requests,
+        )
+        self.session.verify = verify
+        self._setup_session()
+
+    async def __aenter__(self):
+        try:
+            # Reads the session store, off the event loop
+            restored = await asyncio.get_running_loop().run_in_executor(
+                None, self._restore_account_data
+            )
+            if not restored:
+                await self.authenticate()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the session, and stops hiding the password in the logs."""
+        try:
+            await self.session.close()
+        finally:
+            self._release_password_filter()
+
+    async def authenticate(self, force_refresh=False, service=None):
+        """
+        Handles authentication, and persists cookies so that
+        subsequent logins will not cause additional e-mails from Apple.
+        """
+
+        login_successful = False
+        if self.session_data.get("session_token") and not force_refresh:
+            LOGGER.debug("Checking session token validity")
+            try:
+                self.data = await self._validate_token()
+                login_successful = True
+            except PyiCloudAPIResponseException:
+                LOGGER.debug("Invalid authentication token, will log in from scratch.")
+
+        if not login_successful and service is not None:
+            if self._can_authenticate_with_service(service):
+                LOGGER.debug(
+                    "Authenticating as %s for %s", self.user["accountName"], service
+                )
+                try:
+                    await self._authenticate_with_credentials_service(service)
+                    login_successful = True
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.debug(
+                        "Could not log into service. Attempting brand new login."
+                    )
+
+        if not login_successful:
+            LOGGER.debug("Authenticating as %s", self.user["accountName"])
+
+            try:
+                await self.session.post(
+                    "%s/signin" % self.AUTH_ENDPOINT,
+                    params={"isRememberMeEnabled": "true"},
+                    data=self.session.codec.dumps(self._get_signin_data()),
+                    headers=self._get_session_headers(self._get_auth_headers()),
+                )
+            except PyiCloudAPIResponseException as error:
+                msg = "Invalid email/password combination."
+                raise PyiCloudFailedLoginException(msg, error) from error
+
+            await self._authenticate_with_token()
+
+        self._set_webservices(self.data["webservices"])
+        self.validated = True
+        self._save_account_data()
+
+        LOGGER.debug("Authentication completed successfully")
+
+    async def _authenticate_with_token(self):
+        """Authenticate using session token."""
+        try:
+            req = await self.session.post(
+                "%s/accountLogin" % self.SETUP_ENDPOINT,
+                data=self.session.codec.dumps(self._get_token_login_data()),
+            )
+            self.data = req.json()
+        except PyiCloudAPIResponseException as error:
+            msg = "Invalid authentication token."
+            raise PyiCloudFailedLoginException(msg, error) from error
+
+    async def _authenticate_with_credentials_service(self, service):
+        """Authenticate to a specific service using credentials."""
+        try:
+            await self.session.post(
+                "%s/accountLogin" % self.SETUP_ENDPOINT,
+                data=self.session.codec.dumps(self._get_service_login_data(service)),
+            )
+
+            self.data = await self._validate_token()
+        except PyiCloudAPIResponseException as error:
+            msg = "Invalid email/password combination."
+            raise PyiCloudFailedLoginException(msg, error) from error
+
+    async def _validate_token(self):
+        """Checks if the current access token is still valid."""
+        LOGGER.debug("Checking session token validity")
+        try:
+            req = await self.session.post(
+                "%s/validate" % self.SETUP_ENDPOINT, data="null"
+            )
+            LOGGER.debug("Session token is still valid")
+            return req.json()
+        except PyiCloudAPIResponseException as err:
+            LOGGER.debug("Invalid authentication token")
+            raise err
+
+    @property
+    def trusted_devices(self):
+        """Returns devices trusted for two-step authentication."""
+        return self._get_trusted_devices()
+
+    async def _get_trusted_devices(self):
+        request = await self.session.get(
+            "%s/listDevices" % self.SETUP_ENDPOINT, params=self.params
+        )
+        return request.json().get("devices")
+
+    async def send_verification_code(self, device):
+        """Requests that a verification code is sent to the given device."""
+        data = self.session.codec.dumps(device)
+        request = await self.session.post(
+            "%s/sendVerificationCode" % self.SETUP_ENDPOINT,
+            params=self.params,
+            data=data,
+        )
+        return request.json().get("success", False)
+
+    async def validate_verification_code(self, device, code):
+        """Verifies a verification code received on a trusted device."""
+        device.update({"verificationCode": code, "trustBrowser": True})
+        data = self.session.codec.dumps(device)
+
+        try:
+            await self.session.post(
+                "%s/validateVerificationCode" % self.SETUP_ENDPOINT,
+                params=self.params,
+                data=data,
+            )
+        except PyiCloudAPIResponseException as error:
+            if error.code == -21669:
+                # Wrong verification code
+                return False
+            raise
+
+        await self.trust_session()
+
+        return not self.requires_2sa
+
+    async def validate_2fa_code(self, code):
+        """Verifies a verification code received via Apple's 2FA system (HSA2)."""
+        data = {"securityCode": {"code": code}}
+
+        headers = self._get_session_headers(
+            self._get_auth_headers({"Accept": "application/json"})
+        )
+
+        try:
+            await self.session.post(
+                "%s/verify/trusteddevice/securitycode" % self.AUTH_ENDPOINT,
+                data=self.session.codec.dumps(data),
+                headers=headers,
+            )
+        except PyiCloudAPIResponseException as error:
+            if error.code == -21669:
+                # Wrong verification code
+                LOGGER.error("Code verification failed.")
+                return False
+            raise
+
+        LOGGER.debug("Code verification successful.")
+
+        await self.trust_session()
+        return not self.requires_2sa
+
+    async def trust_session(self):
+        """Request session trust to avoid user log in going forward."""
+        headers = self._get_session_headers(self._get_auth_headers())
+
+        try:
+            await self.session.get(
+                f"{self.AUTH_ENDPOINT}/2sv/trust",
+                headers=headers,
+            )
+            await self._authenticate_with_token()
+            return True
+        except PyiCloudAPIResponseException:
+            LOGGER.error("Session trust failed.")
+            return False
+
+    async def _get_service_async(self, name, factory):
+        """Returns a cached service, created by the `factory` coroutine if
+        needed."""
+        service = self._get_cached_service(name)
+        if service is None:
+            async with self._get_service_lock(name, asyncio.Lock):
+                service = self._get_cached_service(name)
+                if service is None:
+                    service = self._cache_service(name, await factory())
+        return service
+
+    @property
+    def devices(self):
+        """Returns all devices."""
+        return self._get_service_async("devices", self._get_devices)
+
+    async def _get_devices(self):
+        service_root = self._get_webservice_url("findme")
+        manager = services.AsyncFindMyiPhoneServiceManager(
+            service_root, self.session, self.params, self.with_family
+        )
+        await manager.refresh_client()
+        return manager
+
+    @property
+    def iphone(self):
+        """Returns the iPhone."""
+        return self._get_iphone()
+
+    async def _get_iphone(self):
+        return (await self.devices)[0]
+
+    @property
+    def account(self):
+        """Gets the 'Account' service."""
+        return self._get_service(
+            "account",
+            lambda: services.AsyncAccountService(
+                self._get_webservice_url("account"), self.session, self.params
+            ),
+        )
+
+    @property
+    def files(self):
+        """Gets the 'File' service."""
+        return self._get_service(
+            "files",
+            lambda: services.AsyncUbiquityService(
+                self._get_webservice_url("ubiquity"), self.session, self.params
+            ),
+        )
+
+    @property
+    def photos(self):
+        """Gets the 'Photo' service."""
+        return self._get_service_async("photos", self._get_photos)
+
+    async def _get_photos(self):
+        service_root = self._get_webservice_url("ckdatabasews")
+        photos = services.AsyncPhotosService(service_root, self.session, self.params)
+        await photos.check_indexing_state()
+        return photos
+
+    @property
+    def calendar(self):
+        """Gets the 'Calendar' service."""
+        return self._get_service(
+            "calendar",
+            lambda: services.AsyncCalendarService(
+                self._get_webservice_url("calendar"), self.session, self.params
+            ),
+        )
+
+    @property
+    def contacts(self):
+        """Gets the 'Contacts' service."""
+        return self._get_service(
+            "contacts",
+            lambda: services.AsyncContactsService(
+                self._get_webservice_url("contacts"), self.session, self.params
+            ),
+        )
+
+    @property
+    def reminders(self):
+        """Gets the 'Reminders' service."""
+        return self._get_service_async("reminders", self._get_reminders)
+
+    async def _get_reminders(self):
+        service_root = self._get_webservice_url("reminders")
+        reminders = services.AsyncRemindersService(
+            service_root, self.session, self.params
+        )
+        await reminders.refresh()
+        return reminders
+
+    @property
+    def drive(self):
+        """Gets the 'Drive' service."""
+        return self._get_service(
+            "drive",
+            lambda: services.AsyncDriveService(
+                service_root=self._get_webservice_url("drivews"),
+                document_root=self._get_webservice_url("docws"),
+                session=self.session,
+                params=self.params,
+            ),
+        )
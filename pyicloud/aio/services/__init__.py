@@ -0,0 +1,44 @@
+"""asyncio services.
+
+The service modules are imported on first access to their classes.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_SERVICE_MODULES = {
+    "AsyncCalendarService": "pyicloud.aio.services.calendar",
+    "AsyncFindMyiPhoneServiceManager": "pyicloud.aio.services.findmyiphone",
+    "AsyncContactsService": "pyicloud.aio.services.contacts",
+    "AsyncRemindersService": "pyicloud.aio.services.reminders",
+    "AsyncPhotosService": "pyicloud.aio.services.photos",
+    "AsyncAccountService": "pyicloud.aio.services.account",
+    "AsyncDriveService": "pyicloud.aio.services.drive",
+    "AsyncUbiquityService": "pyicloud.aio.services.ubiquity",
+}
+
+# Imported for the static analysis, lazily otherwise
+if TYPE_CHECKING:
+    from pyicloud.aio.services.account import AsyncAccountService
+    from pyicloud.aio.services.calendar import AsyncCalendarService
+    from pyicloud.aio.services.contacts import AsyncContactsService
+    from pyicloud.aio.services.drive import AsyncDriveService
+    from pyicloud.aio.services.findmyiphone import AsyncFindMyiPhoneServiceManager
+    from pyicloud.aio.services.photos import AsyncPhotosService
+    from pyicloud.aio.services.reminders import AsyncRemindersService
+    from pyicloud.aio.services.ubiquity import AsyncUbiquityService
+
+__all__ = list(_SERVICE_MODULES)
+
+
+def __getattr__(name):
+    try:
+        module_name = _SERVICE_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,54 @@
+"""Account asyncio service."""
+from pyicloud.services.account import AccountService, AccountStorage
+
+
+class AsyncAccountService(AccountService):
+    """The asyncio 'Account' iCloud service."""
+
+    @property
+    def devices(self):
+        """Returns current paired devices."""
+        return self._get_devices()
+
+    async def _get_devices(self):
+        if not self._devices:
+            req = await self.session.get(self._acc_devices_url, params=self.params)
+            self._devices = self._parse_devices(req.json())
+
+        return self._devices
+
+    @property
+    def family(self):
+        """Returns family members."""
+        return self._get_family()
+
+    async def _get_family(self):
+        if not self._family:
+            req = await self.session.get(
+                self._acc_family_details_url, params=self.params
+            )
+            self._family = self._parse_family(req.json())
+
+        return self._family
+
+    @property
+    def storage(self):
+        """Returns storage infos."""
+        return self._get_storage()
+
+    async def _get_storage(self):
+        if not self._storage:
+            req = await self.session.get(self._acc_storage_url, params=self.params)
+            self._storage = AccountStorage(req.json())
+
+        return self._storage
+
+    def __str__(self):
+        storage = (
+            self._storage.usage.available_storage_in_bytes if self._storage else None
+        )
+        return "{{devices: {}, family: {}, storage: {} bytes free}}".format(
+            len(self._devices),
+            len(self._family),
+            storage,
+        )
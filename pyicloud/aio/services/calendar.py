@@ -0,0 +1,46 @@
+"""Calendar asyncio service."""
+from pyicloud.services.calendar import CalendarService
+
+
+class AsyncCalendarService(CalendarService):
+    """
+    The asyncio 'Calendar' iCloud service, connects to iCloud and returns events.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    async def get_event_detail(self, pguid, guid):
+        """
+        Fetches a single event's details by specifying a pguid
+        (a calendar) and a guid (an event's ID).
+        """
+        url = f"{self._calendar_event_detail_url}/{pguid}/{guid}"
+        req = await self.session.get(url, params=self._get_params())
+        self.response = req.json()
+        return self.response["Event"][0]
+
+    async def refresh_client(self, from_dt=None, to_dt=None):
+        """
+        Refreshes the CalendarService endpoint, ensuring that the
+        event data is up-to-date. If no 'from_dt' or 'to_dt' datetimes
+        have been given, the range becomes this month.
+        """
+        req = await self.session.get(
+            self._calendar_refresh_url, params=self._get_range_params(from_dt, to_dt)
+        )
+        self.response = req.json()
+
+    async def events(self, from_dt=None, to_dt=None):
+        """
+        Retrieves events for a given date range, by default, this month.
+        """
+        await self.refresh_client(from_dt, to_dt)
+        return self.response.get("Event")
+
+    async def calendars(self):
+        """
+        Retrieves calendars of this month.
+        """
+        req = await self.session.get(self._calendars, params=self._get_range_params())
+        self.response = req.json()
+        return self.response["Collection"]
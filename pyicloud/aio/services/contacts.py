@@ -0,0 +1,32 @@
+"""Contacts asyncio service."""
+from pyicloud.services.contacts import ContactsService
+
+
+class AsyncContactsService(ContactsService):
+    """
+    The asyncio 'Contacts' iCloud service, connects to iCloud and returns contacts.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    async def refresh_client(self):
+        """
+        Refreshes the ContactsService endpoint, ensuring that the
+        contacts data is up-to-date.
+        """
+        req = await self.session.get(
+            self._contacts_refresh_url, params=self._get_params()
+        )
+        self.response = req.json()
+
+        req = await self.session.get(
+            self._contacts_next_url, params=self._get_next_params(self.response)
+        )
+        self.response = req.json()
+
+    async def all(self):
+        """
+        Retrieves all contacts.
+        """
+        await self.refresh_client()
+        return self.response.get("contacts")
@@ -0,0 +1,189 @@
+"""Drive asyncio service."""
+from pyicloud.services.drive import DriveNode, DriveService
+
+
+class AsyncDriveService(DriveService):
+    """The asyncio 'Drive' iCloud service."""
+
+    # pylint: disable=invalid-overridden-method
+
+    async def get_node_data(self, node_id):
+        """Returns the node data."""
+        request = await self.session.post(
+            self._service_root + "/retrieveItemDetailsInFolders",
+            params=self.params,
+            data=self.session.codec.dumps(self._get_retrieve_items_data(node_id)),
+        )
+        self._raise_if_error(request)
+        return request.json()[0]
+
+    async def get_file(self, file_id, **kwargs):
+        """Returns iCloud Drive file."""
+        file_params = dict(self.params)
+        file_params.update({"document_id": file_id})
+        response = await self.session.get(
+            self._document_root + "/ws/com.apple.CloudDocs/download/by_id",
+            params=file_params,
+        )
+        self._raise_if_error(response)
+        return await self.session.get(
+            self._get_file_url(response.json()), params=self.params, **kwargs
+        )
+
+    async def get_app_data(self):
+        """Returns the app library (previously ubiquity)."""
+        request = await self.session.get(
+            self._service_root + "/retrieveAppLibraries", params=self.params
+        )
+        self._raise_if_error(request)
+        return request.json()["items"]
+
+    async def _get_upload_contentws_url(self, file_object):
+        """Get the contentWS endpoint URL to add a new file."""
+        file_params = self.params
+        file_params.update(self._get_token_from_cookie())
+
+        request = await self.session.post(
+            self._document_root + "/ws/com.apple.CloudDocs/upload/web",
+            params=file_params,
+            headers={"Content-Type": "text/plain"},
+            data=self.session.codec.dumps(self._get_upload_contentws_data(file_object)),
+        )
+        self._raise_if_error(request)
+        return (request.json()[0]["document_id"], request.json()[0]["url"])
+
+    async def _update_contentws(self, folder_id, sf_info, document_id, file_object):
+        request = await self.session.post(
+            self._document_root + "/ws/com.apple.CloudDocs/update/documents",
+            params=self.params,
+            headers={"Content-Type": "text/plain"},
+            data=self.session.codec.dumps(
+                self._get_update_contentws_data(
+                    folder_id, sf_info, document_id, file_object
+                )
+            ),
+        )
+        self._raise_if_error(request)
+        return request.json()
+
+    async def send_file(self, folder_id, file_object):
+        """Send new file to iCloud Drive."""
+        document_id, content_url = await self._get_upload_contentws_url(file_object)
+
+        request = await self.session.post(
+            content_url, files={file_object.name: file_object}
+        )
+        self._raise_if_error(request)
+        content_response = request.json()["singleFile"]
+        await self._update_contentws(
+            folder_id, content_response, document_id, file_object
+        )
+
+    async def create_folders(self, parent, name):
+        """Creates a new iCloud Drive folder"""
+        request = await self.session.post(
+            self._service_root + "/createFolders",
+            params=self.params,
+            headers={"Content-Type": "text/plain"},
+            data=self.session.codec.dumps(self._get_create_folders_data(parent, name)),
+        )
+        self._raise_if_error(request)
+        return request.json()
+
+    async def rename_items(self, node_id, etag, name):
+        """Renames an iCloud Drive node"""
+        request = await self.session.post(
+            self._service_root + "/renameItems",
+            params=self.params,
+            data=self.session.codec.dumps(
+                self._get_rename_items_data(node_id, etag, name)
+            ),
+        )
+        self._raise_if_error(request)
+        return request.json()
+
+    async def move_items_to_trash(self, node_id, etag):
+        """Moves an iCloud Drive node to the trash bin"""
+        request = await self.session.post(
+            self._service_root + "/moveItemsToTrash",
+            params=self.params,
+            data=self.session.codec.dumps(
+                self._get_move_items_to_trash_data(node_id, etag)
+            ),
+        )
+        self._raise_if_error(request)
+        return request.json()
+
+    @property
+    def root(self):
+        """Returns the root node."""
+        return self._get_root()
+
+    async def _get_root(self):
+        if not self._root:
+            self._root = AsyncDriveNode(self, await self.get_node_data("root"))
+        return self._root
+
+    def __getattr__(self, attr):
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{attr}', "
+            "use 'await drive.root' to access the root node"
+        )
+
+    def __getitem__(self, key):
+        return self._get_item(key)
+
+    async def _get_item(self, key):
+        return await (await self.root)[key]
+
+
+class AsyncDriveNode(DriveNode):
+    """asyncio Drive node.
+
+    Methods sending requests, and item access, are awaitable.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    async def get_children(self):
+        """Gets the node children."""
+        if not self._children:
+            if "items" not in self.data:
+                self.data.update(
+                    await self.connection.get_node_data(self.data["docwsid"])
+                )
+            if "items" not in self.data:
+                raise KeyError("No items in folder, status: %s" % self.data["status"])
+            self._children = [
+                AsyncDriveNode(self.connection, item_data)
+                for item_data in self.data["items"]
+            ]
+        return self._children
+
+    async def open(self, **kwargs):
+        """Gets the node file."""
+        # iCloud returns 400 Bad Request for 0-byte files
+        if self.data["size"] == 0:
+            return super().open(**kwargs)
+        return await self.connection.get_file(self.data["docwsid"], **kwargs)
+
+    async def dir(self):
+        """Gets the node list of directories."""
+        if self.type == "file":
+            return None
+        return [child.name for child in await self.get_children()]
+
+    async def get(self, name):
+        """Gets the node child."""
+        if self.type == "file":
+            return None
+        return [child for child in await self.get_children() if child.name == name][0]
+
+    def __getitem__(self, key):
+        return self._get_item(key)
+
+    async def _get_item(self, key):
+        try:
+            return await self.get(key)
+        except IndexError as i:
+            raise KeyError(f"No child named '{key}' exists") from i
@@ -0,0 +1,106 @@
+"""Find my iPhone asyncio service."""
+from pyicloud.services.findmyiphone import AppleDevice, FindMyiPhoneServiceManager
+
+
+class AsyncFindMyiPhoneServiceManager(FindMyiPhoneServiceManager):
+    """The asyncio 'Find my iPhone' iCloud service
+
+    Devices are available once `refresh_client` has been awaited.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, service_root, session, params, with_family=False
+    ):
+        self.session = session
+        self.params = params
+        self.with_family = with_family
+
+        fmip_endpoint = "%s/fmipservice/client/web" % service_root
+        self._fmip_refresh_url = "%s/refreshClient" % fmip_endpoint
+        self._fmip_sound_url = "%s/playSound" % fmip_endpoint
+        self._fmip_message_url = "%s/sendMessage" % fmip_endpoint
+        self._fmip_lost_url = "%s/lostDevice" % fmip_endpoint
+
+        self.response = None
+        self._devices = {}
+
+    async def refresh_client(self):
+        """Refreshes the FindMyiPhoneService endpoint,
+
+        This ensures that the location data is up-to-date.
+
+        """
+        req = await self.session.post(
+            self._fmip_refresh_url,
+            params=self.params,
+            data=self.session.codec.dumps(self._get_refresh_client_data()),
+        )
+        self._update_devices(req.json())
+
+    def _create_device(self, device_info):
+        """Returns a new device."""
+        return AsyncAppleDevice(
+            device_info,
+            self.session,
+            self.params,
+            manager=self,
+            sound_url=self._fmip_sound_url,
+            lost_url=self._fmip_lost_url,
+            message_url=self._fmip_message_url,
+        )
+
+
+class AsyncAppleDevice(AppleDevice):
+    """asyncio Apple device."""
+
+    # pylint: disable=invalid-overridden-method
+
+    async def location(self):
+        """Updates the device location."""
+        await self.manager.refresh_client()
+        return self.content["location"]
+
+    async def status(self, additional=[]):  # pylint: disable=dangerous-default-value
+        """Returns status information for device.
+
+        This returns only a subset of possible properties.
+        """
+        await self.manager.refresh_client()
+        return self._get_status(additional)
+
+    async def play_sound(self, subject="Find My iPhone Alert"):
+        """Send a request to the device to play a sound.
+
+        It's possible to pass a custom message by changing the `subject`.
+        """
+        data = self.session.codec.dumps(self._get_sound_data(subject))
+        await self.session.post(self.sound_url, params=self.params, data=data)
+
+    async def display_message(
+        self, subject="Find My iPhone Alert", message="This is a note", sounds=False
+    ):
+        """Send a request to the device to play a sound.
+
+        It's possible to pass a custom message by changing the `subject`.
+        """
+        data = self.session.codec.dumps(
+            self._get_message_data(subject, message, sounds)
+        )
+        await self.session.post(self.message_url, params=self.params, data=data)
+
+    async def lost_device(
+        self, number, text="This iPhone has been lost. Please call me.", newpasscode=""
+    ):
+        """Send a request to the device to trigger 'lost mode'.
+
+        The device will show the message in `text`, and if a number has
+        been passed, then the person holding the device can call
+        the number without entering the passcode.
+        """
+        data = self.session.codec.dumps(self._get_lost_data(number, text, newpasscode))
+        await self.session.post(self.lost_url, params=self.params, data=data)
+
+    def __repr__(self):
+        return f"<AsyncAppleDevice({self})>"
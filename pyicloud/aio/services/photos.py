@@ -0,0 +1,213 @@
+"""Photo asyncio service."""
+from urllib.parse import urlencode
+
+from pyicloud.services.photos import PhotoAlbum, PhotoChanges, PhotosService
+
+
+class AsyncPhotosService(PhotosService):
+    """The asyncio 'Photos' iCloud service.
+
+    Albums are available once `check_indexing_state` has been awaited.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, service_root, session, params, projection="full", keep_records=True
+    ):
+        self.session = session
+        self.params = dict(params)
+        self.projection = projection
+        self.keep_records = keep_records
+        self._service_root = service_root
+        self.service_endpoint = (
+            "%s/database/1/com.apple.photos.cloud/production/private"
+            % self._service_root
+        )
+
+        self._albums = None
+
+        self.params.update({"remapEnums": True, "getCurrentSyncToken": True})
+
+        self._photo_assets = {}
+
+    async def check_indexing_state(self):
+        """Raises if the photo library has not finished indexing."""
+        url = f"{self.service_endpoint}/records/query?{urlencode(self.params)}"
+        request = await self.session.post(
+            url,
+            data=self.INDEXING_STATE_QUERY,
+            headers={"Content-type": "text/plain"},
+        )
+        self._check_indexing_state(request.json())
+
+    @property
+    def albums(self):
+        """Returns photo albums."""
+        return self._get_albums_once()
+
+    async def _get_albums_once(self):
+        if not self._albums:
+            self._albums = self._get_albums(await self._fetch_folders())
+
+        return self._albums
+
+    async def _fetch_folders(self):
+        url = f"{self.service_endpoint}/records/query?{urlencode(self.params)}"
+
+        request = await self.session.post(
+            url, data=self.FOLDERS_QUERY, headers={"Content-type": "text/plain"}
+        )
+        response = request.json()
+
+        return response["records"]
+
+    def _create_album(self, name, list_type, obj_type, direction, query_filter=None):
+        """Returns a new album."""
+        return AsyncPhotoAlbum(
+            self,
+            name,
+            list_type,
+            obj_type,
+            direction,
+            query_filter,
+        )
+
+    @property
+    def all(self):
+        """Returns all photos."""
+        return self._get_all()
+
+    async def _get_all(self):
+        return (await self.albums)["All Photos"]
+
+    def changes(self, sync_token=None, page_size=200, save=True):
+        """Returns the changes of the library since `sync_token`, by default
+        since the last sync. Without `save`, the sync token isn't saved."""
+        if sync_token is None:
+            sync_token = self.sync_token
+        return AsyncPhotoChanges(self, sync_token, page_size, save)
+
+
+class AsyncPhotoAlbum(PhotoAlbum):
+    """An asyncio photo album.
+
+    Photos are iterated with `async for`, the album size is returned by
+    `length`.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' to iterate over an asyncio photo album")
+
+    def __aiter__(self):
+        return self.photos
+
+    def __len__(self):
+        raise TypeError("Use 'await album.length()' with an asyncio photo album")
+
+    def __bool__(self):
+        return True
+
+    async def length(self):
+        """Returns the number of photos in the album."""
+        if self._len is None:
+            url, data = self._count_request()
+            request = await self.service.session.post(
+                url, data=data, headers={"Content-type": "text/plain"}
+            )
+            self._len = self._parse_count(request.json())
+
+        return self._len
+
+    @property
+    def photos(self):
+        """Returns the album photos."""
+        return self._iter_photos()
+
+    async def _fetch_page(self, offset):
+        """Returns the photo assets of the page starting at rank `offset`."""
+        url, data = self._list_request(offset)
+        request = await self.service.session.post(
+            url, data=data, headers={"Content-type": "text/plain"}
+        )
+        return self._parse_assets(request.json())
+
+    async def _iter_photos(self):
+        step = self._step
+        offset = await self.length() - 1 if step < 0 else 0
+        while True:
+            assets = await self._fetch_page(offset)
+            if not assets:
+                return
+            offset += step * len(assets)
+            for asset in assets:
+                yield asset
+
+
+class AsyncPhotoChanges(PhotoChanges):
+    """The asyncio changes of the photo library, iterated with
+    `async for`."""
+
+    # pylint: disable=invalid-overridden-method
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' to iterate over asyncio photo changes")
+
+    async def __aiter__(self):
+        async for changes, _ in self.pages():
+            for change in changes:
+                yield change
+
+    async def pages(self):
+        """Yields the changes a page at a time, with the sync token of the
+        page."""
+        while True:
+            zone = await self._fetch_zone(self.sync_token)
+            records = zone["records"]
+            changed_masters = self._get_changed_masters(records)
+            if changed_masters:
+                records = records + await self._query_assets(changed_masters)
+            missing = self._get_missing_masters(records)
+            masters = await self._lookup_masters(missing) if missing else {}
+            yield self._parse_changes(records, masters), zone["syncToken"]
+
+            self.sync_token = zone["syncToken"]
+            if self.save:
+                self.service.sync_token = self.sync_token
+            if not zone.get("moreComing"):
+                return
+
+    async def _fetch_zone(self, sync_token):
+        url = "{}/changes/zone?{}".format(
+            self.service.service_endpoint, urlencode(self.service.params)
+        )
+        request = await self.service.session.post(
+            url,
+            data=self.service.session.codec.dumps(self._changes_query_gen(sync_token)),
+            headers={"Content-type": "text/plain"},
+        )
+        return self._parse_zone(request.json())
+
+    async def _lookup_masters(self, record_names):
+        url = "{}/records/lookup?{}".format(
+            self.service.service_endpoint, urlencode(self.service.params)
+        )
+        request = await self.service.session.post(
+            url,
+            data=self.service.session.codec.dumps(self._lookup_query_gen(record_names)),
+            headers={"Content-type": "text/plain"},
+        )
+        return self._parse_lookup(request.json())
+
+    async def _query_assets(self, master_names):
+        url = "{}/internal/records/query/batch?{}".format(
+            self.service.service_endpoint, urlencode(self.service.params)
+        )
+        request = await self.service.session.post(
+            url,
+            data=self.service.session.codec.dumps(self._assets_query_gen(master_names)),
+            headers={"Content-type": "text/plain"},
+        )
+        return self._parse_assets_batch(request.json())
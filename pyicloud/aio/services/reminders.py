@@ -0,0 +1,42 @@
+"""Reminders asyncio service."""
+
+from pyicloud.services.reminders import RemindersService
+
+
+class AsyncRemindersService(RemindersService):
+    """The asyncio 'Reminders' iCloud service.
+
+    Lists are available once `refresh` has been awaited.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, service_root, session, params
+    ):
+        self.session = session
+        self._params = params
+        self._service_root = service_root
+
+        self.lists = {}
+        self.collections = {}
+
+    async def refresh(self):
+        """Refresh data."""
+        # Open reminders
+        req = await self.session.get(
+            self._service_root + "/rd/startup", params=self._get_params()
+        )
+
+        self._update_lists(req.json())
+
+    async def post(self, title, description="", collection=None, due_date=None):
+        """Adds a new reminder."""
+        req = await self.session.post(
+            self._service_root + "/rd/reminders/tasks",
+            data=self.session.codec.dumps(
+                self._get_reminder_data(title, description, collection, due_date)
+            ),
+            params=self._get_params(),
+        )
+        return req.ok
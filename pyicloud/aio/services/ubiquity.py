@@ -0,0 +1,77 @@
+"""File asyncio service."""
+from pyicloud.services.ubiquity import UbiquityNode, UbiquityService
+
+
+class AsyncUbiquityService(UbiquityService):
+    """The asyncio 'Ubiquity' iCloud service.
+
+    Nodes are reached from the awaited `root`, rather than through the
+    service itself.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    @property
+    def root(self):
+        """Gets the root node."""
+        return self._get_root()
+
+    async def _get_root(self):
+        if not self._root:
+            self._root = await self.get_node(0)
+        return self._root
+
+    async def get_node(self, node_id):
+        """Returns a node."""
+        request = await self.session.get(self.get_node_url(node_id))
+        return AsyncUbiquityNode(self, request.json())
+
+    async def get_children(self, node_id):
+        """Returns a node children."""
+        request = await self.session.get(self.get_node_url(node_id, "parent"))
+        items = request.json()["item_list"]
+        return [AsyncUbiquityNode(self, item) for item in items]
+
+    async def get_file(self, node_id, **kwargs):
+        """Returns a node file."""
+        return await self.session.get(self.get_node_url(node_id, "file"), **kwargs)
+
+    def __getattr__(self, attr):
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {attr!r}, "
+            "use 'await files.root'"
+        )
+
+    def __getitem__(self, key):
+        raise TypeError("Use '(await files.root).get(name)' with asyncio")
+
+
+class AsyncUbiquityNode(UbiquityNode):
+    """asyncio Ubiquity node."""
+
+    # pylint: disable=invalid-overridden-method
+
+    async def open(self, **kwargs):
+        """Returns the node file."""
+        return await self.connection.get_file(self.item_id, **kwargs)
+
+    async def get_children(self):
+        """Returns the node children."""
+        if not self._children:
+            self._children = await self.connection.get_children(self.item_id)
+        return self._children
+
+    async def dir(self):
+        """Returns children node directories by their names."""
+        return [child.name for child in await self.get_children()]
+
+    async def get(self, name):
+        """Returns a child node by its name."""
+        children = await self.get_children()
+        try:
+            return [child for child in children if child.name == name][0]
+        except IndexError as i:
+            raise KeyError(f"No child named {name} exists") from i
+
+    def __getitem__(self, key):
+        raise TypeError("Use 'await node.get(name)' with asyncio")
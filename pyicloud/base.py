@@ -1,31 +1,36 @@
 """Library base file."""
 from uuid import uuid1
-import inspect
-import json
+import atexit
+from collections.abc import Mapping
+from concurrent.futures import Future
+import contextlib
+import copy
 import logging
-from requests import Session
+import sys
+import threading
+import time
+import weakref
+from requests import Response, Session
+from requests.utils import get_encoding_from_headers
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
 from tempfile import gettempdir
 from os import path, mkdir
-from re import match
 import http.cookiejar as cookielib
 import getpass
 
+from pyicloud.cache import WRITE_METHODS
+from pyicloud.codec import get_codec
 from pyicloud.exceptions import (
     PyiCloudFailedLoginException,
     PyiCloudAPIResponseException,
     PyiCloud2SARequiredException,
     PyiCloudServiceNotActivatedException,
 )
-from pyicloud.services import (
-    FindMyiPhoneServiceManager,
-    CalendarService,
-    UbiquityService,
-    ContactsService,
-    RemindersService,
-    PhotosService,
-    AccountService,
-    DriveService,
-)
+from pyicloud import services
+from pyicloud.instrumentation import RequestEvent
+from pyicloud.retry import RetryPolicy
+from pyicloud.store import FileSessionStore
+from pyicloud.transport import TimeoutConfig, TransportConfig
 from pyicloud.utils import get_password_from_keyring
 
 
@@ -39,109 +44,396 @@ HEADER_DATA = {
     "scnt": "scnt",
 }
 
+JSON_MIMETYPES = ["application/json", "text/json"]
+
+# Sessions still alive, flushed on interpreter exit
+_SESSIONS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_sessions():
+    for session in list(_SESSIONS):
+        try:
+            session.flush()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to flush session %s on exit", session)
+
+
+_NO_LOCK = contextlib.nullcontext()
+
+
+def _cookies_state(cookies):
+    """Returns a comparable snapshot of a cookie jar."""
+    return sorted(
+        (cookie.domain, cookie.path, cookie.name, cookie.value, cookie.expires or 0)
+        for cookie in cookies
+    )
+
+
+def _get_cookies_lock(cookies):
+    """Returns the lock of a cookie jar.
+
+    Cookie jars lock their updates, but not their iteration.
+    """
+    # pylint: disable=protected-access
+    return getattr(cookies, "_cookies_lock", _NO_LOCK)
+
+
+# Modules sending requests, whose HTTP loggers get the password filter
+REQUEST_LOGGER_MODULES = (
+    "pyicloud.base",
+    "pyicloud.services.account",
+    "pyicloud.services.calendar",
+    "pyicloud.services.contacts",
+    "pyicloud.services.drive",
+    "pyicloud.services.findmyiphone",
+    "pyicloud.services.photos",
+    "pyicloud.services.reminders",
+    "pyicloud.services.ubiquity",
+)
+
+
+class _RedactedMessage:
+    """Log message formatted, and its passwords hidden, only when emitted."""
+
+    __slots__ = ("msg", "args", "passwords", "_message")
+
+    def __init__(self, msg, args, passwords):
+        self.msg = msg
+        self.args = args
+        self.passwords = passwords
+        self._message = None
+
+    def __str__(self):
+        if self._message is None:
+            message = str(self.msg)
+            if self.args:
+                message = message % self.args
+            for password in self.passwords:
+                message = message.replace(password, "*" * 8)
+            self._message = message
+        return self._message
+
 
 class PyiCloudPasswordFilter(logging.Filter):
-    """Password log hider."""
+    """Password log hider.
+
+    A single filter hides the passwords of all the accounts: each service
+    adds its password to `PASSWORD_FILTER` and removes it once closed.
+    """
+
+    def __init__(self, password=None):
+        super().__init__()
+        self._counts = {}
+        self._passwords = ()
+        self._lock = threading.Lock()
+        if password:
+            self.add_password(password)
 
-    def __init__(self, password):
-        super().__init__(password)
+    @property
+    def passwords(self):
+        """Gets the hidden passwords."""
+        return self._passwords
+
+    def add_password(self, password):
+        """Hides a password, until removed as many times as added."""
+        if not password:
+            return
+        with self._lock:
+            self._counts[password] = self._counts.get(password, 0) + 1
+            self._update_passwords()
+
+    def remove_password(self, password):
+        """Stops hiding a password once removed as many times as added."""
+        with self._lock:
+            count = self._counts.pop(password, 0) - 1
+            if count > 0:
+                self._counts[password] = count
+            self._update_passwords()
+
+    def _update_passwords(self):
+        # Longest first, not to partly reveal passwords containing others
+        self._passwords = tuple(sorted(self._counts, key=len, reverse=True))
 
     def filter(self, record):
-        message = record.getMessage()
-        if self.name in message:
-            record.msg = message.replace(self.name, "*" * 8)
-            record.args = []
+        passwords = self._passwords
+        if not passwords:
+            return True
+        if isinstance(record.msg, _RedactedMessage):
+            # Already wrapped by another filter: hide our passwords too
+            missing = tuple(
+                password
+                for password in passwords
+                if password not in record.msg.passwords
+            )
+            if missing:
+                record.msg.passwords = tuple(
+                    sorted(record.msg.passwords + missing, key=len, reverse=True)
+                )
+                record.msg._message = None  # pylint: disable=protected-access
+        else:
+            # Records dropped by the handlers are never formatted
+            record.msg = _RedactedMessage(record.msg, record.args, passwords)
+            record.args = ()
 
         return True
 
 
-class PyiCloudSession(Session):
-    """iCloud session."""
+# Filter of the pyicloud loggers, hiding the passwords of the open services
+PASSWORD_FILTER = PyiCloudPasswordFilter()
+
 
-    def __init__(self, service):
+def _freeze(value):
+    """Returns a hashable equivalent of request params, data or headers."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if value is None or isinstance(value, (str, bytes, int, float)):
+        return value
+    return repr(value)
+
+
+def _get_request_key(method, url, params, data, headers, json):
+    """Returns a hashable key of identical requests."""
+    return (
+        method.upper(),
+        url,
+        _freeze(params),
+        _freeze(data),
+        _freeze(headers),
+        _freeze(json),
+    )
+
+
+def _get_body_size(body):
+    """Returns the size of a request body, 0 if it is not sized."""
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, bytes):
+        return len(body)
+    return 0
+
+
+def _get_response_size(response):
+    """Returns the size of a response body, without reading a streamed one."""
+    # pylint: disable=protected-access
+    if response._content_consumed and response._content:
+        return len(response._content)
+    return int(response.headers.get("Content-Length", 0))
+
+
+class PyiCloudSessionBase:
+    """Transport independent part of the iCloud sessions."""
+
+    request_logger_modules = REQUEST_LOGGER_MODULES
+
+    # Cookie jar of the session, set by the transport session
+    cookies = None
+
+    def __init__(
+        self,
+        service,
+        persist_interval=0,
+        retry_policy=None,
+        rate_limiter=None,
+        codec=None,
+        listeners=None,
+        concurrency_limiter=None,
+        coalesce_requests=False,
+        response_cache=None,
+    ):
         self.service = service
-        super().__init__()
+        self.persist_interval = persist_interval
+        self.coalesce_requests = coalesce_requests
+        self.response_cache = response_cache
+        self.coalesced_requests = 0
+        self.listeners = list(listeners or [])
+        self.codec = get_codec(codec)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+
+        self._persisted_session_data = None
+        self._persisted_cookies = None
+        self._last_persist = None
+        self._request_loggers = {}
+        self._known_webservices = None
+        self._webservice_roots = {}
+        # Guards the session data and the persisted state
+        self._state_lock = threading.RLock()
+        # Incremented by each re-authentication of the session
+        self._auth_generation = 0
+        # Requests in flight, by coalescing key
+        self._inflight = {}
+
+        for module_name in self.request_logger_modules:
+            self._get_request_logger(module_name)
 
-    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        super().__init__()
+        _SESSIONS.add(self)
 
-        # Charge logging to the right service endpoint
-        callee = inspect.stack()[2]
-        module = inspect.getmodule(callee[0])
-        request_logger = logging.getLogger(module.__name__).getChild("http")
-        if self.service.password_filter not in request_logger.filters:
+    def _get_request_logger(self, module_name):
+        """Returns the HTTP logger of a module, with the password filter."""
+        request_logger = self._request_loggers.get(module_name)
+        if request_logger is None:
+            request_logger = logging.getLogger(f"{module_name or __name__}.http")
             request_logger.addFilter(self.service.password_filter)
+            self._request_loggers[module_name] = request_logger
+        return request_logger
+
+    def _release_request_loggers(self):
+        """Forgets the request loggers, their password filter being shared
+        with the other sessions."""
+        self._request_loggers = {}
+
+    def _limit_concurrency(self):
+        """Returns a context holding a concurrency slot of the account."""
+        if self.concurrency_limiter is None:
+            return _NO_LOCK
+        return self.concurrency_limiter.limit(self.service.user["accountName"])
+
+    def add_listener(self, listener):
+        """Adds a callable called with the `RequestEvent` of each request."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Removes a request listener."""
+        self.listeners.remove(listener)
+
+    def _notify_listeners(self, event):
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Request listener %r failed", listener)
 
-        request_logger.debug("%s %s %s", method, url, kwargs.get("data", ""))
+    def _get_coalescing_key(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        headers=None,
+        files=None,
+        stream=False,
+        json=None,
+    ):
+        """Returns the key of identical requests, None if a request must not
+        be coalesced: only idempotent requests which are not streamed are."""
+        if (
+            not self.coalesce_requests
+            or stream
+            or not self.retry_policy.is_idempotent(method, url, files)
+        ):
+            return None
+        return _get_request_key(method, url, params, data, headers, json)
 
-        has_retried = kwargs.get("retried")
-        kwargs.pop("retried", None)
-        response = super().request(method, url, **kwargs)
+    def _is_write(self, method, url, files=None):
+        """Returns whether a request may change the account."""
+        return method.upper() in WRITE_METHODS or not self.retry_policy.is_idempotent(
+            method, url, files
+        )
 
-        content_type = response.headers.get("Content-Type", "").split(";")[0]
-        json_mimetypes = ["application/json", "text/json"]
+    def _get_cache_rule(self, method, url, kwargs):
+        """Returns the cache key and time to live of a request, (None, None)
+        if its response is not cached: only reads matching a cache rule,
+        which are not streamed, are."""
+        ttl = self.response_cache.get_ttl(url)
+        if ttl is None or kwargs.get("stream") or kwargs.get("files"):
+            return None, None
+        key = _get_request_key(
+            method,
+            url,
+            kwargs.get("params"),
+            kwargs.get("data"),
+            kwargs.get("headers"),
+            kwargs.get("json"),
+        )
+        return self.response_cache.get_key(key), ttl
 
-        for header, value in HEADER_DATA.items():
-            if response.headers.get(header):
-                session_arg = value
-                self.service.session_data.update(
-                    {session_arg: response.headers.get(header)}
-                )
+    def _get_endpoint_service(self, url):
+        """Returns the name of the iCloud service a URL belongs to.
 
-        # Save session_data to file
-        with open(self.service.session_path, "w", encoding="utf-8") as outfile:
-            json.dump(self.service.session_data, outfile)
-            LOGGER.debug("Saved session data to file")
+        Webservices are named by their key in the account data ("findme",
+        "ckdatabasews", "drivews"...), the authentication and setup endpoints
+        are "auth" and "setup". Returns None for other URLs (contents...).
+        """
+        if url.startswith(self.service.AUTH_ENDPOINT):
+            return "auth"
+        if url.startswith(self.service.SETUP_ENDPOINT):
+            return "setup"
+
+        webservices = getattr(self.service, "_webservices", None)
+        if webservices is not self._known_webservices:
+            webservice_roots = {}
+            for name, webservice in (webservices or {}).items():
+                if webservice.get("url"):
+                    webservice_roots.setdefault(webservice["url"], name)
+            self._webservice_roots = webservice_roots
+            self._known_webservices = webservices
+
+        end = url.find("/", url.find("//") + 2)
+        return self._webservice_roots.get(url if end < 0 else url[:end])
+
+    def _update_session_data(self, response):
+        """Updates the session data from the response headers.
+
+        Returns the response content type.
+        """
+        with self._state_lock:
+            for header, value in HEADER_DATA.items():
+                if response.headers.get(header):
+                    session_arg = value
+                    self.service.session_data.update(
+                        {session_arg: response.headers.get(header)}
+                    )
 
-        # Save cookies to file
-        self.cookies.save(ignore_discard=True, ignore_expires=True)
-        LOGGER.debug("Cookies saved to %s", self.service.cookiejar_path)
+        return response.headers.get("Content-Type", "").split(";")[0]
 
-        if not response.ok and (
-            content_type not in json_mimetypes
-            or response.status_code in [421, 450, 500]
-        ):
-            try:
-                # pylint: disable=protected-access
-                fmip_url = self.service._get_webservice_url("findme")
-                if (
-                    has_retried is None
-                    and response.status_code in [421, 450, 500]
-                    and fmip_url in url
-                ):
-                    # Handle re-authentication for Find My iPhone
-                    LOGGER.debug("Re-authenticating Find My iPhone service")
-                    try:
-                        # If 450, authentication requires a full sign in to the account
-                        service = None if response.status_code == 450 else "find"
-                        self.service.authenticate(True, service)
-
-                    except PyiCloudAPIResponseException:
-                        LOGGER.debug("Re-authentication failed")
-                    kwargs["retried"] = True
-                    return self.request(method, url, **kwargs)
-            except Exception:
-                pass
-
-            if has_retried is None and response.status_code in [421, 450, 500]:
-                api_error = PyiCloudAPIResponseException(
-                    response.reason, response.status_code, retry=True
-                )
-                request_logger.debug(api_error)
-                kwargs["retried"] = True
-                return self.request(method, url, **kwargs)
+    def _process_response_headers(self, response):
+        """Updates the session data from the response headers, and persists
+        it.
 
-            self._raise_error(response.status_code, response.reason)
+        Returns the response content type.
+        """
+        with self._state_lock:
+            content_type = self._update_session_data(response)
+            self.persist()
 
-        if content_type not in json_mimetypes:
-            return response
+        return content_type
+
+    def _get_reauthentication_service(self, response, url):
+        """Returns the service to re-authenticate a failed Find My iPhone request.
+
+        Returns False when the response does not require a re-authentication.
+        """
+        if response.status_code not in [421, 450, 500]:
+            return False
+        try:
+            # pylint: disable=protected-access
+            fmip_url = self.service._get_webservice_url("findme")
+        except Exception:  # pylint: disable=broad-except
+            return False
+        if fmip_url not in url:
+            return False
+
+        # If 450, authentication requires a full sign in to the account
+        return None if response.status_code == 450 else "find"
 
+    def _get_response_error(self, response, request_logger):
+        """Returns the (code, reason) error reported in a JSON response body.
+
+        Returns None when the response reports no error.
+        """
         try:
             data = response.json()
         except:  # pylint: disable=bare-except
             request_logger.warning("Failed to parse response with JSON mimetype")
-            return response
+            return None
 
-        request_logger.debug(data)
+        if request_logger.isEnabledFor(logging.DEBUG):
+            request_logger.debug(data)
 
         if isinstance(data, dict):
             reason = data.get("errorMessage")
@@ -157,9 +449,68 @@ class PyiCloudSession(Session):
                 code = data.get("serverErrorCode")
 
             if reason:
-                self._raise_error(code, reason)
+                return code, reason
+        return None
+
+    def _is_restored(self, endpoint_service):
+        """Returns whether requests to a service use the account data
+        restored from disk, not validated yet."""
+        return endpoint_service not in ("auth", "setup") and not getattr(
+            self.service, "validated", True
+        )
 
-        return response
+    def _check_response_data(self, response, request_logger):
+        """Raises the error reported in a JSON response body, if any."""
+        error = self._get_response_error(response, request_logger)
+        if error:
+            self._raise_error(*error)
+
+    def _get_retry_delay(self, request_logger, method, url, attempt, reason, **kwargs):
+        """Returns the delay before retrying a failed request, or None."""
+        delay = self.retry_policy.get_delay(method, url, attempt, **kwargs)
+        if delay is not None and request_logger.isEnabledFor(logging.DEBUG):
+            request_logger.debug(
+                "%s, retrying %s %s in %.1f seconds", reason, method, url, delay
+            )
+        return delay
+
+    def persist(self, force=False):
+        """Saves session data and cookies if they changed since the last save.
+
+        Saves are coalesced over `persist_interval` seconds, pending changes
+        are written by `flush`, `close` or at interpreter exit.
+        """
+        with self._state_lock, _get_cookies_lock(self.cookies):
+            session_data = self.service.session_data
+            cookies = _cookies_state(self.cookies)
+            session_data_changed = session_data != self._persisted_session_data
+            cookies_changed = cookies != self._persisted_cookies
+            if not session_data_changed and not cookies_changed:
+                return
+
+            now = time.monotonic()
+            if (
+                not force
+                and self._last_persist is not None
+                and now - self._last_persist < self.persist_interval
+            ):
+                return
+            self._last_persist = now
+
+            account = self.service.user["accountName"]
+            if session_data_changed:
+                self.service.session_store.save_session_data(account, session_data)
+                self._persisted_session_data = copy.deepcopy(session_data)
+                LOGGER.debug("Saved session data to %s", self.service.session_store)
+
+            if cookies_changed:
+                self.service.session_store.save_cookies(account, self.cookies)
+                self._persisted_cookies = cookies
+                LOGGER.debug("Cookies saved to %s", self.service.session_store)
+
+    def flush(self):
+        """Writes any pending session data and cookies changes."""
+        self.persist(force=True)
 
     def _raise_error(self, code, reason):
         if (
@@ -189,6 +540,408 @@ class PyiCloudSession(Session):
         raise api_error
 
 
+_NOT_PARSED = object()
+
+
+class PyiCloudResponse(Response):
+    """Response parsing its JSON body once, with the session JSON codec."""
+
+    codec = None
+    from_cache = False
+    _parsed_json = _NOT_PARSED
+
+    def json(self, **kwargs):
+        if kwargs or self.codec is None:
+            return super().json(**kwargs)
+        if self._parsed_json is _NOT_PARSED:
+            self._parsed_json = self.codec.loads(self.content)
+        return self._parsed_json
+
+
+class PyiCloudSession(PyiCloudSessionBase, Session):
+    """iCloud session."""
+
+    def __init__(
+        self,
+        service,
+        persist_interval=0,
+        transport=None,
+        timeouts=None,
+        retry_policy=None,
+        rate_limiter=None,
+        codec=None,
+        listeners=None,
+        adapter=None,
+        concurrency_limiter=None,
+        coalesce_requests=False,
+        response_cache=None,
+    ):
+        super().__init__(
+            service,
+            persist_interval=persist_interval,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            codec=codec,
+            listeners=listeners,
+            concurrency_limiter=concurrency_limiter,
+            coalesce_requests=coalesce_requests,
+            response_cache=response_cache,
+        )
+        self.transport = transport or TransportConfig()
+        self.timeouts = timeouts or TimeoutConfig()
+        # A shared adapter is left open when the session closes
+        self._shared_adapter = adapter is not None
+        self.mount_transport(adapter or self.transport.create_adapter())
+
+        self._auth_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+
+    def mount_transport(self, adapter):
+        """Mounts a transport adapter for all the HTTP(S) requests.
+
+        An adapter may be shared by several sessions to share its connections.
+        """
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+
+        # Charge logging to the right service endpoint
+        # pylint: disable=protected-access
+        caller_globals = sys._getframe(2).f_globals
+        request_logger = self._get_request_logger(caller_globals.get("__name__"))
+
+        if request_logger.isEnabledFor(logging.DEBUG):
+            request_logger.debug("%s %s %s", method, url, kwargs.get("data", ""))
+
+        has_retried = kwargs.pop("retried", None)
+        endpoint_service = self._get_endpoint_service(url)
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self.timeouts.get(
+                endpoint_service, kwargs.get("stream", False)
+            )
+
+        if self.response_cache is not None and has_retried is None:
+            return self._request_cached(
+                method, url, request_logger, endpoint_service, **kwargs
+            )
+        return self._dispatch(
+            method, url, request_logger, endpoint_service, has_retried, **kwargs
+        )
+
+    def _request_cached(self, method, url, request_logger, endpoint_service, **kwargs):
+        """Serves a request from the response cache, or sends it and caches
+        its response. Writes drop the cached responses of the account."""
+        cache = self.response_cache
+        account = self.service.user["accountName"]
+        if endpoint_service != "auth" and self._is_write(
+            method, url, kwargs.get("files")
+        ):
+            try:
+                return self._dispatch(
+                    method, url, request_logger, endpoint_service, None, **kwargs
+                )
+            finally:
+                cache.invalidate(account)
+
+        key, ttl = self._get_cache_rule(method, url, kwargs)
+        if key is None:
+            return self._dispatch(
+                method, url, request_logger, endpoint_service, None, **kwargs
+            )
+
+        entry, fresh = cache.lookup(account, key)
+        if fresh:
+            request_logger.debug("Cached response of %s %s", method, url)
+            response = self._get_cached_response(entry, url)
+            if self.listeners:
+                event = RequestEvent(endpoint_service, method, url)
+                event.cached = True
+                event.finish(response.status_code, 0, len(entry.content))
+                self._notify_listeners(event)
+            return response
+        if entry is not None:
+            kwargs["headers"] = dict(
+                kwargs.get("headers") or {}, **entry.get_conditional_headers()
+            )
+
+        response = self._dispatch(
+            method, url, request_logger, endpoint_service, None, **kwargs
+        )
+        if response.status_code == 304 and entry is not None:
+            entry = cache.revalidate(account, key, entry, ttl, response.headers)
+            return self._get_cached_response(entry, url)
+        if response.status_code == 200:
+            cache.store(
+                account,
+                key,
+                ttl,
+                response.status_code,
+                response.headers,
+                response.content,
+            )
+        return response
+
+    def _get_cached_response(self, entry, url):
+        """Returns the response of a cache entry."""
+        # pylint: disable=protected-access
+        response = PyiCloudResponse()
+        response.codec = self.codec
+        response.from_cache = True
+        response.status_code = entry.status_code
+        response.reason = "OK"
+        response.headers.update(entry.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response._content = entry.content
+        response._content_consumed = True
+        return response
+
+    def _dispatch(
+        self, method, url, request_logger, endpoint_service, has_retried, **kwargs
+    ):
+        """Sends a request, or waits for an identical one in flight."""
+        key = None
+        if has_retried is None:
+            key = self._get_coalescing_key(
+                method,
+                url,
+                kwargs.get("params"),
+                kwargs.get("data"),
+                kwargs.get("headers"),
+                kwargs.get("files"),
+                kwargs.get("stream", False),
+                kwargs.get("json"),
+            )
+        if key is not None:
+            return self._coalesce(
+                key,
+                self._send_request,
+                method,
+                url,
+                request_logger,
+                endpoint_service,
+                has_retried,
+                **kwargs,
+            )
+        return self._send_request(
+            method, url, request_logger, endpoint_service, has_retried, **kwargs
+        )
+
+    def _coalesce(self, key, send, *args, **kwargs):
+        """Sends a request, unless an identical one is in flight: its
+        response (or error) is then shared, once received."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.coalesced_requests += 1
+                leader = False
+        if not leader:
+            return future.result()
+
+        try:
+            response = send(*args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(response)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        return response
+
+    def _send_request(
+        self, method, url, request_logger, endpoint_service, has_retried, **kwargs
+    ):
+        """Sends a request, reporting it to the listeners."""
+        event = RequestEvent(endpoint_service, method, url)
+        try:
+            response = self._request_with_retries(
+                method,
+                url,
+                request_logger,
+                endpoint_service,
+                event,
+                has_retried,
+                **kwargs,
+            )
+        except Exception as error:
+            if self.listeners:
+                event.finish(bytes_sent=_get_body_size(kwargs.get("data")), error=error)
+                self._notify_listeners(event)
+            raise
+
+        if self.listeners:
+            event.finish(
+                response.status_code,
+                _get_body_size(response.request.body),
+                _get_response_size(response),
+            )
+            self._notify_listeners(event)
+        return response
+
+    def _request_with_retries(
+        self,
+        method,
+        url,
+        request_logger,
+        endpoint_service,
+        event,
+        has_retried,
+        **kwargs,
+    ):
+        """Sends a request, retries it as needed, returns the response."""
+        attempt = 1
+        while True:
+            auth_generation = self._auth_generation
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint_service)
+            try:
+                with self._limit_concurrency():
+                    response = super().request(method, url, **kwargs)
+                response.__class__ = PyiCloudResponse
+                response.codec = self.codec
+            except (RequestsConnectionError, Timeout) as error:
+                delay = self._get_retry_delay(
+                    request_logger,
+                    method,
+                    url,
+                    attempt,
+                    error,
+                    files=kwargs.get("files"),
+                )
+                if delay is None:
+                    raise
+                self.retry_policy.sleep(delay)
+                attempt += 1
+                event.retries += 1
+                continue
+
+            content_type = self._process_response_headers(response)
+
+            if not response.ok and self.retry_policy.is_retryable(response.status_code):
+                delay = self._get_retry_delay(
+                    request_logger,
+                    method,
+                    url,
+                    attempt,
+                    f"{response.reason} ({response.status_code})",
+                    headers=response.headers,
+                    files=kwargs.get("files"),
+                )
+                if delay is not None:
+                    response.close()
+                    self.retry_policy.sleep(delay)
+                    attempt += 1
+                    event.retries += 1
+                    continue
+
+            if (
+                has_retried is None
+                and response.status_code == 401
+                and self._is_restored(endpoint_service)
+            ):
+                # Validate the account data restored from disk
+                LOGGER.debug("Validating restored session")
+                response.close()
+                self._reauthenticate(auth_generation, self.service.authenticate)
+                has_retried = True
+                event.retries += 1
+                continue
+
+            if not response.ok and (
+                content_type not in JSON_MIMETYPES
+                or response.status_code in [421, 450, 500]
+            ):
+                if has_retried is None and response.status_code in [421, 450, 500]:
+                    service = self._get_reauthentication_service(response, url)
+                    if service is not False:
+                        # Handle re-authentication for Find My iPhone
+                        LOGGER.debug("Re-authenticating Find My iPhone service")
+                        self._reauthenticate(
+                            auth_generation, self.service.authenticate, True, service
+                        )
+                    elif self._is_restored(endpoint_service):
+                        # Validate the account data restored from disk
+                        LOGGER.debug("Validating restored session")
+                        self._reauthenticate(auth_generation, self.service.authenticate)
+                    else:
+                        api_error = PyiCloudAPIResponseException(
+                            response.reason, response.status_code, retry=True
+                        )
+                        request_logger.debug(api_error)
+                    response.close()
+                    has_retried = True
+                    event.retries += 1
+                    continue
+
+                self._raise_error(response.status_code, response.reason)
+
+            if content_type in JSON_MIMETYPES:
+                error = self._get_response_error(response, request_logger)
+                if error:
+                    code, reason = error
+                    if (
+                        has_retried is None
+                        and code == "AUTHENTICATION_FAILED"
+                        and self._is_restored(endpoint_service)
+                    ):
+                        LOGGER.debug("Validating restored session")
+                        response.close()
+                        self._reauthenticate(auth_generation, self.service.authenticate)
+                        has_retried = True
+                        event.retries += 1
+                        continue
+                    if self.retry_policy.is_retryable(code=code):
+                        delay = self._get_retry_delay(
+                            request_logger,
+                            method,
+                            url,
+                            attempt,
+                            f"{reason} ({code})",
+                            headers=response.headers,
+                            files=kwargs.get("files"),
+                        )
+                        if delay is not None:
+                            response.close()
+                            self.retry_policy.sleep(delay)
+                            attempt += 1
+                            event.retries += 1
+                            continue
+                    self._raise_error(code, reason)
+
+            return response
+
+    def _reauthenticate(self, generation, authenticate, *args):
+        """Re-authenticates the session once for all the requests failing
+        after the `generation` authentication.
+
+        Concurrent requests wait for the re-authentication in progress,
+        rather than starting theirs, then replay.
+        """
+        with self._auth_lock:
+            if generation != self._auth_generation:
+                LOGGER.debug("Session already re-authenticated")
+                return
+            try:
+                authenticate(*args)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.debug("Re-authentication failed")
+            self._auth_generation += 1
+
+    def close(self):
+        self.flush()
+        _SESSIONS.discard(self)
+        self._release_request_loggers()
+        if self._shared_adapter:
+            self.adapters.clear()
+        super().close()
+
+
 class PyiCloudService:
     """
     A base authentication class for the iCloud service. Handles the
@@ -204,6 +957,8 @@ class PyiCloudService:
     HOME_ENDPOINT = "https://www.icloud.com"
     SETUP_ENDPOINT = "https://setup.icloud.com/setup/ws/1"
 
+    session_class = PyiCloudSession
+
     def __init__(
         self,
         apple_id,
@@ -213,7 +968,87 @@ class PyiCloudService:
         client_id=None,
         with_family=True,
         china_mainland=False,
+        session_persist_interval=0,
+        transport=None,
+        timeouts=None,
+        retry_policy=None,
+        rate_limiter=None,
+        json_codec=None,
+        request_listeners=None,
+        service_ttls=None,
+        validate_max_age=None,
+        session_store=None,
+        transport_adapter=None,
+        concurrency_limiter=None,
+        coalesce_requests=False,
+        response_cache=None,
+    ):
+        self._setup(
+            apple_id,
+            password,
+            cookie_directory,
+            client_id,
+            with_family,
+            china_mainland,
+            service_ttls,
+            validate_max_age,
+            session_store,
+        )
+
+        self.session = self.session_class(
+            self,
+            persist_interval=session_persist_interval,
+            transport=transport,
+            timeouts=timeouts,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            codec=json_codec,
+            listeners=request_listeners,
+            adapter=transport_adapter,
+            concurrency_limiter=concurrency_limiter,
+            coalesce_requests=coalesce_requests,
+            response_cache=response_cache,
+        )
+        self.session.verify = verify
+        self._setup_session()
+
+        try:
+            if not self._restore_account_data():
+                self.authenticate()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the session, saving its pending changes, and stops hiding
+        the password in the logs."""
+        try:
+            self.session.close()
+        finally:
+            self._release_password_filter()
+
+    def _release_password_filter(self):
+        self.password_filter.remove_password(self.user["password"])
+
+    def _setup(
+        self,
+        apple_id,
+        password,
+        cookie_directory,
+        client_id,
+        with_family,
+        china_mainland,
+        service_ttls=None,
+        validate_max_age=None,
+        session_store=None,
     ):
+        """Sets up the account, its session store and its session data."""
         # If the country or region setting of your Apple ID is China mainland.
         # See https://support.apple.com/en-us/HT208351
         if china_mainland:
@@ -229,58 +1064,62 @@ class PyiCloudService:
         self.params = {}
         self.client_id = client_id or ("auth-%s" % str(uuid1()).lower())
         self.with_family = with_family
+        # Whether self.data was validated, rather than restored from disk
+        self.validated = False
+        self.validate_max_age = validate_max_age
 
-        self.password_filter = PyiCloudPasswordFilter(password)
+        self.password_filter = PASSWORD_FILTER
+        self.password_filter.add_password(password)
         LOGGER.addFilter(self.password_filter)
 
-        if cookie_directory:
-            self._cookie_directory = path.expanduser(path.normpath(cookie_directory))
-            if not path.exists(self._cookie_directory):
-                mkdir(self._cookie_directory, 0o700)
-        else:
-            topdir = path.join(gettempdir(), "pyicloud")
-            self._cookie_directory = path.join(topdir, getpass.getuser())
-            if not path.exists(topdir):
-                mkdir(topdir, 0o777)
-            if not path.exists(self._cookie_directory):
-                mkdir(self._cookie_directory, 0o700)
+        if session_store is None:
+            if not cookie_directory:
+                topdir = path.join(gettempdir(), "pyicloud")
+                cookie_directory = path.join(topdir, getpass.getuser())
+                if not path.exists(topdir):
+                    mkdir(topdir, 0o777)
+            session_store = FileSessionStore(cookie_directory)
+        self.session_store = session_store
 
-        LOGGER.debug("Using session file %s", self.session_path)
+        LOGGER.debug("Using session store %s", self.session_store)
 
         self.session_data = {}
         try:
-            with open(self.session_path, encoding="utf-8") as session_f:
-                self.session_data = json.load(session_f)
+            self.session_data = self.session_store.load_session_data(apple_id) or {}
         except:  # pylint: disable=bare-except
-            LOGGER.info("Session file does not exist")
+            LOGGER.info("Session data could not be read")
+        if not self.session_data:
+            LOGGER.info("Session data does not exist")
         if self.session_data.get("client_id"):
             self.client_id = self.session_data.get("client_id")
         else:
             self.session_data.update({"client_id": self.client_id})
 
-        self.session = PyiCloudSession(self)
-        self.session.verify = verify
+        # Services by property name, with the monotonic time they expire at
+        self.service_ttls = dict(service_ttls or {})
+        self._services = {}
+        # Locks of the services being created, by property name
+        self._service_locks = {}
+        self._service_locks_lock = threading.Lock()
+        self._webservices = None
+
+    def _setup_session(self):
+        """Sets up the session headers and loads its cookies."""
         self.session.headers.update(
             {"Origin": self.HOME_ENDPOINT, "Referer": "%s/" % self.HOME_ENDPOINT}
         )
 
-        cookiejar_path = self.cookiejar_path
-        self.session.cookies = cookielib.LWPCookieJar(filename=cookiejar_path)
-        if path.exists(cookiejar_path):
-            try:
-                self.session.cookies.load(ignore_discard=True, ignore_expires=True)
-                LOGGER.debug("Read cookies from %s", cookiejar_path)
-            except:  # pylint: disable=bare-except
-                # Most likely a pickled cookiejar from earlier versions.
-                # The cookiejar will get replaced with a valid one after
-                # successful authentication.
-                LOGGER.warning("Failed to read cookiejar %s", cookiejar_path)
-
-        self.authenticate()
-
-        self._drive = None
-        self._files = None
-        self._photos = None
+        self.session.cookies = cookielib.LWPCookieJar(filename=self.cookiejar_path)
+        try:
+            if self.session_store.load_cookies(
+                self.user["accountName"], self.session.cookies
+            ):
+                LOGGER.debug("Read cookies from %s", self.session_store)
+        except:  # pylint: disable=bare-except
+            # Most likely a pickled cookiejar from earlier versions.
+            # The cookiejar will get replaced with a valid one after
+            # successful authentication.
+            LOGGER.warning("Failed to read cookies from %s", self.session_store)
 
     def authenticate(self, force_refresh=False, service=None):
         """
@@ -298,8 +1137,7 @@ class PyiCloudService:
                 LOGGER.debug("Invalid authentication token, will log in from scratch.")
 
         if not login_successful and service is not None:
-            app = self.data["apps"][service]
-            if "canLaunchWithOneFactor" in app and app["canLaunchWithOneFactor"]:
+            if self._can_authenticate_with_service(service):
                 LOGGER.debug(
                     "Authenticating as %s for %s", self.user["accountName"], service
                 )
@@ -314,27 +1152,12 @@ class PyiCloudService:
         if not login_successful:
             LOGGER.debug("Authenticating as %s", self.user["accountName"])
 
-            data = dict(self.user)
-
-            data["rememberMe"] = True
-            data["trustTokens"] = []
-            if self.session_data.get("trust_token"):
-                data["trustTokens"] = [self.session_data.get("trust_token")]
-
-            headers = self._get_auth_headers()
-
-            if self.session_data.get("scnt"):
-                headers["scnt"] = self.session_data.get("scnt")
-
-            if self.session_data.get("session_id"):
-                headers["X-Apple-ID-Session-Id"] = self.session_data.get("session_id")
-
             try:
                 self.session.post(
                     "%s/signin" % self.AUTH_ENDPOINT,
                     params={"isRememberMeEnabled": "true"},
-                    data=json.dumps(data),
-                    headers=headers,
+                    data=self.session.codec.dumps(self._get_signin_data()),
+                    headers=self._get_session_headers(self._get_auth_headers()),
                 )
             except PyiCloudAPIResponseException as error:
                 msg = "Invalid email/password combination."
@@ -342,22 +1165,107 @@ class PyiCloudService:
 
             self._authenticate_with_token()
 
-        self._webservices = self.data["webservices"]
+        self._set_webservices(self.data["webservices"])
+        self.validated = True
+        self._save_account_data()
 
         LOGGER.debug("Authentication completed successfully")
 
-    def _authenticate_with_token(self):
-        """Authenticate using session token."""
-        data = {
+    def _restore_account_data(self):
+        """Restores the account data of the last authentication, when it is
+        younger than `validate_max_age` seconds.
+
+        The session is then validated lazily, on the first request failing
+        with an authentication error. Returns True if the data was restored.
+        """
+        if self.validate_max_age is None or not self.session_data.get("session_token"):
+            return False
+        try:
+            account_data = self.session_store.load_account_data(
+                self.user["accountName"]
+            )
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to read account data from %s", self.session_store)
+            return False
+        if account_data is None:
+            return False
+
+        age = time.time() - account_data.get("saved_at", 0)
+        if not 0 <= age <= self.validate_max_age:
+            LOGGER.debug("Account data is too old (%d seconds)", age)
+            return False
+        if account_data.get("session_token") != self.session_data["session_token"]:
+            return False
+
+        LOGGER.debug("Restored account data, skipping validation")
+        self.data = account_data["data"]
+        self._set_webservices(self.data["webservices"])
+        self.validated = False
+        return True
+
+    def _save_account_data(self):
+        """Saves the account data for `validate_max_age` seconds."""
+        if self.validate_max_age is None:
+            return
+        account_data = {
+            "saved_at": time.time(),
+            "session_token": self.session_data.get("session_token"),
+            "data": self.data,
+        }
+        try:
+            self.session_store.save_account_data(self.user["accountName"], account_data)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to save account data to %s", self.session_store)
+
+    def _can_authenticate_with_service(self, service):
+        """Returns True if the service can be logged into with credentials only."""
+        app = self.data["apps"][service]
+        return "canLaunchWithOneFactor" in app and app["canLaunchWithOneFactor"]
+
+    def _get_signin_data(self):
+        """Returns the sign in request body."""
+        data = dict(self.user)
+
+        data["rememberMe"] = True
+        data["trustTokens"] = []
+        if self.session_data.get("trust_token"):
+            data["trustTokens"] = [self.session_data.get("trust_token")]
+
+        return data
+
+    def _get_session_headers(self, headers):
+        """Adds the authentication session headers to headers."""
+        if self.session_data.get("scnt"):
+            headers["scnt"] = self.session_data.get("scnt")
+
+        if self.session_data.get("session_id"):
+            headers["X-Apple-ID-Session-Id"] = self.session_data.get("session_id")
+
+        return headers
+
+    def _get_token_login_data(self):
+        """Returns the account login request body for the session token."""
+        return {
             "accountCountryCode": self.session_data.get("account_country"),
             "dsWebAuthToken": self.session_data.get("session_token"),
             "extended_login": True,
             "trustToken": self.session_data.get("trust_token", ""),
         }
 
+    def _get_service_login_data(self, service):
+        """Returns the account login request body for a service."""
+        return {
+            "appName": service,
+            "apple_id": self.user["accountName"],
+            "password": self.user["password"],
+        }
+
+    def _authenticate_with_token(self):
+        """Authenticate using session token."""
         try:
             req = self.session.post(
-                "%s/accountLogin" % self.SETUP_ENDPOINT, data=json.dumps(data)
+                "%s/accountLogin" % self.SETUP_ENDPOINT,
+                data=self.session.codec.dumps(self._get_token_login_data()),
             )
             self.data = req.json()
         except PyiCloudAPIResponseException as error:
@@ -366,15 +1274,10 @@ class PyiCloudService:
 
     def _authenticate_with_credentials_service(self, service):
         """Authenticate to a specific service using credentials."""
-        data = {
-            "appName": service,
-            "apple_id": self.user["accountName"],
-            "password": self.user["password"],
-        }
-
         try:
             self.session.post(
-                "%s/accountLogin" % self.SETUP_ENDPOINT, data=json.dumps(data)
+                "%s/accountLogin" % self.SETUP_ENDPOINT,
+                data=self.session.codec.dumps(self._get_service_login_data(service)),
             )
 
             self.data = self._validate_token()
@@ -410,22 +1313,25 @@ class PyiCloudService:
             headers.update(overrides)
         return headers
 
+    def _get_store_path(self, kind):
+        if not isinstance(self.session_store, FileSessionStore):
+            return None
+        return self.session_store.get_path(self.user["accountName"], kind)
+
     @property
     def cookiejar_path(self):
-        """Get path for cookiejar file."""
-        return path.join(
-            self._cookie_directory,
-            "".join([c for c in self.user.get("accountName") if match(r"\w", c)]),
-        )
+        """Get path for cookiejar file, None if not stored in files."""
+        return self._get_store_path("cookies")
 
     @property
     def session_path(self):
-        """Get path for session data file."""
-        return path.join(
-            self._cookie_directory,
-            "".join([c for c in self.user.get("accountName") if match(r"\w", c)])
-            + ".session",
-        )
+        """Get path for session data file, None if not stored in files."""
+        return self._get_store_path("session")
+
+    @property
+    def account_data_path(self):
+        """Get path for the account data file, None if not stored in files."""
+        return self._get_store_path("account")
 
     @property
     def requires_2sa(self):
@@ -456,7 +1362,7 @@ class PyiCloudService:
 
     def send_verification_code(self, device):
         """Requests that a verification code is sent to the given device."""
-        data = json.dumps(device)
+        data = self.session.codec.dumps(device)
         request = self.session.post(
             "%s/sendVerificationCode" % self.SETUP_ENDPOINT,
             params=self.params,
@@ -467,7 +1373,7 @@ class PyiCloudService:
     def validate_verification_code(self, device, code):
         """Verifies a verification code received on a trusted device."""
         device.update({"verificationCode": code, "trustBrowser": True})
-        data = json.dumps(device)
+        data = self.session.codec.dumps(device)
 
         try:
             self.session.post(
@@ -489,18 +1395,14 @@ class PyiCloudService:
         """Verifies a verification code received via Apple's 2FA system (HSA2)."""
         data = {"securityCode": {"code": code}}
 
-        headers = self._get_auth_headers({"Accept": "application/json"})
-
-        if self.session_data.get("scnt"):
-            headers["scnt"] = self.session_data.get("scnt")
-
-        if self.session_data.get("session_id"):
-            headers["X-Apple-ID-Session-Id"] = self.session_data.get("session_id")
+        headers = self._get_session_headers(
+            self._get_auth_headers({"Accept": "application/json"})
+        )
 
         try:
             self.session.post(
                 "%s/verify/trusteddevice/securitycode" % self.AUTH_ENDPOINT,
-                data=json.dumps(data),
+                data=self.session.codec.dumps(data),
                 headers=headers,
             )
         except PyiCloudAPIResponseException as error:
@@ -517,13 +1419,7 @@ class PyiCloudService:
 
     def trust_session(self):
         """Request session trust to avoid user log in going forward."""
-        headers = self._get_auth_headers()
-
-        if self.session_data.get("scnt"):
-            headers["scnt"] = self.session_data.get("scnt")
-
-        if self.session_data.get("session_id"):
-            headers["X-Apple-ID-Session-Id"] = self.session_data.get("session_id")
+        headers = self._get_session_headers(self._get_auth_headers())
 
         try:
             self.session.get(
@@ -536,6 +1432,63 @@ class PyiCloudService:
             LOGGER.error("Session trust failed.")
             return False
 
+    def _set_webservices(self, webservices):
+        """Sets the webservices of the account, and forgets the services
+        when their URLs changed."""
+        if webservices != self._webservices:
+            self.invalidate_services()
+        self._webservices = webservices
+
+    def _get_cached_service(self, name):
+        """Returns a cached service, None if it is missing or expired."""
+        cached = self._services.get(name)
+        if cached is None:
+            return None
+        service, expires_at = cached
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._services.pop(name, None)
+            return None
+        return service
+
+    def _cache_service(self, name, service):
+        """Caches a service for its TTL, forever by default."""
+        ttl = self.service_ttls.get(name)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._services[name] = (service, expires_at)
+        return service
+
+    def _get_service_lock(self, name, lock_class=threading.Lock):
+        """Returns the lock creating a service once for concurrent
+        accesses."""
+        with self._service_locks_lock:
+            lock = self._service_locks.get(name)
+            if lock is None:
+                lock = self._service_locks[name] = lock_class()
+            return lock
+
+    def _get_service(self, name, factory):
+        """Returns a cached service, created by `factory` if needed."""
+        service = self._get_cached_service(name)
+        if service is None:
+            with self._get_service_lock(name):
+                service = self._get_cached_service(name)
+                if service is None:
+                    service = self._cache_service(name, factory())
+        return service
+
+    def invalidate_services(self, *names):
+        """Forgets cached services (as "devices", "photos"...), all of them by
+        default, so that they are created and fetched again on next access."""
+        if not names:
+            self._services = {}
+        for name in names:
+            self._services.pop(name, None)
+
+    def refresh_service(self, name):
+        """Creates and fetches a service again, returns it."""
+        self.invalidate_services(name)
+        return getattr(self, name)
+
     def _get_webservice_url(self, ws_key):
         """Get webservice URL, raise an exception if not exists."""
         if self._webservices.get(ws_key) is None:
@@ -547,9 +1500,14 @@ class PyiCloudService:
     @property
     def devices(self):
         """Returns all devices."""
-        service_root = self._get_webservice_url("findme")
-        return FindMyiPhoneServiceManager(
-            service_root, self.session, self.params, self.with_family
+        return self._get_service(
+            "devices",
+            lambda: services.FindMyiPhoneServiceManager(
+                self._get_webservice_url("findme"),
+                self.session,
+                self.params,
+                self.with_family,
+            ),
         )
 
     @property
@@ -560,54 +1518,75 @@ class PyiCloudService:
     @property
     def account(self):
         """Gets the 'Account' service."""
-        service_root = self._get_webservice_url("account")
-        return AccountService(service_root, self.session, self.params)
+        return self._get_service(
+            "account",
+            lambda: services.AccountService(
+                self._get_webservice_url("account"), self.session, self.params
+            ),
+        )
 
     @property
     def files(self):
         """Gets the 'File' service."""
-        if not self._files:
-            service_root = self._get_webservice_url("ubiquity")
-            self._files = UbiquityService(service_root, self.session, self.params)
-        return self._files
+        return self._get_service(
+            "files",
+            lambda: services.UbiquityService(
+                self._get_webservice_url("ubiquity"), self.session, self.params
+            ),
+        )
 
     @property
     def photos(self):
         """Gets the 'Photo' service."""
-        if not self._photos:
-            service_root = self._get_webservice_url("ckdatabasews")
-            self._photos = PhotosService(service_root, self.session, self.params)
-        return self._photos
+        return self._get_service(
+            "photos",
+            lambda: services.PhotosService(
+                self._get_webservice_url("ckdatabasews"), self.session, self.params
+            ),
+        )
 
     @property
     def calendar(self):
         """Gets the 'Calendar' service."""
-        service_root = self._get_webservice_url("calendar")
-        return CalendarService(service_root, self.session, self.params)
+        return self._get_service(
+            "calendar",
+            lambda: services.CalendarService(
+                self._get_webservice_url("calendar"), self.session, self.params
+            ),
+        )
 
     @property
     def contacts(self):
         """Gets the 'Contacts' service."""
-        service_root = self._get_webservice_url("contacts")
-        return ContactsService(service_root, self.session, self.params)
+        return self._get_service(
+            "contacts",
+            lambda: services.ContactsService(
+                self._get_webservice_url("contacts"), self.session, self.params
+            ),
+        )
 
     @property
     def reminders(self):
         """Gets the 'Reminders' service."""
-        service_root = self._get_webservice_url("reminders")
-        return RemindersService(service_root, self.session, self.params)
+        return self._get_service(
+            "reminders",
+            lambda: services.RemindersService(
+                self._get_webservice_url("reminders"), self.session, self.params
+            ),
+        )
 
     @property
     def drive(self):
         """Gets the 'Drive' service."""
-        if not self._drive:
-            self._drive = DriveService(
+        return self._get_service(
+            "drive",
+            lambda: services.DriveService(
                 service_root=self._get_webservice_url("drivews"),
                 document_root=self._get_webservice_url("docws"),
                 session=self.session,
                 params=self.params,
-            )
-        return self._drive
+            ),
+        )
 
     def __str__(self):
         return f"iCloud API: {self.user.get('apple_id')}"
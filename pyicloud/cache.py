@@ -0,0 +1,348 @@
+"""HTTP response cache."""
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+
+from pyicloud.utils import _SQLiteConnections
+
+# Reads whose data rarely changes, and their time to live in seconds
+DEFAULT_CACHE_RULES = {
+    # Account
+    "/storageUsageInfo": 300,
+    "/getDevices": 300,
+    "/getFamilyDetails": 300,
+    # Calendar, reminders
+    "/ca/startup": 60,
+    "/rd/startup": 60,
+    # Drive
+    "/retrieveItemDetailsInFolders": 30,
+}
+
+# Methods which change the requested resource, even when idempotent
+WRITE_METHODS = ("PUT", "PATCH", "DELETE")
+
+# Response headers kept with the cached bodies
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CacheEntry:
+    """A cached response: its status, headers and body, the time it expires
+    at, and its validators (`ETag` and `Last-Modified` headers)."""
+
+    __slots__ = ("status_code", "headers", "content", "expires")
+
+    def __init__(self, status_code, headers, content, expires):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires = expires
+
+    @property
+    def etag(self):
+        """Returns the `ETag` of the response, None if it has none."""
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        """Returns the `Last-Modified` date of the response, None if it has
+        none."""
+        return self.headers.get("Last-Modified")
+
+    def get_conditional_headers(self):
+        """Returns the headers revalidating the entry."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def size(self):
+        """Returns the size of the body."""
+        return len(self.content)
+
+    def is_fresh(self, now=None):
+        """Returns whether the entry may be used without revalidation."""
+        return (now if now is not None else time.time()) < self.expires
+
+    def __repr__(self):
+        return f"<CacheEntry: {self.status_code}, {self.size} bytes>"
+
+
+class CacheBackend:
+    """Storage of the cache entries, by account and key: subclasses
+    implement `get`, `set`, `invalidate` and `clear`."""
+
+    def get(self, account, key):
+        """Returns an entry, None if there is none."""
+        raise NotImplementedError
+
+    def set(self, account, key, entry):
+        """Stores an entry."""
+        raise NotImplementedError
+
+    def invalidate(self, account):
+        """Drops the entries of an account."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drops all the entries."""
+        raise NotImplementedError
+
+    def close(self):
+        """Releases the resources of the backend."""
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Keeps the entries in memory, dropping the least recently used ones
+    beyond `max_size` bytes of bodies."""
+
+    def __init__(self, max_size=16 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, account, key):
+        with self._lock:
+            entry = self._entries.get((account, key))
+            if entry is not None:
+                self._entries.move_to_end((account, key))
+            return entry
+
+    def set(self, account, key, entry):
+        if entry.size > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop((account, key), None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[(account, key)] = entry
+            self.size += entry.size
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, account):
+        with self._lock:
+            for cache_key in [key for key in self._entries if key[0] == account]:
+                self.size -= self._entries.pop(cache_key).size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Keeps the entries in a SQLite database, shared by processes.
+
+    Expired entries are kept while they have a validator, to revalidate
+    them, and purged every `purge_interval` writes otherwise. The directory
+    of `filename` is created if needed.
+    """
+
+    def __init__(self, filename, timeout=30, purge_interval=100):
+        self._connections = _SQLiteConnections(filename, timeout)
+        self.filename = self._connections.filename
+        self.timeout = timeout
+        self.purge_interval = purge_interval
+        self._writes = 0
+
+        connection = self._get_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "account TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "status_code INTEGER NOT NULL, "
+            "headers TEXT NOT NULL, "
+            "content BLOB NOT NULL, "
+            "expires REAL NOT NULL, "
+            "validated INTEGER NOT NULL, "
+            "PRIMARY KEY (account, key))"
+        )
+
+    def _get_connection(self):
+        return self._connections.get()
+
+    def get(self, account, key):
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT status_code, headers, content, expires FROM responses "
+                "WHERE account = ? AND key = ?",
+                (account, key),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        status_code, headers, content, expires = row
+        return CacheEntry(status_code, json.loads(headers), bytes(content), expires)
+
+    def set(self, account, key, entry):
+        connection = self._get_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(account, key, status_code, headers, content, expires, validated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                account,
+                key,
+                entry.status_code,
+                json.dumps(entry.headers),
+                entry.content,
+                entry.expires,
+                entry.etag is not None or entry.last_modified is not None,
+            ),
+        )
+        self._writes += 1
+        if self._writes % self.purge_interval == 0:
+            connection.execute(
+                "DELETE FROM responses WHERE expires < ? AND NOT validated",
+                (time.time(),),
+            )
+
+    def invalidate(self, account):
+        self._get_connection().execute(
+            "DELETE FROM responses WHERE account = ?", (account,)
+        )
+
+    def clear(self):
+        self._get_connection().execute("DELETE FROM responses")
+
+    def close(self):
+        """Closes the connections of all the threads. Threads using the
+        backend afterwards open new ones."""
+        self._connections.close()
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.filename}>"
+
+
+class ResponseCache:
+    """Cache of the responses of the iCloud reads.
+
+    `rules` maps URL path fragments to the time to live of their responses,
+    in seconds: only the reads matching a rule are cached. Fresh responses
+    are served without a request. Stale ones with an `ETag` or a
+    `Last-Modified` header are revalidated with a conditional request, and
+    served again on a `304 Not Modified`.
+
+    The entries of an account are dropped by its writes (requests the retry
+    policy won't repeat, PUTs, PATCHs and DELETEs).
+
+    Usage:
+        cache = ResponseCache(SQLiteCacheBackend('~/.pyicloud/cache.db'))
+        api = PyiCloudService('username@apple.com', 'password',
+                              response_cache=cache)
+        cache.counters['hits']
+    """
+
+    def __init__(self, backend=None, rules=None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.rules = dict(DEFAULT_CACHE_RULES if rules is None else rules)
+
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stored": 0,
+            "invalidated": 0,
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def counters(self):
+        """Returns a copy of the cache counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def reset_counters(self):
+        """Resets the cache counters."""
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def get_ttl(self, url):
+        """Returns the time to live of the responses of a URL, None if they
+        are not cached."""
+        path = url.split("?", 1)[0]
+        for endpoint, ttl in self.rules.items():
+            if endpoint in path:
+                return ttl
+        return None
+
+    @staticmethod
+    def get_key(request_key):
+        """Returns the cache key of a request, from its hashable key."""
+        return hashlib.sha256(repr(request_key).encode("utf-8")).hexdigest()
+
+    def lookup(self, account, key):
+        """Returns the entry of a request, and whether it is fresh."""
+        entry = self.backend.get(account, key)
+        if entry is not None and entry.is_fresh():
+            self._count("hits")
+            return entry, True
+        self._count("misses")
+        return entry, False
+
+    def store(self, account, key, ttl, status_code, headers, content):
+        """Stores a response, returns its entry."""
+        entry = CacheEntry(
+            status_code,
+            {name: headers[name] for name in CACHED_HEADERS if name in headers},
+            content,
+            time.time() + ttl,
+        )
+        self.backend.set(account, key, entry)
+        self._count("stored")
+        return entry
+
+    def revalidate(self, account, key, entry, ttl, headers):
+        """Renews a stale entry confirmed by a `304 Not Modified`, returns
+        it."""
+        validators = {
+            name: headers[name] for name in ("ETag", "Last-Modified") if name in headers
+        }
+        renewed = CacheEntry(
+            entry.status_code,
+            dict(entry.headers, **validators),
+            entry.content,
+            time.time() + ttl,
+        )
+        self.backend.set(account, key, renewed)
+        self._count("revalidated")
+        return renewed
+
+    def invalidate(self, account):
+        """Drops the entries of an account."""
+        self.backend.invalidate(account)
+        self._count("invalidated")
+
+    def clear(self):
+        """Drops all the entries."""
+        self.backend.clear()
+
+    def close(self):
+        """Releases the resources of the backend."""
+        self.backend.close()
+
+    def __repr__(self):
+        return f"<ResponseCache: {self.backend!r}>"
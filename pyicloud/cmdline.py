@@ -4,11 +4,8 @@ A Command Line Wrapper to allow easy use of pyicloud for
 command line scripts, and related.
 """
 import argparse
-import pickle
 import sys
 
-from click import confirm
-
 from pyicloud import PyiCloudService
 from pyicloud.exceptions import PyiCloudFailedLoginException
 from . import utils
@@ -24,10 +21,19 @@ def create_pickled_data(idevice, filename):
     This allows the data to be used without resorting to screen / pipe
     scrapping.
     """
+    import pickle  # pylint: disable=import-outside-toplevel
+
     with open(filename, "wb") as pickle_file:
         pickle.dump(idevice.content, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
 
 
+def confirm(text):
+    """Prompts for a confirmation, importing click on first use."""
+    import click  # pylint: disable=import-outside-toplevel
+
+    return click.confirm(text)
+
+
 def main(args=None):
     """Main commandline entrypoint."""
     if args is None:
@@ -0,0 +1,87 @@
+"""JSON codecs."""
+import json
+
+
+class JSONCodec:
+    """JSON codec of the standard library."""
+
+    name = "json"
+
+    def dumps(self, obj):
+        """Serializes an object to a JSON string."""
+        return json.dumps(obj)
+
+    def loads(self, data):
+        """Parses a JSON string or bytes."""
+        return json.loads(data)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.name}>"
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson codec."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """ujson codec."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson  # pylint: disable=import-outside-toplevel
+
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False)
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+# By speed: the default codec is the first installed one
+CODECS = {
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    JSONCodec.name: JSONCodec,
+}
+
+_DEFAULT_CODEC = None
+
+
+def get_codec(codec=None):
+    """Returns a JSON codec.
+
+    `codec` is a codec, or the name of one ("orjson", "ujson" or "json").
+    By default, the fastest installed codec is returned, falling back to the
+    standard library.
+    """
+    global _DEFAULT_CODEC  # pylint: disable=global-statement
+
+    if codec is not None and not isinstance(codec, str):
+        return codec
+    if codec is not None:
+        return CODECS[codec]()
+
+    if _DEFAULT_CODEC is None:
+        for codec_class in CODECS.values():
+            try:
+                _DEFAULT_CODEC = codec_class()
+                break
+            except ImportError:
+                continue
+    return _DEFAULT_CODEC
@@ -0,0 +1,203 @@
+"""Request instrumentation."""
+import bisect
+import re
+import threading
+import time
+
+_ID_SEGMENT = re.compile(r"[^/]*\d[^/]*")
+
+
+def get_endpoint(url):
+    """Returns the path of a URL, its segments with digits (versions, ids,
+    file names...) replaced by "*" to bound the number of endpoints."""
+    start = url.find("/", url.find("//") + 2)
+    if start < 0:
+        return "/"
+    path = url[start:].split("?", 1)[0]
+    return _ID_SEGMENT.sub("*", path)
+
+
+class RequestEvent:
+    """A request sent by a session, reported to its listeners once done.
+
+    `service` is the name of the iCloud service (see `TimeoutConfig`), or the
+    host of other URLs. `latency` is the wall-clock time in seconds, retries
+    and their delays included. `status_code` is None, and `error` is set,
+    when the request failed without a response. `cached` is True when the
+    response was served by the response cache, without a request.
+    """
+
+    __slots__ = (
+        "service",
+        "endpoint",
+        "method",
+        "url",
+        "status_code",
+        "bytes_sent",
+        "bytes_received",
+        "retries",
+        "latency",
+        "error",
+        "cached",
+        "_started",
+    )
+
+    def __init__(self, service, method, url):
+        if service is None:
+            host_start = url.find("//") + 2
+            host_end = url.find("/", host_start)
+            service = url[host_start:] if host_end < 0 else url[host_start:host_end]
+        self.service = service
+        self.endpoint = get_endpoint(url)
+        self.method = method.upper()
+        self.url = url
+        self.status_code = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.latency = None
+        self.error = None
+        self.cached = False
+        self._started = time.perf_counter()
+
+    def finish(self, status_code=None, bytes_sent=0, bytes_received=0, error=None):
+        """Records the outcome of the request."""
+        self.latency = time.perf_counter() - self._started
+        self.status_code = status_code
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"<RequestEvent: {self.method} {self.service}{self.endpoint} "
+            f"{self.status_code} in {self.latency}s, {self.retries} retries>"
+        )
+
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    float("inf"),
+)
+
+
+class _Histogram:
+    """Latency histogram and counters of an endpoint."""
+
+    __slots__ = (
+        "count",
+        "errors",
+        "retries",
+        "bytes_sent",
+        "bytes_received",
+        "total",
+        "min",
+        "max",
+        "statuses",
+        "buckets",
+    )
+
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.statuses = {}
+        self.buckets = [0] * bucket_count
+
+
+class LatencyHistogram:
+    """In-memory latency histograms of the requests, by service, endpoint and
+    method. Add it as a session listener, and read it with `snapshot`.
+
+    Usage:
+        histogram = LatencyHistogram()
+        api = PyiCloudService('username@apple.com', 'password',
+                              request_listeners=[histogram])
+        histogram.snapshot()[('ckdatabasews', '/database/*/...', 'POST')]['p99']
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.bucket_bounds = tuple(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.service, event.endpoint, event.method)
+        bucket = bisect.bisect_left(self.bucket_bounds, event.latency)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = _Histogram(len(self.bucket_bounds))
+                self._histograms[key] = histogram
+            histogram.count += 1
+            if event.error is not None or (event.status_code or 0) >= 400:
+                histogram.errors += 1
+            histogram.retries += event.retries
+            histogram.bytes_sent += event.bytes_sent
+            histogram.bytes_received += event.bytes_received
+            histogram.total += event.latency
+            if histogram.min is None or event.latency < histogram.min:
+                histogram.min = event.latency
+            if histogram.max is None or event.latency > histogram.max:
+                histogram.max = event.latency
+            histogram.statuses[event.status_code] = (
+                histogram.statuses.get(event.status_code, 0) + 1
+            )
+            histogram.buckets[min(bucket, len(histogram.buckets) - 1)] += 1
+
+    def _percentile(self, histogram, percentile):
+        """Returns the upper bound of the bucket holding a percentile, capped
+        by the maximum latency."""
+        rank = percentile / 100 * histogram.count
+        seen = 0
+        for bound, count in zip(self.bucket_bounds, histogram.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, histogram.max)
+        return histogram.max
+
+    def snapshot(self):
+        """Returns the statistics of each (service, endpoint, method)."""
+        with self._lock:
+            snapshot = {}
+            for key, histogram in self._histograms.items():
+                snapshot[key] = {
+                    "count": histogram.count,
+                    "errors": histogram.errors,
+                    "retries": histogram.retries,
+                    "bytes_sent": histogram.bytes_sent,
+                    "bytes_received": histogram.bytes_received,
+                    "total": histogram.total,
+                    "mean": histogram.total / histogram.count,
+                    "min": histogram.min,
+                    "max": histogram.max,
+                    "p50": self._percentile(histogram, 50),
+                    "p90": self._percentile(histogram, 90),
+                    "p99": self._percentile(histogram, 99),
+                    "statuses": dict(histogram.statuses),
+                    "buckets": dict(zip(self.bucket_bounds, histogram.buckets)),
+                }
+            return snapshot
+
+    def reset(self):
+        """Forgets the recorded requests."""
+        with self._lock:
+            self._histograms = {}
@@ -0,0 +1,343 @@
+"""Local index of the photo library."""
+from datetime import datetime, timezone
+from itertools import islice
+import json
+
+from pyicloud.services.photos import PhotoAsset, PhotoChanges
+from pyicloud.utils import _SQLiteConnections
+
+# Columns of the indexed photos, after their id
+PHOTO_COLUMNS = (
+    "record_name",
+    "record_type",
+    "change_tag",
+    "filename",
+    "item_type",
+    "fingerprint",
+    "size",
+    "width",
+    "height",
+    "asset_date",
+    "added_date",
+    "versions",
+)
+
+# Photos written per statement
+BATCH_SIZE = 500
+
+
+def _to_timestamp(date):
+    """Returns the milliseconds since the epoch of a date, naive dates
+    being UTC."""
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp() * 1000)
+
+
+def _to_date(timestamp):
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp / 1000.0, timezone.utc)
+
+
+class PhotoIndex:
+    """Index of the photo library in a SQLite database, queried offline.
+
+    `update` indexes the photos of an album, and its membership; `refresh`
+    applies the changes of the library since the last refresh, the whole
+    library on the first one. Changes don't carry the album membership:
+    albums are kept up to date by updating them again.
+
+    The index is written a batch or a page at a time, so that a long scan
+    doesn't hold the database locked: an interrupted `update` leaves part
+    of the album membership until the next one. The directory of
+    `filename` is created if needed.
+
+    Queries return compact `PhotoAsset`s of the indexed values, downloaded
+    and deleted through `service` while their URLs and change tags are
+    current.
+
+    Usage:
+        index = PhotoIndex('~/.pyicloud/photos.db', api.photos)
+        index.update(api.photos.albums['Screenshots'])
+        index.refresh()
+        index.find(after=datetime(2019, 3, 1), before=datetime(2019, 4, 1))
+        index.find(min_size=50 * 1024 * 1024)
+    """
+
+    def __init__(self, filename, service=None, timeout=30):
+        self._connections = _SQLiteConnections(filename, timeout)
+        self.filename = self._connections.filename
+        self.service = service
+        self.timeout = timeout
+
+        connection = self._get_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(
+            "CREATE TABLE IF NOT EXISTS photos ("
+            "id TEXT PRIMARY KEY, "
+            "record_name TEXT NOT NULL, "
+            "record_type TEXT NOT NULL, "
+            "change_tag TEXT, "
+            "filename TEXT, "
+            "item_type TEXT, "
+            "fingerprint TEXT, "
+            "size INTEGER, "
+            "width INTEGER, "
+            "height INTEGER, "
+            "asset_date INTEGER, "
+            "added_date INTEGER, "
+            "versions TEXT);"
+            "CREATE INDEX IF NOT EXISTS photos_record_name ON photos (record_name);"
+            "CREATE INDEX IF NOT EXISTS photos_filename ON photos (filename);"
+            "CREATE INDEX IF NOT EXISTS photos_fingerprint ON photos (fingerprint);"
+            "CREATE INDEX IF NOT EXISTS photos_size ON photos (size);"
+            "CREATE INDEX IF NOT EXISTS photos_asset_date ON photos (asset_date);"
+            "CREATE INDEX IF NOT EXISTS photos_added_date ON photos (added_date);"
+            "CREATE TABLE IF NOT EXISTS albums ("
+            "album TEXT NOT NULL, "
+            "id TEXT NOT NULL, "
+            "PRIMARY KEY (album, id));"
+            "CREATE INDEX IF NOT EXISTS albums_id ON albums (id);"
+            "CREATE TABLE IF NOT EXISTS state ("
+            "name TEXT PRIMARY KEY, "
+            "value TEXT);"
+        )
+
+    def _get_connection(self):
+        return self._connections.get()
+
+    @property
+    def sync_token(self):
+        """Gets the sync token of the last refresh, None before the first
+        one."""
+        row = (
+            self._get_connection()
+            .execute("SELECT value FROM state WHERE name = 'sync_token'")
+            .fetchone()
+        )
+        return row[0] if row is not None else None
+
+    @staticmethod
+    def _set_sync_token(connection, sync_token):
+        connection.execute(
+            "INSERT OR REPLACE INTO state (name, value) VALUES ('sync_token', ?)",
+            (sync_token,),
+        )
+
+    @staticmethod
+    def _get_row(photo):
+        """Returns the indexed values of a photo."""
+        values = photo.get_values()
+        width, height = values["dimensions"] or (None, None)
+        versions = {
+            key: {name: value for name, value in version.items() if name != "filename"}
+            for key, version in values["versions"].items()
+        }
+        return (
+            values["photo_id"],
+            values["record_name"],
+            values["record_type"],
+            values["change_tag"],
+            values["filename"],
+            values["item_type"],
+            values["fingerprint"],
+            values["size"],
+            width,
+            height,
+            _to_timestamp(values["asset_date"]),
+            _to_timestamp(values["added_date"]) if values["added_date"] else None,
+            json.dumps(versions),
+        )
+
+    def _add_photos(self, connection, photos):
+        connection.executemany(
+            "INSERT OR REPLACE INTO photos (id, {}) VALUES (?, {})".format(
+                ", ".join(PHOTO_COLUMNS), ", ".join("?" * len(PHOTO_COLUMNS))
+            ),
+            [self._get_row(photo) for photo in photos],
+        )
+
+    @staticmethod
+    def _delete_record(connection, record_name):
+        """Deletes the photo of an asset or master record name."""
+        connection.execute(
+            "DELETE FROM albums WHERE id IN "
+            "(SELECT id FROM photos WHERE id = ? OR record_name = ?)",
+            (record_name, record_name),
+        )
+        connection.execute(
+            "DELETE FROM photos WHERE id = ? OR record_name = ?",
+            (record_name, record_name),
+        )
+
+    def update(self, album):
+        """Indexes the photos of an album, replacing its earlier
+        membership, committed a batch at a time. Returns the number of
+        photos."""
+        connection = self._get_connection()
+        count = 0
+        photos = iter(album.photos)
+        while True:
+            # Fetched outside of the transaction, not to lock the database
+            batch = list(islice(photos, BATCH_SIZE))
+            connection.execute("BEGIN")
+            try:
+                if not count:
+                    connection.execute(
+                        "DELETE FROM albums WHERE album = ?", (album.name,)
+                    )
+                self._add_photos(connection, batch)
+                connection.executemany(
+                    "INSERT OR IGNORE INTO albums (album, id) VALUES (?, ?)",
+                    [(album.name, photo.id) for photo in batch],
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            if not batch:
+                return count
+            count += len(batch)
+
+    def refresh(self):
+        """Applies the changes of the library since the last refresh,
+        committed a page at a time. Returns the number of changes."""
+        connection = self._get_connection()
+        count = 0
+        changes = PhotoChanges(self.service, self.sync_token, save=False)
+        # Each page is fetched outside of the transaction applying it
+        for page, sync_token in changes.pages():
+            connection.execute("BEGIN")
+            try:
+                for change in page:
+                    if change.photo is None or change.deleted:
+                        self._delete_record(connection, change.record_name)
+                    else:
+                        self._add_photos(connection, [change.photo])
+                self._set_sync_token(connection, sync_token)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            count += len(page)
+        return count
+
+    def _get_photo(self, row):
+        photo_id, record_name, record_type, change_tag = row[:4]
+        values = dict(zip(PHOTO_COLUMNS[3:], row[4:]))
+        versions = json.loads(values.pop("versions"))
+        filename = values["filename"]
+        for version in versions.values():
+            version["filename"] = filename
+        width, height = values.pop("width"), values.pop("height")
+        return PhotoAsset.from_values(
+            self.service,
+            photo_id,
+            record_name,
+            record_type,
+            change_tag,
+            dimensions=(width, height) if width is not None else None,
+            asset_date=_to_date(values.pop("asset_date")),
+            added_date=_to_date(values.pop("added_date")),
+            versions=versions,
+            **values,
+        )
+
+    def find(
+        self,
+        album=None,
+        after=None,
+        before=None,
+        min_size=None,
+        max_size=None,
+        item_type=None,
+        filename=None,
+        fingerprint=None,
+        limit=None,
+    ):
+        """Returns the indexed photos, by asset date.
+
+        `album` is an album name, `after` and `before` bound the asset date
+        (naive dates are UTC), `min_size` and `max_size` the size in bytes,
+        and `filename` is a SQL LIKE pattern.
+        """
+        conditions = []
+        params = []
+        if album is not None:
+            conditions.append("id IN (SELECT id FROM albums WHERE album = ?)")
+            params.append(album)
+        if after is not None:
+            conditions.append("asset_date >= ?")
+            params.append(_to_timestamp(after))
+        if before is not None:
+            conditions.append("asset_date < ?")
+            params.append(_to_timestamp(before))
+        if min_size is not None:
+            conditions.append("size >= ?")
+            params.append(min_size)
+        if max_size is not None:
+            conditions.append("size <= ?")
+            params.append(max_size)
+        for column, value in (
+            ("item_type", item_type),
+            ("fingerprint", fingerprint),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if filename is not None:
+            conditions.append("filename LIKE ?")
+            params.append(filename)
+
+        query = "SELECT id, {} FROM photos".format(", ".join(PHOTO_COLUMNS))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY asset_date, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self._get_connection().execute(query, params).fetchall()
+        return [self._get_photo(row) for row in rows]
+
+    def get(self, photo_id):
+        """Returns an indexed photo, None if it is not indexed."""
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT id, {} FROM photos WHERE id = ?".format(
+                    ", ".join(PHOTO_COLUMNS)
+                ),
+                (photo_id,),
+            )
+            .fetchone()
+        )
+        return self._get_photo(row) if row is not None else None
+
+    @property
+    def albums(self):
+        """Returns the names of the indexed albums."""
+        rows = self._get_connection().execute(
+            "SELECT DISTINCT album FROM albums ORDER BY album"
+        )
+        return [row[0] for row in rows]
+
+    def get_albums(self, photo_id):
+        """Returns the names of the indexed albums of a photo."""
+        rows = self._get_connection().execute(
+            "SELECT album FROM albums WHERE id = ? ORDER BY album", (photo_id,)
+        )
+        return [row[0] for row in rows]
+
+    def __len__(self):
+        return (
+            self._get_connection().execute("SELECT COUNT(*) FROM photos").fetchone()[0]
+        )
+
+    def close(self):
+        """Closes the connections of all the threads. Threads using the
+        index afterwards open new ones."""
+        self._connections.close()
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.filename}>"
@@ -0,0 +1,162 @@
+"""Pool of iCloud accounts."""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from pyicloud.base import PyiCloudService
+from pyicloud.ratelimit import ConcurrencyLimiter
+from pyicloud.transport import TransportConfig
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AccountPool:
+    """Authenticated iCloud accounts, sharing a connection pool.
+
+    The requests of all the accounts go through a single transport adapter,
+    and are bounded to `max_concurrency` in flight, `max_concurrency_per_account`
+    for each account. Other keyword arguments (`cookie_directory`,
+    `session_store`, `retry_policy`...) are passed to each `PyiCloudService`.
+
+    Usage:
+        with AccountPool(max_concurrency=20, max_concurrency_per_account=2) as pool:
+            pool.add('jappleseed@apple.com', 'password')
+            pool.add('jdoe@apple.com', 'password')
+            futures = pool.submit_all(lambda api: api.devices.keys())
+            for apple_id, future in futures.items():
+                print(apple_id, future.result())
+    """
+
+    service_class = PyiCloudService
+
+    def __init__(
+        self,
+        max_concurrency=None,
+        max_concurrency_per_account=None,
+        transport=None,
+        max_workers=None,
+        **service_kwargs,
+    ):
+        self.transport = transport or TransportConfig()
+        self.concurrency_limiter = ConcurrencyLimiter(
+            max_concurrency, max_concurrency_per_account
+        )
+        self.service_kwargs = service_kwargs
+
+        self._adapter = self.transport.create_adapter()
+        self._accounts = {}
+        self._lock = threading.Lock()
+        self._max_workers = max_workers or max_concurrency
+        self._executor = None
+        self._closed = False
+
+    def add(self, apple_id, password=None, **kwargs):
+        """Authenticates an account and adds it to the pool, returns its
+        `PyiCloudService`.
+
+        Keyword arguments override the pool service arguments.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The account pool is closed")
+            if apple_id in self._accounts:
+                raise ValueError(f"{apple_id} is already in the pool")
+
+        service = self.service_class(
+            apple_id,
+            password,
+            **{
+                **self.service_kwargs,
+                "transport": self.transport,
+                "transport_adapter": self._adapter,
+                "concurrency_limiter": self.concurrency_limiter,
+                **kwargs,
+            },
+        )
+        with self._lock:
+            if not self._closed and apple_id not in self._accounts:
+                self._accounts[apple_id] = service
+                return service
+        service.close()
+        raise ValueError(f"{apple_id} was added concurrently, or the pool closed")
+
+    def get(self, apple_id):
+        """Returns the `PyiCloudService` of an account."""
+        return self._accounts[apple_id]
+
+    __getitem__ = get
+
+    def remove(self, apple_id):
+        """Removes an account from the pool, and closes it."""
+        with self._lock:
+            service = self._accounts.pop(apple_id)
+        try:
+            service.close()
+        finally:
+            self.concurrency_limiter.forget(apple_id)
+
+    def submit(self, apple_id, function, *args, **kwargs):
+        """Calls `function(service, *args, **kwargs)` on the pool threads,
+        with the `PyiCloudService` of an account. Returns a future."""
+        service = self.get(apple_id)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The account pool is closed")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self._max_workers, thread_name_prefix="pyicloud"
+                )
+            return self._executor.submit(function, service, *args, **kwargs)
+
+    def submit_all(self, function, *args, **kwargs):
+        """Submits a function for every account, returns their futures by
+        Apple ID."""
+        return {
+            apple_id: self.submit(apple_id, function, *args, **kwargs)
+            for apple_id in self.apple_ids
+        }
+
+    @property
+    def apple_ids(self):
+        """Returns the Apple IDs of the accounts."""
+        with self._lock:
+            return list(self._accounts)
+
+    def close(self):
+        """Waits for the submitted calls, then closes the accounts and the
+        connections."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        with self._lock:
+            accounts, self._accounts = self._accounts, {}
+        for apple_id, service in accounts.items():
+            try:
+                service.close()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to close account %s", apple_id)
+            finally:
+                self.concurrency_limiter.forget(apple_id)
+        self._adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def __contains__(self, apple_id):
+        return apple_id in self._accounts
+
+    def __iter__(self):
+        return iter(self.apple_ids)
+
+    def __repr__(self):
+        return f"<AccountPool: {len(self)} accounts>"
@@ -0,0 +1,165 @@
+"""Client side rate limiting."""
+import asyncio
+import contextlib
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket, refilled with `rate` tokens per second up to `burst`.
+
+    Tokens are reserved under a lock and waited for outside of it, so the
+    bucket can be shared by threads and coroutines.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Takes tokens, returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # The tokens may go negative: later callers queue behind
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def __repr__(self):
+        return f"<TokenBucket: rate={self.rate}, burst={self.burst}>"
+
+
+class RateLimiter:
+    """Rate limits of the iCloud requests, by service.
+
+    `limits` maps service names (the webservice keys of the account such as
+    "ckdatabasews", "drivews", "docws" or "findme", "auth" and "setup") to a
+    rate in requests per second, or a (rate, burst) tuple. `default` limits
+    every other service, each on its own bucket.
+    """
+
+    def __init__(self, limits=None, default=None):
+        self.limits = dict(limits or {})
+        self.default = default
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "delayed": 0, "delay": 0.0}
+
+    @property
+    def counters(self):
+        """Returns a copy of the counters: requests, delayed requests and
+        the total delay in seconds."""
+        with self._lock:
+            return dict(self._counters)
+
+    def _get_bucket(self, service):
+        """Returns the bucket of a service, None if it is not limited."""
+        try:
+            return self._buckets[service]
+        except KeyError:
+            pass
+
+        bucket = None
+        limit = self.limits.get(service, self.default)
+        if isinstance(limit, tuple):
+            bucket = TokenBucket(*limit)
+        elif limit is not None:
+            bucket = TokenBucket(limit)
+        with self._lock:
+            return self._buckets.setdefault(service, bucket)
+
+    def reserve(self, service):
+        """Reserves a request to a service, returns the seconds to wait."""
+        bucket = self._get_bucket(service)
+        delay = bucket.reserve() if bucket is not None else 0.0
+        with self._lock:
+            self._counters["requests"] += 1
+            if delay:
+                self._counters["delayed"] += 1
+                self._counters["delay"] += delay
+        return delay
+
+    def acquire(self, service):
+        """Waits until a request to a service is allowed."""
+        delay = self.reserve(service)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, service):
+        """Waits until a request to a service is allowed, without blocking
+        the event loop."""
+        delay = self.reserve(service)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def __repr__(self):
+        return f"<RateLimiter: limits={self.limits}, default={self.default}>"
+
+
+class ConcurrencyLimiter:
+    """Limits the requests in flight, in total and by key (an account).
+
+    `max_concurrency` bounds the requests of all the keys, and
+    `max_concurrency_per_key` those of each key; None does not limit.
+    """
+
+    def __init__(self, max_concurrency=None, max_concurrency_per_key=None):
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_key = max_concurrency_per_key
+
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        self._key_semaphores = {}
+        self._lock = threading.Lock()
+
+    def _get_key_semaphore(self, key):
+        if not self.max_concurrency_per_key:
+            return None
+        with self._lock:
+            semaphore = self._key_semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrency_per_key)
+                self._key_semaphores[key] = semaphore
+            return semaphore
+
+    @contextlib.contextmanager
+    def limit(self, key):
+        """Waits for a slot of a key, holding it until the block exits."""
+        key_semaphore = self._get_key_semaphore(key)
+        # The key slot first, so that waiting requests of a busy key do not
+        # hold global slots
+        if key_semaphore is not None:
+            key_semaphore.acquire()
+        try:
+            if self._semaphore is not None:
+                self._semaphore.acquire()
+            try:
+                yield
+            finally:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+        finally:
+            if key_semaphore is not None:
+                key_semaphore.release()
+
+    def forget(self, key):
+        """Forgets the slots of a key without requests in flight."""
+        with self._lock:
+            self._key_semaphores.pop(key, None)
+
+    def __repr__(self):
+        return (
+            f"<ConcurrencyLimiter: max_concurrency={self.max_concurrency}, "
+            f"max_concurrency_per_key={self.max_concurrency_per_key}>"
+        )
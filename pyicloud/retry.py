@@ -0,0 +1,157 @@
+"""Retry policy."""
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+
+# Requests which change the account, and must not be sent twice
+NON_IDEMPOTENT_ENDPOINTS = (
+    # Authentication
+    "/signin",
+    "/securitycode",
+    "/sendVerificationCode",
+    "/validateVerificationCode",
+    # Find My iPhone
+    "/playSound",
+    "/sendMessage",
+    "/lostDevice",
+    # CloudKit (photos)
+    "/records/modify",
+    # Drive
+    "/createFolders",
+    "/renameItems",
+    "/moveItemsToTrash",
+    "/upload/web",
+    "/update/documents",
+    # Reminders
+    "/rd/reminders/tasks",
+)
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class RetryPolicy:
+    """Retries of failed iCloud requests.
+
+    Requests failing with a connection error, a `retry_statuses` status or a
+    `retry_codes` error code (Apple throttling) are retried up to
+    `max_attempts` attempts in total, after an exponential backoff with
+    jitter, or the delay asked by a `Retry-After` header.
+
+    Most iCloud reads are POSTs: POSTs are retried unless their URL matches
+    one of the `non_idempotent_endpoints`, nor are requests uploading files.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+        jitter=0.5,
+        max_retry_after=120,
+        retry_statuses=(429, 502, 503, 504),
+        retry_codes=("ACCESS_DENIED",),
+        non_idempotent_endpoints=NON_IDEMPOTENT_ENDPOINTS,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = retry_statuses
+        self.retry_codes = retry_codes
+        self.non_idempotent_endpoints = non_idempotent_endpoints
+
+        self._counters = {
+            "retries": 0,
+            "retry_after": 0,
+            "exhausted": 0,
+            "not_idempotent": 0,
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def counters(self):
+        """Returns a copy of the retry counters.
+
+        - retries: retried requests
+        - retry_after: retries delayed by a Retry-After header
+        - exhausted: failed requests which ran out of attempts
+        - not_idempotent: failed requests not retried as not idempotent
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def is_idempotent(self, method, url, files=None):
+        """Returns whether a request may be sent again."""
+        if files:
+            return False
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        path = url.split("?", 1)[0]
+        return not any(endpoint in path for endpoint in self.non_idempotent_endpoints)
+
+    def is_retryable(self, status_code=None, code=None):
+        """Returns whether a response status or error code may be retried."""
+        return status_code in self.retry_statuses or (
+            code is not None and code in self.retry_codes
+        )
+
+    def get_backoff(self, attempt):
+        """Returns the delay before the next attempt."""
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return backoff * (1 - self.jitter * random.random())
+
+    def get_retry_after(self, headers):
+        """Returns the delay asked by a Retry-After header, if any."""
+        value = headers.get("Retry-After") if headers is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def get_delay(self, method, url, attempt, headers=None, files=None):
+        """Returns the delay before retrying a failed attempt.
+
+        Returns None when the request must not be retried.
+        """
+        if not self.is_idempotent(method, url, files):
+            self._count("not_idempotent")
+            return None
+        if attempt >= self.max_attempts:
+            self._count("exhausted")
+            return None
+
+        delay = self.get_retry_after(headers)
+        if delay is not None:
+            if delay > self.max_retry_after:
+                self._count("exhausted")
+                return None
+            self._count("retry_after")
+        else:
+            delay = self.get_backoff(attempt)
+
+        self._count("retries")
+        return delay
+
+    def sleep(self, seconds):
+        """Waits before the next attempt."""
+        time.sleep(seconds)
+
+    def __repr__(self):
+        return (
+            f"<RetryPolicy: max_attempts={self.max_attempts}, "
+            f"backoff_factor={self.backoff_factor}, "
+            f"max_backoff={self.max_backoff}>"
+        )
@@ -1,9 +1,44 @@
-"""Services."""
-from pyicloud.services.calendar import CalendarService
-from pyicloud.services.findmyiphone import FindMyiPhoneServiceManager
-from pyicloud.services.ubiquity import UbiquityService
-from pyicloud.services.contacts import ContactsService
-from pyicloud.services.reminders import RemindersService
-from pyicloud.services.photos import PhotosService
-from pyicloud.services.account import AccountService
-from pyicloud.services.drive import DriveService
+"""Services.
+
+The service modules are imported on first access to their classes.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_SERVICE_MODULES = {
+    "CalendarService": "pyicloud.services.calendar",
+    "FindMyiPhoneServiceManager": "pyicloud.services.findmyiphone",
+    "UbiquityService": "pyicloud.services.ubiquity",
+    "ContactsService": "pyicloud.services.contacts",
+    "RemindersService": "pyicloud.services.reminders",
+    "PhotosService": "pyicloud.services.photos",
+    "AccountService": "pyicloud.services.account",
+    "DriveService": "pyicloud.services.drive",
+}
+
+# Imported for the static analysis, lazily otherwise
+if TYPE_CHECKING:
+    from pyicloud.services.account import AccountService
+    from pyicloud.services.calendar import CalendarService
+    from pyicloud.services.contacts import ContactsService
+    from pyicloud.services.drive import DriveService
+    from pyicloud.services.findmyiphone import FindMyiPhoneServiceManager
+    from pyicloud.services.photos import PhotosService
+    from pyicloud.services.reminders import RemindersService
+    from pyicloud.services.ubiquity import UbiquityService
+
+__all__ = list(_SERVICE_MODULES)
+
+
+def __getattr__(name):
+    try:
+        module_name = _SERVICE_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
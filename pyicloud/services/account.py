@@ -29,40 +29,41 @@ class AccountService:
         """Returns current paired devices."""
         if not self._devices:
             req = self.session.get(self._acc_devices_url, params=self.params)
-            response = req.json()
-
-            for device_info in response["devices"]:
-                self._devices.append(AccountDevice(device_info))
+            self._devices = self._parse_devices(req.json())
 
         return self._devices
 
+    def _parse_devices(self, response):  # pylint: disable=no-self-use
+        """Returns the devices of a response."""
+        return [AccountDevice(device_info) for device_info in response["devices"]]
+
     @property
     def family(self):
         """Returns family members."""
         if not self._family:
             req = self.session.get(self._acc_family_details_url, params=self.params)
-            response = req.json()
-
-            for member_info in response["familyMembers"]:
-                self._family.append(
-                    FamilyMember(
-                        member_info,
-                        self.session,
-                        self.params,
-                        self._acc_family_member_photo_url,
-                    )
-                )
+            self._family = self._parse_family(req.json())
 
         return self._family
 
+    def _parse_family(self, response):
+        """Returns the family members of a response."""
+        return [
+            FamilyMember(
+                member_info,
+                self.session,
+                self.params,
+                self._acc_family_member_photo_url,
+            )
+            for member_info in response["familyMembers"]
+        ]
+
     @property
     def storage(self):
         """Returns storage infos."""
         if not self._storage:
             req = self.session.get(self._acc_storage_url, params=self.params)
-            response = req.json()
-
-            self._storage = AccountStorage(response)
+            self._storage = AccountStorage(req.json())
 
         return self._storage
 
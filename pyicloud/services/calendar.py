@@ -26,18 +26,21 @@ class CalendarService:
         Fetches a single event's details by specifying a pguid
         (a calendar) and a guid (an event's ID).
         """
-        params = dict(self.params)
-        params.update({"lang": "en-us", "usertz": get_localzone_name()})
         url = f"{self._calendar_event_detail_url}/{pguid}/{guid}"
-        req = self.session.get(url, params=params)
+        req = self.session.get(url, params=self._get_params())
         self.response = req.json()
         return self.response["Event"][0]
 
-    def refresh_client(self, from_dt=None, to_dt=None):
+    def _get_params(self):
+        """Returns the request parameters."""
+        params = dict(self.params)
+        params.update({"lang": "en-us", "usertz": get_localzone_name()})
+        return params
+
+    def _get_range_params(self, from_dt=None, to_dt=None):
         """
-        Refreshes the CalendarService endpoint, ensuring that the
-        event data is up-to-date. If no 'from_dt' or 'to_dt' datetimes
-        have been given, the range becomes this month.
+        Returns the request parameters for a date range, by default,
+        this month.
         """
         today = datetime.today()
         first_day, last_day = monthrange(today.year, today.month)
@@ -45,16 +48,24 @@ class CalendarService:
             from_dt = datetime(today.year, today.month, first_day)
         if not to_dt:
             to_dt = datetime(today.year, today.month, last_day)
-        params = dict(self.params)
+        params = self._get_params()
         params.update(
             {
-                "lang": "en-us",
-                "usertz": get_localzone_name(),
                 "startDate": from_dt.strftime("%Y-%m-%d"),
                 "endDate": to_dt.strftime("%Y-%m-%d"),
             }
         )
-        req = self.session.get(self._calendar_refresh_url, params=params)
+        return params
+
+    def refresh_client(self, from_dt=None, to_dt=None):
+        """
+        Refreshes the CalendarService endpoint, ensuring that the
+        event data is up-to-date. If no 'from_dt' or 'to_dt' datetimes
+        have been given, the range becomes this month.
+        """
+        req = self.session.get(
+            self._calendar_refresh_url, params=self._get_range_params(from_dt, to_dt)
+        )
         self.response = req.json()
 
     def events(self, from_dt=None, to_dt=None):
@@ -68,19 +79,6 @@ class CalendarService:
         """
         Retrieves calendars of this month.
         """
-        today = datetime.today()
-        first_day, last_day = monthrange(today.year, today.month)
-        from_dt = datetime(today.year, today.month, first_day)
-        to_dt = datetime(today.year, today.month, last_day)
-        params = dict(self.params)
-        params.update(
-            {
-                "lang": "en-us",
-                "usertz": get_localzone_name(),
-                "startDate": from_dt.strftime("%Y-%m-%d"),
-                "endDate": to_dt.strftime("%Y-%m-%d"),
-            }
-        )
-        req = self.session.get(self._calendars, params=params)
+        req = self.session.get(self._calendars, params=self._get_range_params())
         self.response = req.json()
         return self.response["Collection"]
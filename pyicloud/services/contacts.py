@@ -22,6 +22,16 @@ class ContactsService:
         Refreshes the ContactsService endpoint, ensuring that the
         contacts data is up-to-date.
         """
+        req = self.session.get(self._contacts_refresh_url, params=self._get_params())
+        self.response = req.json()
+
+        req = self.session.get(
+            self._contacts_next_url, params=self._get_next_params(self.response)
+        )
+        self.response = req.json()
+
+    def _get_params(self):
+        """Returns the request parameters."""
         params_contacts = dict(self.params)
         params_contacts.update(
             {
@@ -30,20 +40,20 @@ class ContactsService:
                 "order": "last,first",
             }
         )
-        req = self.session.get(self._contacts_refresh_url, params=params_contacts)
-        self.response = req.json()
+        return params_contacts
 
-        params_next = dict(params_contacts)
+    def _get_next_params(self, response):
+        """Returns the contacts request parameters following a startup response."""
+        params_next = self._get_params()
         params_next.update(
             {
-                "prefToken": self.response["prefToken"],
-                "syncToken": self.response["syncToken"],
+                "prefToken": response["prefToken"],
+                "syncToken": response["syncToken"],
                 "limit": "0",
                 "offset": "0",
             }
         )
-        req = self.session.get(self._contacts_next_url, params=params_next)
-        self.response = req.json()
+        return params_next
 
     def all(self):
         """
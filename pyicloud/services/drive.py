@@ -1,6 +1,5 @@
 """Drive service."""
 from datetime import datetime, timedelta
-import json
 import logging
 import io
 import mimetypes
@@ -39,18 +38,20 @@ class DriveService:
         request = self.session.post(
             self._service_root + "/retrieveItemDetailsInFolders",
             params=self.params,
-            data=json.dumps(
-                [
-                    {
-                        "drivewsid": "FOLDER::com.apple.CloudDocs::%s" % node_id,
-                        "partialData": False,
-                    }
-                ]
-            ),
+            data=self.session.codec.dumps(self._get_retrieve_items_data(node_id)),
         )
         self._raise_if_error(request)
         return request.json()[0]
 
+    def _get_retrieve_items_data(self, node_id):  # pylint: disable=no-self-use
+        """Returns the folder details request body."""
+        return [
+            {
+                "drivewsid": "FOLDER::com.apple.CloudDocs::%s" % node_id,
+                "partialData": False,
+            }
+        ]
+
     def get_file(self, file_id, **kwargs):
         """Returns iCloud Drive file."""
         file_params = dict(self.params)
@@ -60,13 +61,18 @@ class DriveService:
             params=file_params,
         )
         self._raise_if_error(response)
-        response_json = response.json()
+        return self.session.get(
+            self._get_file_url(response.json()), params=self.params, **kwargs
+        )
+
+    def _get_file_url(self, response_json):  # pylint: disable=no-self-use
+        """Returns the content URL of a file download response."""
         package_token = response_json.get("package_token")
         data_token = response_json.get("data_token")
         if data_token and data_token.get("url"):
-            return self.session.get(data_token["url"], params=self.params, **kwargs)
+            return data_token["url"]
         if package_token and package_token.get("url"):
-            return self.session.get(package_token["url"], params=self.params, **kwargs)
+            return package_token["url"]
         raise KeyError("'data_token' nor 'package_token'")
 
     def get_app_data(self):
@@ -79,6 +85,20 @@ class DriveService:
 
     def _get_upload_contentws_url(self, file_object):
         """Get the contentWS endpoint URL to add a new file."""
+        file_params = self.params
+        file_params.update(self._get_token_from_cookie())
+
+        request = self.session.post(
+            self._document_root + "/ws/com.apple.CloudDocs/upload/web",
+            params=file_params,
+            headers={"Content-Type": "text/plain"},
+            data=self.session.codec.dumps(self._get_upload_contentws_data(file_object)),
+        )
+        self._raise_if_error(request)
+        return (request.json()[0]["document_id"], request.json()[0]["url"])
+
+    def _get_upload_contentws_data(self, file_object):  # pylint: disable=no-self-use
+        """Returns the contentWS upload request body."""
         content_type = mimetypes.guess_type(file_object.name)[0]
         if content_type is None:
             content_type = ""
@@ -89,26 +109,31 @@ class DriveService:
         file_size = file_object.tell()
         file_object.seek(orig_pos, os.SEEK_SET)
 
-        file_params = self.params
-        file_params.update(self._get_token_from_cookie())
+        return {
+            "filename": file_object.name,
+            "type": "FILE",
+            "content_type": content_type,
+            "size": file_size,
+        }
 
+    def _update_contentws(self, folder_id, sf_info, document_id, file_object):
         request = self.session.post(
-            self._document_root + "/ws/com.apple.CloudDocs/upload/web",
-            params=file_params,
+            self._document_root + "/ws/com.apple.CloudDocs/update/documents",
+            params=self.params,
             headers={"Content-Type": "text/plain"},
-            data=json.dumps(
-                {
-                    "filename": file_object.name,
-                    "type": "FILE",
-                    "content_type": content_type,
-                    "size": file_size,
-                }
+            data=self.session.codec.dumps(
+                self._get_update_contentws_data(
+                    folder_id, sf_info, document_id, file_object
+                )
             ),
         )
         self._raise_if_error(request)
-        return (request.json()[0]["document_id"], request.json()[0]["url"])
+        return request.json()
 
-    def _update_contentws(self, folder_id, sf_info, document_id, file_object):
+    def _get_update_contentws_data(  # pylint: disable=no-self-use
+        self, folder_id, sf_info, document_id, file_object
+    ):
+        """Returns the contentWS update request body."""
         data = {
             "data": {
                 "signature": sf_info["fileChecksum"],
@@ -137,14 +162,7 @@ class DriveService:
         if sf_info.get("receipt"):
             data["data"].update({"receipt": sf_info["receipt"]})
 
-        request = self.session.post(
-            self._document_root + "/ws/com.apple.CloudDocs/update/documents",
-            params=self.params,
-            headers={"Content-Type": "text/plain"},
-            data=json.dumps(data),
-        )
-        self._raise_if_error(request)
-        return request.json()
+        return data
 
     def send_file(self, folder_id, file_object):
         """Send new file to iCloud Drive."""
@@ -161,61 +179,73 @@ class DriveService:
             self._service_root + "/createFolders",
             params=self.params,
             headers={"Content-Type": "text/plain"},
-            data=json.dumps(
-                {
-                    "destinationDrivewsId": parent,
-                    "folders": [
-                        {
-                            "clientId": self.params["clientId"],
-                            "name": name,
-                        }
-                    ],
-                }
-            ),
+            data=self.session.codec.dumps(self._get_create_folders_data(parent, name)),
         )
         self._raise_if_error(request)
         return request.json()
 
+    def _get_create_folders_data(self, parent, name):
+        """Returns the folder creation request body."""
+        return {
+            "destinationDrivewsId": parent,
+            "folders": [
+                {
+                    "clientId": self.params["clientId"],
+                    "name": name,
+                }
+            ],
+        }
+
     def rename_items(self, node_id, etag, name):
         """Renames an iCloud Drive node"""
         request = self.session.post(
             self._service_root + "/renameItems",
             params=self.params,
-            data=json.dumps(
-                {
-                    "items": [
-                        {
-                            "drivewsid": node_id,
-                            "etag": etag,
-                            "name": name,
-                        }
-                    ],
-                }
+            data=self.session.codec.dumps(
+                self._get_rename_items_data(node_id, etag, name)
             ),
         )
         self._raise_if_error(request)
         return request.json()
 
+    def _get_rename_items_data(  # pylint: disable=no-self-use
+        self, node_id, etag, name
+    ):
+        """Returns the rename request body."""
+        return {
+            "items": [
+                {
+                    "drivewsid": node_id,
+                    "etag": etag,
+                    "name": name,
+                }
+            ],
+        }
+
     def move_items_to_trash(self, node_id, etag):
         """Moves an iCloud Drive node to the trash bin"""
         request = self.session.post(
             self._service_root + "/moveItemsToTrash",
             params=self.params,
-            data=json.dumps(
-                {
-                    "items": [
-                        {
-                            "drivewsid": node_id,
-                            "etag": etag,
-                            "clientId": self.params["clientId"],
-                        }
-                    ],
-                }
+            data=self.session.codec.dumps(
+                self._get_move_items_to_trash_data(node_id, etag)
             ),
         )
         self._raise_if_error(request)
         return request.json()
 
+    def _get_move_items_to_trash_data(self, node_id, etag):
+        """Returns the move to trash request body."""
+        return {
+            "items": [
+                {
+                    "drivewsid": node_id,
+                    "etag": etag,
+                    "clientId": self.params["clientId"],
+                }
+            ],
+        }
+
     @property
     def root(self):
         """Returns the root node."""
@@ -1,6 +1,4 @@
 """Find my iPhone service."""
-import json
-
 from pyicloud.exceptions import PyiCloudNoDevicesException
 
 
@@ -22,6 +20,7 @@ class FindMyiPhoneServiceManager:
         self._fmip_message_url = "%s/sendMessage" % fmip_endpoint
         self._fmip_lost_url = "%s/lostDevice" % fmip_endpoint
 
+        self.response = None
         self._devices = {}
         self.refresh_client()
 
@@ -34,37 +33,47 @@ class FindMyiPhoneServiceManager:
         req = self.session.post(
             self._fmip_refresh_url,
             params=self.params,
-            data=json.dumps(
-                {
-                    "clientContext": {
-                        "fmly": self.with_family,
-                        "shouldLocate": True,
-                        "selectedDevice": "all",
-                        "deviceListVersion": 1,
-                    }
-                }
-            ),
+            data=self.session.codec.dumps(self._get_refresh_client_data()),
         )
-        self.response = req.json()
+        self._update_devices(req.json())
+
+    def _get_refresh_client_data(self):
+        """Returns the refresh request body."""
+        return {
+            "clientContext": {
+                "fmly": self.with_family,
+                "shouldLocate": True,
+                "selectedDevice": "all",
+                "deviceListVersion": 1,
+            }
+        }
+
+    def _update_devices(self, response):
+        """Updates the devices from a refresh response."""
+        self.response = response
 
         for device_info in self.response["content"]:
             device_id = device_info["id"]
             if device_id not in self._devices:
-                self._devices[device_id] = AppleDevice(
-                    device_info,
-                    self.session,
-                    self.params,
-                    manager=self,
-                    sound_url=self._fmip_sound_url,
-                    lost_url=self._fmip_lost_url,
-                    message_url=self._fmip_message_url,
-                )
+                self._devices[device_id] = self._create_device(device_info)
             else:
                 self._devices[device_id].update(device_info)
 
         if not self._devices:
             raise PyiCloudNoDevicesException()
 
+    def _create_device(self, device_info):
+        """Returns a new device."""
+        return AppleDevice(
+            device_info,
+            self.session,
+            self.params,
+            manager=self,
+            sound_url=self._fmip_sound_url,
+            lost_url=self._fmip_lost_url,
+            message_url=self._fmip_message_url,
+        )
+
     def __getitem__(self, key):
         if isinstance(key, int):
             key = list(self.keys())[key]
@@ -117,6 +126,10 @@ class AppleDevice:
         This returns only a subset of possible properties.
         """
         self.manager.refresh_client()
+        return self._get_status(additional)
+
+    def _get_status(self, additional):
+        """Returns status information from the device data."""
         fields = ["batteryLevel", "deviceDisplayName", "deviceStatus", "name"]
         fields += additional
         properties = {}
@@ -129,15 +142,17 @@ class AppleDevice:
 
         It's possible to pass a custom message by changing the `subject`.
         """
-        data = json.dumps(
-            {
-                "device": self.content["id"],
-                "subject": subject,
-                "clientContext": {"fmly": True},
-            }
-        )
+        data = self.session.codec.dumps(self._get_sound_data(subject))
         self.session.post(self.sound_url, params=self.params, data=data)
 
+    def _get_sound_data(self, subject):
+        """Returns the play sound request body."""
+        return {
+            "device": self.content["id"],
+            "subject": subject,
+            "clientContext": {"fmly": True},
+        }
+
     def display_message(
         self, subject="Find My iPhone Alert", message="This is a note", sounds=False
     ):
@@ -145,17 +160,21 @@ class AppleDevice:
 
         It's possible to pass a custom message by changing the `subject`.
         """
-        data = json.dumps(
-            {
-                "device": self.content["id"],
-                "subject": subject,
-                "sound": sounds,
-                "userText": True,
-                "text": message,
-            }
+        data = self.session.codec.dumps(
+            self._get_message_data(subject, message, sounds)
         )
         self.session.post(self.message_url, params=self.params, data=data)
 
+    def _get_message_data(self, subject, message, sounds):
+        """Returns the display message request body."""
+        return {
+            "device": self.content["id"],
+            "subject": subject,
+            "sound": sounds,
+            "userText": True,
+            "text": message,
+        }
+
     def lost_device(
         self, number, text="This iPhone has been lost. Please call me.", newpasscode=""
     ):
@@ -165,19 +184,21 @@ class AppleDevice:
         been passed, then the person holding the device can call
         the number without entering the passcode.
         """
-        data = json.dumps(
-            {
-                "text": text,
-                "userText": True,
-                "ownerNbr": number,
-                "lostModeEnabled": True,
-                "trackingEnabled": True,
-                "device": self.content["id"],
-                "passcode": newpasscode,
-            }
-        )
+        data = self.session.codec.dumps(self._get_lost_data(number, text, newpasscode))
         self.session.post(self.lost_url, params=self.params, data=data)
 
+    def _get_lost_data(self, number, text, newpasscode):
+        """Returns the lost mode request body."""
+        return {
+            "text": text,
+            "userText": True,
+            "ownerNbr": number,
+            "lostModeEnabled": True,
+            "trackingEnabled": True,
+            "device": self.content["id"],
+            "passcode": newpasscode,
+        }
+
     @property
     def data(self):
         """Gets the device data."""
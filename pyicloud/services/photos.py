@@ -1,10 +1,153 @@
 """Photo service."""
-import json
+
 import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from types import MappingProxyType
 from urllib.parse import urlencode
 
 from datetime import datetime, timezone
-from pyicloud.exceptions import PyiCloudServiceNotActivatedException
+from pyicloud.exceptions import (
+    PyiCloudAPIResponseException,
+    PyiCloudServiceNotActivatedException,
+)
+
+# Fields of the photo records, as projected by the listing queries
+DESIRED_KEYS = (
+    "resJPEGFullWidth",
+    "resJPEGFullHeight",
+    "resJPEGFullFileType",
+    "resJPEGFullFingerprint",
+    "resJPEGFullRes",
+    "resJPEGLargeWidth",
+    "resJPEGLargeHeight",
+    "resJPEGLargeFileType",
+    "resJPEGLargeFingerprint",
+    "resJPEGLargeRes",
+    "resJPEGMedWidth",
+    "resJPEGMedHeight",
+    "resJPEGMedFileType",
+    "resJPEGMedFingerprint",
+    "resJPEGMedRes",
+    "resJPEGThumbWidth",
+    "resJPEGThumbHeight",
+    "resJPEGThumbFileType",
+    "resJPEGThumbFingerprint",
+    "resJPEGThumbRes",
+    "resVidFullWidth",
+    "resVidFullHeight",
+    "resVidFullFileType",
+    "resVidFullFingerprint",
+    "resVidFullRes",
+    "resVidMedWidth",
+    "resVidMedHeight",
+    "resVidMedFileType",
+    "resVidMedFingerprint",
+    "resVidMedRes",
+    "resVidSmallWidth",
+    "resVidSmallHeight",
+    "resVidSmallFileType",
+    "resVidSmallFingerprint",
+    "resVidSmallRes",
+    "resSidecarWidth",
+    "resSidecarHeight",
+    "resSidecarFileType",
+    "resSidecarFingerprint",
+    "resSidecarRes",
+    "itemType",
+    "dataClassType",
+    "filenameEnc",
+    "originalOrientation",
+    "resOriginalWidth",
+    "resOriginalHeight",
+    "resOriginalFileType",
+    "resOriginalFingerprint",
+    "resOriginalRes",
+    "resOriginalAltWidth",
+    "resOriginalAltHeight",
+    "resOriginalAltFileType",
+    "resOriginalAltFingerprint",
+    "resOriginalAltRes",
+    "resOriginalVidComplWidth",
+    "resOriginalVidComplHeight",
+    "resOriginalVidComplFileType",
+    "resOriginalVidComplFingerprint",
+    "resOriginalVidComplRes",
+    "isDeleted",
+    "isExpunged",
+    "dateExpunged",
+    "remappedRef",
+    "recordName",
+    "recordType",
+    "recordChangeTag",
+    "masterRef",
+    "adjustmentRenderType",
+    "assetDate",
+    "addedDate",
+    "isFavorite",
+    "isHidden",
+    "orientation",
+    "duration",
+    "assetSubtype",
+    "assetSubtypeV2",
+    "assetHDRType",
+    "burstFlags",
+    "burstFlagsExt",
+    "burstId",
+    "captionEnc",
+    "locationEnc",
+    "locationV2Enc",
+    "locationLatitude",
+    "locationLongitude",
+    "adjustmentType",
+    "timeZoneOffset",
+    "vidComplDurValue",
+    "vidComplDurScale",
+    "vidComplDispValue",
+    "vidComplDispScale",
+    "vidComplVisibilityState",
+    "customRenderedValue",
+    "containerId",
+    "itemId",
+    "position",
+    "isKeyAsset",
+)
+
+# Fields the assets cannot be listed without
+REQUIRED_KEYS = ("recordName", "recordType", "recordChangeTag", "masterRef")
+
+MINIMAL_KEYS = REQUIRED_KEYS + (
+    "filenameEnc",
+    "itemType",
+    "assetDate",
+    "addedDate",
+    "isDeleted",
+    "isHidden",
+    "isFavorite",
+)
+
+# Projection profiles of the listing queries
+PROJECTIONS = {
+    # File names, types and dates
+    "minimal": MINIMAL_KEYS,
+    # The original versions, without the derived resolutions
+    "originals-only": MINIMAL_KEYS
+    + tuple(key for key in DESIRED_KEYS if key.startswith("resOriginal"))
+    + ("originalOrientation", "orientation", "duration", "dataClassType"),
+    "full": DESIRED_KEYS,
+}
+
+
+def get_desired_keys(projection):
+    """Returns the fields of a projection: a `PROJECTIONS` profile name, or
+    a list of fields, completed with the `REQUIRED_KEYS`."""
+    if isinstance(projection, str):
+        try:
+            return list(PROJECTIONS[projection])
+        except KeyError:
+            raise ValueError(f"Unknown photo projection: {projection!r}") from None
+    return list(dict.fromkeys(REQUIRED_KEYS + tuple(projection)))
 
 
 class PhotosService:
@@ -121,9 +264,30 @@ class PhotosService:
         },
     }
 
-    def __init__(self, service_root, session, params):
+    INDEXING_STATE_QUERY = (
+        '{"query":{"recordType":"CheckIndexingState"},'
+        '"zoneID":{"zoneName":"PrimarySync"}}'
+    )
+
+    FOLDERS_QUERY = (
+        '{"query":{"recordType":"CPLAlbumByPositionLive"},'
+        '"zoneID":{"zoneName":"PrimarySync"}}'
+    )
+
+    def __init__(
+        self,
+        service_root,
+        session,
+        params,
+        prefetch=0,
+        projection="full",
+        keep_records=True,
+    ):
         self.session = session
         self.params = dict(params)
+        self.prefetch = prefetch
+        self.projection = projection
+        self.keep_records = keep_records
         self._service_root = service_root
         self.service_endpoint = (
             "%s/database/1/com.apple.photos.cloud/production/private"
@@ -135,14 +299,16 @@ class PhotosService:
         self.params.update({"remapEnums": True, "getCurrentSyncToken": True})
 
         url = f"{self.service_endpoint}/records/query?{urlencode(self.params)}"
-        json_data = (
-            '{"query":{"recordType":"CheckIndexingState"},'
-            '"zoneID":{"zoneName":"PrimarySync"}}'
-        )
+        json_data = self.INDEXING_STATE_QUERY
         request = self.session.post(
             url, data=json_data, headers={"Content-type": "text/plain"}
         )
-        response = request.json()
+        self._check_indexing_state(request.json())
+
+        self._photo_assets = {}
+
+    def _check_indexing_state(self, response):  # pylint: disable=no-self-use
+        """Raises if the photo library has not finished indexing."""
         indexing_state = response["records"][0]["fields"]["state"]["value"]
         if indexing_state != "FINISHED":
             raise PyiCloudServiceNotActivatedException(
@@ -150,69 +316,71 @@ class PhotosService:
                 "Please try again in a few minutes."
             )
 
-        # TODO: Does syncToken ever change?  # pylint: disable=fixme
-        # self.params.update({
-        #     'syncToken': response['syncToken'],
-        #     'clientInstanceId': self.params.pop('clientId')
-        # })
-
-        self._photo_assets = {}
-
     @property
     def albums(self):
         """Returns photo albums."""
         if not self._albums:
-            self._albums = {
-                name: PhotoAlbum(self, name, **props)
-                for (name, props) in self.SMART_FOLDERS.items()
-            }
+            self._albums = self._get_albums(self._fetch_folders())
 
-            for folder in self._fetch_folders():
+        return self._albums
 
-                # Skiping albums having null name, that can happen sometime
-                if "albumNameEnc" not in folder["fields"]:
-                    continue
+    def _get_albums(self, folders):
+        """Returns the smart folders and the albums of the folder records."""
+        albums = {
+            name: self._create_album(name, **props)
+            for (name, props) in self.SMART_FOLDERS.items()
+        }
 
-                # TODO: Handle subfolders  # pylint: disable=fixme
-                if folder["recordName"] == "----Root-Folder----" or (
-                    folder["fields"].get("isDeleted")
-                    and folder["fields"]["isDeleted"]["value"]
-                ):
-                    continue
+        for folder in folders:
+
+            # Skiping albums having null name, that can happen sometime
+            if "albumNameEnc" not in folder["fields"]:
+                continue
+
+            # TODO: Handle subfolders  # pylint: disable=fixme
+            if folder["recordName"] == "----Root-Folder----" or (
+                folder["fields"].get("isDeleted")
+                and folder["fields"]["isDeleted"]["value"]
+            ):
+                continue
+
+            folder_id = folder["recordName"]
+            folder_obj_type = "CPLContainerRelationNotDeletedByAssetDate:%s" % folder_id
+            folder_name = base64.b64decode(
+                folder["fields"]["albumNameEnc"]["value"]
+            ).decode("utf-8")
+            query_filter = [
+                {
+                    "fieldName": "parentId",
+                    "comparator": "EQUALS",
+                    "fieldValue": {"type": "STRING", "value": folder_id},
+                }
+            ]
 
-                folder_id = folder["recordName"]
-                folder_obj_type = (
-                    "CPLContainerRelationNotDeletedByAssetDate:%s" % folder_id
-                )
-                folder_name = base64.b64decode(
-                    folder["fields"]["albumNameEnc"]["value"]
-                ).decode("utf-8")
-                query_filter = [
-                    {
-                        "fieldName": "parentId",
-                        "comparator": "EQUALS",
-                        "fieldValue": {"type": "STRING", "value": folder_id},
-                    }
-                ]
-
-                album = PhotoAlbum(
-                    self,
-                    folder_name,
-                    "CPLContainerRelationLiveByAssetDate",
-                    folder_obj_type,
-                    "ASCENDING",
-                    query_filter,
-                )
-                self._albums[folder_name] = album
+            albums[folder_name] = self._create_album(
+                folder_name,
+                "CPLContainerRelationLiveByAssetDate",
+                folder_obj_type,
+                "ASCENDING",
+                query_filter,
+            )
 
-        return self._albums
+        return albums
+
+    def _create_album(self, name, list_type, obj_type, direction, query_filter=None):
+        """Returns a new album."""
+        return PhotoAlbum(
+            self,
+            name,
+            list_type,
+            obj_type,
+            direction,
+            query_filter,
+        )
 
     def _fetch_folders(self):
         url = f"{self.service_endpoint}/records/query?{urlencode(self.params)}"
-        json_data = (
-            '{"query":{"recordType":"CPLAlbumByPositionLive"},'
-            '"zoneID":{"zoneName":"PrimarySync"}}'
-        )
+        json_data = self.FOLDERS_QUERY
 
         request = self.session.post(
             url, data=json_data, headers={"Content-type": "text/plain"}
@@ -226,9 +394,54 @@ class PhotosService:
         """Returns all photos."""
         return self.albums["All Photos"]
 
+    @property
+    def sync_token(self):
+        """Gets the sync token saved by the last `changes`, None before the
+        first sync."""
+        service = self.session.service
+        sync_tokens = service.session_store.load_sync_tokens(
+            service.user["accountName"]
+        )
+        return sync_tokens.get("photos")
+
+    @sync_token.setter
+    def sync_token(self, sync_token):
+        """Saves the sync token, None to sync the whole library again."""
+        service = self.session.service
+        account = service.user["accountName"]
+        sync_tokens = service.session_store.load_sync_tokens(account)
+        if sync_tokens.get("photos") == sync_token:
+            return
+        if sync_token is None:
+            sync_tokens.pop("photos", None)
+        else:
+            sync_tokens["photos"] = sync_token
+        service.session_store.save_sync_tokens(account, sync_tokens)
+
+    def changes(self, sync_token=None, page_size=200, save=True):
+        """Returns the changes of the library since `sync_token`, by default
+        since the last sync. Without `save`, the sync token isn't saved."""
+        if sync_token is None:
+            sync_token = self.sync_token
+        return PhotoChanges(self, sync_token, page_size, save)
+
 
 class PhotoAlbum:
-    """A photo album."""
+    """A photo album.
+
+    With `prefetch`, photos are listed by fetching up to `prefetch` pages of
+    `page_size` photos ahead, concurrently.
+
+    `projection` selects the fields of the listed photos: "full" (all of
+    them), "originals-only" (no derived resolutions), "minimal" (file
+    names, types and dates) or a list of fields.
+
+    Without `keep_records`, the listed photos are compact: their records are
+    dropped once decoded.
+
+    Unless set on the album, `prefetch`, `projection` and `keep_records` are
+    those of the service when listing.
+    """
 
     def __init__(
         self,
@@ -239,6 +452,9 @@ class PhotoAlbum:
         direction,
         query_filter=None,
         page_size=100,
+        prefetch=None,
+        projection=None,
+        keep_records=None,
     ):
         self.name = name
         self.service = service
@@ -247,9 +463,49 @@ class PhotoAlbum:
         self.direction = direction
         self.query_filter = query_filter
         self.page_size = page_size
+        self._prefetch = prefetch
+        self._projection = projection
+        self._keep_records = keep_records
 
         self._len = None
 
+    @property
+    def prefetch(self):
+        """Gets the number of pages fetched ahead."""
+        if self._prefetch is None:
+            return self.service.prefetch
+        return self._prefetch
+
+    @prefetch.setter
+    def prefetch(self, prefetch):
+        """Sets the number of pages fetched ahead, None for the service's."""
+        self._prefetch = prefetch
+
+    @property
+    def projection(self):
+        """Gets the fields of the listed photos."""
+        if self._projection is None:
+            return self.service.projection
+        return self._projection
+
+    @projection.setter
+    def projection(self, projection):
+        """Sets the fields of the listed photos, None for the service's."""
+        self._projection = projection
+
+    @property
+    def keep_records(self):
+        """Gets whether the listed photos keep their records."""
+        if self._keep_records is None:
+            return self.service.keep_records
+        return self._keep_records
+
+    @keep_records.setter
+    def keep_records(self, keep_records):
+        """Sets whether the listed photos keep their records, None for the
+        service's."""
+        self._keep_records = keep_records
+
     @property
     def title(self):
         """Gets the album name."""
@@ -260,90 +516,161 @@ class PhotoAlbum:
 
     def __len__(self):
         if self._len is None:
-            url = "{}/internal/records/query/batch?{}".format(
-                self.service.service_endpoint,
-                urlencode(self.service.params),
-            )
+            url, data = self._count_request()
             request = self.service.session.post(
-                url,
-                data=json.dumps(
-                    {
-                        "batch": [
-                            {
-                                "resultsLimit": 1,
-                                "query": {
-                                    "filterBy": {
-                                        "fieldName": "indexCountID",
-                                        "fieldValue": {
-                                            "type": "STRING_LIST",
-                                            "value": [self.obj_type],
-                                        },
-                                        "comparator": "IN",
-                                    },
-                                    "recordType": "HyperionIndexCountLookup",
-                                },
-                                "zoneWide": True,
-                                "zoneID": {"zoneName": "PrimarySync"},
-                            }
-                        ]
-                    }
-                ),
-                headers={"Content-type": "text/plain"},
+                url, data=data, headers={"Content-type": "text/plain"}
             )
-            response = request.json()
+            self._len = self._parse_count(request.json())
 
-            self._len = response["batch"][0]["records"][0]["fields"]["itemCount"][
-                "value"
+        return self._len
+
+    def _count_request(self):
+        """Returns the URL and body of the album length request."""
+        url = "{}/internal/records/query/batch?{}".format(
+            self.service.service_endpoint,
+            urlencode(self.service.params),
+        )
+        return url, self.service.session.codec.dumps(self._count_query_gen())
+
+    def _count_query_gen(self):
+        return {
+            "batch": [
+                {
+                    "resultsLimit": 1,
+                    "query": {
+                        "filterBy": {
+                            "fieldName": "indexCountID",
+                            "fieldValue": {
+                                "type": "STRING_LIST",
+                                "value": [self.obj_type],
+                            },
+                            "comparator": "IN",
+                        },
+                        "recordType": "HyperionIndexCountLookup",
+                    },
+                    "zoneWide": True,
+                    "zoneID": {"zoneName": "PrimarySync"},
+                }
             ]
+        }
 
-        return self._len
+    def _parse_count(self, response):  # pylint: disable=no-self-use
+        """Returns the item count of a count response."""
+        return response["batch"][0]["records"][0]["fields"]["itemCount"]["value"]
 
     @property
     def photos(self):
         """Returns the album photos."""
+        if self.prefetch:
+            return self._prefetch_photos()
         if self.direction == "DESCENDING":
-            offset = len(self) - 1
+            return self._get_photos(len(self) - 1)
+        return self._get_photos(0)
+
+    @property
+    def _step(self):
+        """Returns the rank increment between photos."""
+        return -1 if self.direction == "DESCENDING" else 1
+
+    def _list_request(self, offset):
+        """Returns the URL and body of the page request at rank `offset`."""
+        url = ("%s/records/query?" % self.service.service_endpoint) + urlencode(
+            self.service.params
+        )
+        data = self.service.session.codec.dumps(
+            self._list_query_gen(
+                offset, self.list_type, self.direction, self.query_filter
+            )
+        )
+        return url, data
+
+    def _fetch_page(self, offset):
+        """Returns the photo assets of the page starting at rank `offset`."""
+        url, data = self._list_request(offset)
+        request = self.service.session.post(
+            url, data=data, headers={"Content-type": "text/plain"}
+        )
+        return self._parse_assets(request.json())
+
+    def _get_photos(self, offset, end=None):
+        """Yields the photos from rank `offset`, one page at a time, until an
+        empty page or rank `end`."""
+        step = self._step
+        while end is None or offset != end:
+            assets = self._fetch_page(offset)
+            if not assets:
+                return
+            if end is not None:
+                assets = assets[: (end - offset) * step]
+            offset += step * len(assets)
+            yield from assets
+
+    def _prefetch_photos(self):
+        """Yields the photos in order, fetching the pages of the album length
+        concurrently, then the following ones one at a time."""
+        step = self._step
+        count = len(self)
+        if step < 0:
+            page_offsets = iter(range(count - 1, -1, -self.page_size))
+            offset = count - 1
         else:
+            page_offsets = iter(range(0, count, self.page_size))
             offset = 0
 
-        while True:
-            url = ("%s/records/query?" % self.service.service_endpoint) + urlencode(
-                self.service.params
+        pages = deque()
+        with ThreadPoolExecutor(
+            self.prefetch, thread_name_prefix="pyicloud-photos"
+        ) as executor:
+            try:
+                for page_offset in islice(page_offsets, self.prefetch):
+                    page_future = executor.submit(self._fetch_page, page_offset)
+                    pages.append((page_offset, page_future))
+                while pages:
+                    page_offset, page = pages.popleft()
+                    for next_offset in islice(page_offsets, 1):
+                        page_future = executor.submit(self._fetch_page, next_offset)
+                        pages.append((next_offset, page_future))
+
+                    # Pages shorter than expected leave gaps, filled in order
+                    gap = (page_offset - offset) * step
+                    if gap > 0:
+                        yield from self._get_photos(offset, page_offset)
+
+                    assets = page.result()
+                    if not assets:
+                        return
+                    skip = max(-gap, 0)
+                    if skip < len(assets):
+                        offset = page_offset + step * len(assets)
+                        yield from assets[skip:]
+            finally:
+                for _, page in pages:
+                    page.cancel()
+
+        # Photos added since the album length was fetched
+        yield from self._get_photos(offset)
+
+    def _parse_assets(self, response):
+        """Returns the photo assets of a records page."""
+        asset_records = {}
+        master_records = []
+        for rec in response["records"]:
+            if rec["recordType"] == "CPLAsset":
+                master_id = rec["fields"]["masterRef"]["value"]["recordName"]
+                asset_records[master_id] = rec
+            elif rec["recordType"] == "CPLMaster":
+                master_records.append(rec)
+
+        assets = [
+            PhotoAsset(
+                self.service, master_record, asset_records[master_record["recordName"]]
             )
-            request = self.service.session.post(
-                url,
-                data=json.dumps(
-                    self._list_query_gen(
-                        offset, self.list_type, self.direction, self.query_filter
-                    )
-                ),
-                headers={"Content-type": "text/plain"},
-            )
-            response = request.json()
-
-            asset_records = {}
-            master_records = []
-            for rec in response["records"]:
-                if rec["recordType"] == "CPLAsset":
-                    master_id = rec["fields"]["masterRef"]["value"]["recordName"]
-                    asset_records[master_id] = rec
-                elif rec["recordType"] == "CPLMaster":
-                    master_records.append(rec)
-
-            master_records_len = len(master_records)
-            if master_records_len:
-                if self.direction == "DESCENDING":
-                    offset = offset - master_records_len
-                else:
-                    offset = offset + master_records_len
-
-                for master_record in master_records:
-                    record_name = master_record["recordName"]
-                    yield PhotoAsset(
-                        self.service, master_record, asset_records[record_name]
-                    )
-            else:
-                break
+            for master_record in master_records
+        ]
+        if not self.keep_records:
+            for asset in assets:
+                asset.compact()
+        return assets
 
     def _list_query_gen(self, offset, list_type, direction, query_filter=None):
         query = {
@@ -363,105 +690,7 @@ class PhotoAlbum:
                 "recordType": list_type,
             },
             "resultsLimit": self.page_size * 2,
-            "desiredKeys": [
-                "resJPEGFullWidth",
-                "resJPEGFullHeight",
-                "resJPEGFullFileType",
-                "resJPEGFullFingerprint",
-                "resJPEGFullRes",
-                "resJPEGLargeWidth",
-                "resJPEGLargeHeight",
-                "resJPEGLargeFileType",
-                "resJPEGLargeFingerprint",
-                "resJPEGLargeRes",
-                "resJPEGMedWidth",
-                "resJPEGMedHeight",
-                "resJPEGMedFileType",
-                "resJPEGMedFingerprint",
-                "resJPEGMedRes",
-                "resJPEGThumbWidth",
-                "resJPEGThumbHeight",
-                "resJPEGThumbFileType",
-                "resJPEGThumbFingerprint",
-                "resJPEGThumbRes",
-                "resVidFullWidth",
-                "resVidFullHeight",
-                "resVidFullFileType",
-                "resVidFullFingerprint",
-                "resVidFullRes",
-                "resVidMedWidth",
-                "resVidMedHeight",
-                "resVidMedFileType",
-                "resVidMedFingerprint",
-                "resVidMedRes",
-                "resVidSmallWidth",
-                "resVidSmallHeight",
-                "resVidSmallFileType",
-                "resVidSmallFingerprint",
-                "resVidSmallRes",
-                "resSidecarWidth",
-                "resSidecarHeight",
-                "resSidecarFileType",
-                "resSidecarFingerprint",
-                "resSidecarRes",
-                "itemType",
-                "dataClassType",
-                "filenameEnc",
-                "originalOrientation",
-                "resOriginalWidth",
-                "resOriginalHeight",
-                "resOriginalFileType",
-                "resOriginalFingerprint",
-                "resOriginalRes",
-                "resOriginalAltWidth",
-                "resOriginalAltHeight",
-                "resOriginalAltFileType",
-                "resOriginalAltFingerprint",
-                "resOriginalAltRes",
-                "resOriginalVidComplWidth",
-                "resOriginalVidComplHeight",
-                "resOriginalVidComplFileType",
-                "resOriginalVidComplFingerprint",
-                "resOriginalVidComplRes",
-                "isDeleted",
-                "isExpunged",
-                "dateExpunged",
-                "remappedRef",
-                "recordName",
-                "recordType",
-                "recordChangeTag",
-                "masterRef",
-                "adjustmentRenderType",
-                "assetDate",
-                "addedDate",
-                "isFavorite",
-                "isHidden",
-                "orientation",
-                "duration",
-                "assetSubtype",
-                "assetSubtypeV2",
-                "assetHDRType",
-                "burstFlags",
-                "burstFlagsExt",
-                "burstId",
-                "captionEnc",
-                "locationEnc",
-                "locationV2Enc",
-                "locationLatitude",
-                "locationLongitude",
-                "adjustmentType",
-                "timeZoneOffset",
-                "vidComplDurValue",
-                "vidComplDurScale",
-                "vidComplDispValue",
-                "vidComplDispScale",
-                "vidComplVisibilityState",
-                "customRenderedValue",
-                "containerId",
-                "itemId",
-                "position",
-                "isKeyAsset",
-            ],
+            "desiredKeys": get_desired_keys(self.projection),
             "zoneID": {"zoneName": "PrimarySync"},
         }
 
@@ -477,15 +706,35 @@ class PhotoAlbum:
         return f"<{type(self).__name__}: '{self}'>"
 
 
-class PhotoAsset:
-    """A photo."""
+_UNSET = object()
 
-    def __init__(self, service, master_record, asset_record):
-        self._service = service
-        self._master_record = master_record
-        self._asset_record = asset_record
 
-        self._versions = None
+class PhotoAsset:
+    """A photo.
+
+    Values are decoded from the records on first access, and cached.
+    `compact` decodes them all and drops the records, to keep large
+    listings in memory.
+    """
+
+    __slots__ = (
+        "_service",
+        "_master_record",
+        "_asset_record",
+        "_id",
+        "_record_name",
+        "_record_type",
+        "_change_tag",
+        "_filename",
+        "_item_type",
+        "_fingerprint",
+        "_size",
+        "_asset_date",
+        "_added_date",
+        "_dimensions",
+        "_versions",
+        "_versions_view",
+    )
 
     PHOTO_VERSION_LOOKUP = {
         "original": "resOriginal",
@@ -499,22 +748,131 @@ class PhotoAsset:
         "thumb": "resVidSmall",
     }
 
+    # Values decoded by `compact`
+    COMPACT_VALUES = (
+        "filename",
+        "item_type",
+        "fingerprint",
+        "size",
+        "asset_date",
+        "added_date",
+        "dimensions",
+        "versions",
+    )
+
+    def __init__(self, service, master_record, asset_record):
+        self._service = service
+        self._master_record = master_record
+        self._asset_record = asset_record
+
+        # Needed by `delete`
+        self._id = master_record["recordName"]
+        self._record_name = asset_record["recordName"]
+        self._record_type = asset_record["recordType"]
+        self._change_tag = master_record["recordChangeTag"]
+
+        self._filename = _UNSET
+        self._item_type = _UNSET
+        self._fingerprint = _UNSET
+        self._size = _UNSET
+        self._asset_date = _UNSET
+        self._added_date = _UNSET
+        self._dimensions = _UNSET
+        self._versions = _UNSET
+        self._versions_view = None
+
+    @classmethod
+    def from_values(
+        cls,
+        service,
+        photo_id,
+        record_name,
+        record_type,
+        change_tag,
+        **values,
+    ):
+        """Returns a compact photo of decoded values: the `COMPACT_VALUES`,
+        missing ones are None."""
+        photo = cls.__new__(cls)
+        photo._service = service
+        photo._master_record = None
+        photo._asset_record = None
+        photo._id = photo_id
+        photo._record_name = record_name
+        photo._record_type = record_type
+        photo._change_tag = change_tag
+        photo._versions_view = None
+        for name in cls.COMPACT_VALUES:
+            setattr(photo, f"_{name}", values.get(name))
+        versions = values.get("versions")
+        if versions:
+            photo._versions = tuple(
+                (
+                    key,
+                    version["width"],
+                    version["height"],
+                    version["size"],
+                    version["url"],
+                    version["type"],
+                )
+                for key, version in versions.items()
+            )
+        return photo
+
+    def get_values(self):
+        """Returns the arguments of `from_values` recreating the photo,
+        decoding its values."""
+        values = {
+            "photo_id": self._id,
+            "record_name": self._record_name,
+            "record_type": self._record_type,
+            "change_tag": self._change_tag,
+        }
+        for name in self.COMPACT_VALUES:
+            try:
+                values[name] = getattr(self, name)
+            except KeyError:
+                values[name] = None
+        return values
+
     @property
     def id(self):
         """Gets the photo id."""
-        return self._master_record["recordName"]
+        return self._id
 
     @property
     def filename(self):
         """Gets the photo file name."""
-        return base64.b64decode(
-            self._master_record["fields"]["filenameEnc"]["value"]
-        ).decode("utf-8")
+        if self._filename is _UNSET:
+            self._filename = base64.b64decode(
+                self._master_record["fields"]["filenameEnc"]["value"]
+            ).decode("utf-8")
+        return self._filename
+
+    @property
+    def item_type(self):
+        """Gets the photo item type, a uniform type identifier."""
+        if self._item_type is _UNSET:
+            self._item_type = self._master_record["fields"]["itemType"]["value"]
+        return self._item_type
+
+    @property
+    def fingerprint(self):
+        """Gets the fingerprint of the photo original."""
+        if self._fingerprint is _UNSET:
+            self._fingerprint = self._master_record["fields"]["resOriginalFingerprint"][
+                "value"
+            ]
+        return self._fingerprint
 
     @property
     def size(self):
         """Gets the photo size."""
-        return self._master_record["fields"]["resOriginalRes"]["value"]["size"]
+        if self._size is _UNSET:
+            self._size = self._master_record["fields"]["resOriginalRes"]["value"][
+                "size"
+            ]
+        return self._size
 
     @property
     def created(self):
@@ -524,80 +882,115 @@ class PhotoAsset:
     @property
     def asset_date(self):
         """Gets the photo asset date."""
-        try:
-            return datetime.utcfromtimestamp(
-                self._asset_record["fields"]["assetDate"]["value"] / 1000.0
-            ).replace(tzinfo=timezone.utc)
-        except KeyError:
-            return datetime.utcfromtimestamp(0).replace(tzinfo=timezone.utc)
+        if self._asset_date is _UNSET:
+            try:
+                timestamp = self._asset_record["fields"]["assetDate"]["value"]
+            except KeyError:
+                timestamp = 0
+            self._asset_date = datetime.fromtimestamp(timestamp / 1000.0, timezone.utc)
+        return self._asset_date
 
     @property
     def added_date(self):
         """Gets the photo added date."""
-        return datetime.utcfromtimestamp(
-            self._asset_record["fields"]["addedDate"]["value"] / 1000.0
-        ).replace(tzinfo=timezone.utc)
+        if self._added_date is _UNSET:
+            self._added_date = datetime.fromtimestamp(
+                self._asset_record["fields"]["addedDate"]["value"] / 1000.0,
+                timezone.utc,
+            )
+        return self._added_date
 
     @property
     def dimensions(self):
         """Gets the photo dimensions."""
-        return (
-            self._master_record["fields"]["resOriginalWidth"]["value"],
-            self._master_record["fields"]["resOriginalHeight"]["value"],
-        )
+        if self._dimensions is _UNSET:
+            fields = self._master_record["fields"]
+            self._dimensions = (
+                fields["resOriginalWidth"]["value"],
+                fields["resOriginalHeight"]["value"],
+            )
+        return self._dimensions
 
     @property
     def versions(self):
-        """Gets the photo versions."""
-        if not self._versions:
-            self._versions = {}
-            if "resVidSmallRes" in self._master_record["fields"]:
-                typed_version_lookup = self.VIDEO_VERSION_LOOKUP
+        """Gets the photo versions, a read-only mapping built once."""
+        if self._versions_view is not None:
+            return self._versions_view
+        if self._versions is _UNSET:
+            fields = self._master_record["fields"]
+            if "resVidSmallRes" in fields:
+                version_keys = _VIDEO_VERSION_KEYS
             else:
-                typed_version_lookup = self.PHOTO_VERSION_LOOKUP
-
-            for key, prefix in typed_version_lookup.items():
-                if "%sRes" % prefix in self._master_record["fields"]:
-                    fields = self._master_record["fields"]
-                    version = {"filename": self.filename}
-
-                    width_entry = fields.get("%sWidth" % prefix)
-                    if width_entry:
-                        version["width"] = width_entry["value"]
-                    else:
-                        version["width"] = None
-
-                    height_entry = fields.get("%sHeight" % prefix)
-                    if height_entry:
-                        version["height"] = height_entry["value"]
-                    else:
-                        version["height"] = None
-
-                    size_entry = fields.get("%sRes" % prefix)
-                    if size_entry:
-                        version["size"] = size_entry["value"]["size"]
-                        version["url"] = size_entry["value"]["downloadURL"]
-                    else:
-                        version["size"] = None
-                        version["url"] = None
-
-                    type_entry = fields.get("%sFileType" % prefix)
-                    if type_entry:
-                        version["type"] = type_entry["value"]
-                    else:
-                        version["type"] = None
-
-                    self._versions[key] = version
-
-        return self._versions
+                version_keys = _PHOTO_VERSION_KEYS
+
+            versions = []
+            for key, res_key, width_key, height_key, type_key in version_keys:
+                res_entry = fields.get(res_key)
+                if not res_entry:
+                    continue
+
+                width_entry = fields.get(width_key)
+                height_entry = fields.get(height_key)
+                type_entry = fields.get(type_key)
+                versions.append(
+                    (
+                        key,
+                        width_entry["value"] if width_entry else None,
+                        height_entry["value"] if height_entry else None,
+                        res_entry["value"]["size"],
+                        res_entry["value"]["downloadURL"],
+                        type_entry["value"] if type_entry else None,
+                    )
+                )
+            self._versions = tuple(versions)
+
+        filename = self.filename if self._versions else None
+        self._versions_view = MappingProxyType(
+            {
+                key: MappingProxyType(
+                    {
+                        "filename": filename,
+                        "width": width,
+                        "height": height,
+                        "size": size,
+                        "url": url,
+                        "type": file_type,
+                    }
+                )
+                for key, width, height, size, url, file_type in self._versions or ()
+            }
+        )
+        return self._versions_view
+
+    @property
+    def is_compact(self):
+        """Returns whether the records of the photo were dropped."""
+        return self._master_record is None
+
+    def compact(self):
+        """Decodes the values of the photo and drops its records, returns
+        the photo. Values the records lack are then None."""
+        if self.is_compact:
+            return self
+        for name in self.COMPACT_VALUES:
+            try:
+                getattr(self, name)
+            except KeyError:
+                setattr(self, f"_{name}", None)
+        self._master_record = None
+        self._asset_record = None
+        # Rebuilt from the decoded versions on access
+        self._versions_view = None
+        return self
 
     def download(self, version="original", **kwargs):
         """Returns the photo file."""
-        if version not in self.versions:
+        versions = self.versions
+        if version not in versions:
             return None
 
         return self._service.session.get(
-            self.versions[version]["url"], stream=True, **kwargs
+            versions[version]["url"], stream=True, **kwargs
         )
 
     def delete(self):
@@ -620,9 +1013,9 @@ class PhotoAsset:
             '"zoneName":"PrimarySync"'
             '},"atomic":true}'
             % (
-                self._asset_record["recordName"],
-                self._asset_record["recordType"],
-                self._master_record["recordChangeTag"],
+                self._record_name,
+                self._record_type,
+                self._change_tag,
             )
         )
 
@@ -636,3 +1029,274 @@ class PhotoAsset:
 
     def __repr__(self):
         return f"<{type(self).__name__}: id={self.id}>"
+
+
+class PhotoChange:
+    """A change of the photo library: a photo added or updated, or a
+    record deleted.
+
+    `photo` is the added or updated photo, None for deleted records.
+    Photos moved to the "Recently Deleted" album are updated and `deleted`.
+    """
+
+    __slots__ = ("record_name", "photo", "deleted")
+
+    def __init__(self, record_name, photo=None, deleted=False):
+        self.record_name = record_name
+        self.photo = photo
+        self.deleted = deleted
+
+    def __repr__(self):
+        state = "deleted" if self.deleted else "updated"
+        return f"<{type(self).__name__}: {state} {self.record_name}>"
+
+
+class PhotoChanges:
+    """The changes of the photo library since a sync token, all the photos
+    without one.
+
+    Changes are fetched a page of `page_size` records at a time, with the
+    fields of the service `projection`. `sync_token` is the token of the
+    changes iterated so far. With `save`, it is saved once the changes of
+    a page have been iterated: the next `PhotosService.changes` resumes
+    from there. `pages` iterates them a page at a time.
+
+    Changed photos are reported for their asset records: the masters of
+    changed assets are looked up when not in the same page, and the assets
+    of changed masters are queried when not in the same page. Assets whose
+    master was deleted since are reported deleted.
+    """
+
+    def __init__(self, service, sync_token=None, page_size=200, save=True):
+        self.service = service
+        self.sync_token = sync_token
+        self.page_size = page_size
+        self.save = save
+
+    def __iter__(self):
+        for changes, _ in self.pages():
+            yield from changes
+
+    def pages(self):
+        """Yields the changes a page at a time, with the sync token of the
+        page: a list of `PhotoChange`s and the token following them."""
+        while True:
+            zone = self._fetch_zone(self.sync_token)
+            records = zone["records"]
+            changed_masters = self._get_changed_masters(records)
+            if changed_masters:
+                records = records + self._query_assets(changed_masters)
+            missing = self._get_missing_masters(records)
+            masters = self._lookup_masters(missing) if missing else {}
+            yield self._parse_changes(records, masters), zone["syncToken"]
+
+            self.sync_token = zone["syncToken"]
+            if self.save:
+                self.service.sync_token = self.sync_token
+            if not zone.get("moreComing"):
+                return
+
+    def _fetch_zone(self, sync_token):
+        url = "{}/changes/zone?{}".format(
+            self.service.service_endpoint, urlencode(self.service.params)
+        )
+        request = self.service.session.post(
+            url,
+            data=self.service.session.codec.dumps(self._changes_query_gen(sync_token)),
+            headers={"Content-type": "text/plain"},
+        )
+        return self._parse_zone(request.json())
+
+    def _lookup_masters(self, record_names):
+        url = "{}/records/lookup?{}".format(
+            self.service.service_endpoint, urlencode(self.service.params)
+        )
+        request = self.service.session.post(
+            url,
+            data=self.service.session.codec.dumps(self._lookup_query_gen(record_names)),
+            headers={"Content-type": "text/plain"},
+        )
+        return self._parse_lookup(request.json())
+
+    def _query_assets(self, master_names):
+        url = "{}/internal/records/query/batch?{}".format(
+            self.service.service_endpoint, urlencode(self.service.params)
+        )
+        request = self.service.session.post(
+            url,
+            data=self.service.session.codec.dumps(self._assets_query_gen(master_names)),
+            headers={"Content-type": "text/plain"},
+        )
+        return self._parse_assets_batch(request.json())
+
+    def _changes_query_gen(self, sync_token):
+        zone = {
+            "zoneID": {"zoneName": "PrimarySync"},
+            "desiredRecordTypes": ["CPLAsset", "CPLMaster"],
+            "desiredKeys": get_desired_keys(self.service.projection),
+            "resultsLimit": self.page_size,
+            "reverse": False,
+        }
+        if sync_token is not None:
+            zone["syncToken"] = sync_token
+        return {"zones": [zone]}
+
+    def _lookup_query_gen(self, record_names):
+        return {
+            "records": [{"recordName": record_name} for record_name in record_names],
+            "zoneID": {"zoneName": "PrimarySync"},
+            "desiredKeys": get_desired_keys(self.service.projection),
+        }
+
+    def _assets_query_gen(self, master_names):
+        return {
+            "batch": [
+                {
+                    "query": {
+                        "filterBy": [
+                            {
+                                "fieldName": "masterRef",
+                                "fieldValue": {
+                                    "type": "REFERENCE",
+                                    "value": {
+                                        "recordName": master_name,
+                                        "action": "DELETE_SELF",
+                                    },
+                                },
+                                "comparator": "EQUALS",
+                            }
+                        ],
+                        "recordType": "CPLAsset",
+                    },
+                    "zoneID": {"zoneName": "PrimarySync"},
+                    "desiredKeys": get_desired_keys(self.service.projection),
+                }
+                for master_name in master_names
+            ]
+        }
+
+    @staticmethod
+    def _parse_zone(response):
+        """Returns the zone of a changes response, raises on its errors."""
+        zone = response["zones"][0]
+        if "serverErrorCode" in zone:
+            raise PyiCloudAPIResponseException(
+                zone.get("reason"), zone["serverErrorCode"]
+            )
+        return zone
+
+    @staticmethod
+    def _parse_lookup(response):
+        """Returns the records of a lookup by name, None for the records not
+        found. Raises on the other errors."""
+        records = {}
+        for record in response["records"]:
+            code = record.get("serverErrorCode")
+            if code is None:
+                records[record["recordName"]] = record
+            elif code == "NOT_FOUND":
+                records[record["recordName"]] = None
+            else:
+                raise PyiCloudAPIResponseException(record.get("reason"), code)
+        return records
+
+    @staticmethod
+    def _parse_assets_batch(response):
+        """Returns the asset records of an assets query batch, raises on its
+        errors."""
+        records = []
+        for result in response["batch"]:
+            if "serverErrorCode" in result:
+                raise PyiCloudAPIResponseException(
+                    result.get("reason"), result["serverErrorCode"]
+                )
+            records.extend(
+                record
+                for record in result["records"]
+                if record.get("recordType") == "CPLAsset"
+            )
+        return records
+
+    @staticmethod
+    def _get_changed_masters(records):
+        """Returns the names of the changed masters without a changed asset
+        in the records."""
+        masters = []
+        assets = set()
+        for record in records:
+            if record.get("deleted"):
+                continue
+            if record.get("recordType") == "CPLMaster":
+                masters.append(record["recordName"])
+            elif record.get("recordType") == "CPLAsset":
+                assets.add(record["fields"]["masterRef"]["value"]["recordName"])
+        return [name for name in masters if name not in assets]
+
+    @staticmethod
+    def _get_missing_masters(records):
+        """Returns the names of the masters of the changed assets which are
+        not in the changed records."""
+        masters = set()
+        assets = []
+        for record in records:
+            if record.get("deleted"):
+                continue
+            if record.get("recordType") == "CPLMaster":
+                masters.add(record["recordName"])
+            elif record.get("recordType") == "CPLAsset":
+                assets.append(record["fields"]["masterRef"]["value"]["recordName"])
+        return [name for name in dict.fromkeys(assets) if name not in masters]
+
+    def _parse_changes(self, records, masters):
+        """Returns the changes of a page of changed records, with the
+        masters looked up for its assets."""
+        masters = dict(masters)
+        for record in records:
+            if record.get("recordType") == "CPLMaster" and not record.get("deleted"):
+                masters[record["recordName"]] = record
+
+        changes = []
+        for record in records:
+            if record.get("deleted"):
+                changes.append(PhotoChange(record["recordName"], deleted=True))
+                continue
+            if record.get("recordType") != "CPLAsset":
+                continue
+
+            master_name = record["fields"]["masterRef"]["value"]["recordName"]
+            if master_name not in masters:
+                raise PyiCloudAPIResponseException(
+                    f"Master {master_name} of {record['recordName']} not found"
+                )
+            master = masters[master_name]
+            if master is None:
+                # The master was deleted since: so is the photo
+                changes.append(PhotoChange(record["recordName"], deleted=True))
+                continue
+            photo = PhotoAsset(self.service, master, record)
+            if not self.service.keep_records:
+                photo.compact()
+            is_deleted = record["fields"].get("isDeleted")
+            changes.append(
+                PhotoChange(
+                    record["recordName"],
+                    photo,
+                    deleted=bool(is_deleted and is_deleted["value"]),
+                )
+            )
+        return changes
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.sync_token}>"
+
+
+def _get_version_keys(lookup):
+    """Returns the version names of a lookup, with their field names."""
+    return tuple(
+        (key, f"{prefix}Res", f"{prefix}Width", f"{prefix}Height", f"{prefix}FileType")
+        for key, prefix in lookup.items()
+    )
+
+
+_PHOTO_VERSION_KEYS = _get_version_keys(PhotoAsset.PHOTO_VERSION_LOOKUP)
+_VIDEO_VERSION_KEYS = _get_version_keys(PhotoAsset.VIDEO_VERSION_LOOKUP)
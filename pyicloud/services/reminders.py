@@ -2,7 +2,6 @@
 from datetime import datetime
 import time
 import uuid
-import json
 
 from tzlocal import get_localzone_name
 
@@ -22,18 +21,23 @@ class RemindersService:
 
     def refresh(self):
         """Refresh data."""
-        params_reminders = dict(self._params)
-        params_reminders.update(
-            {"clientVersion": "4.0", "lang": "en-us", "usertz": get_localzone_name()}
-        )
-
         # Open reminders
         req = self.session.get(
-            self._service_root + "/rd/startup", params=params_reminders
+            self._service_root + "/rd/startup", params=self._get_params()
         )
 
-        data = req.json()
+        self._update_lists(req.json())
 
+    def _get_params(self):
+        """Returns the request parameters."""
+        params_reminders = dict(self._params)
+        params_reminders.update(
+            {"clientVersion": "4.0", "lang": "en-us", "usertz": get_localzone_name()}
+        )
+        return params_reminders
+
+    def _update_lists(self, data):
+        """Updates the lists and collections from a startup response."""
         self.lists = {}
         self.collections = {}
         for collection in data["Collections"]:
@@ -69,16 +73,22 @@ class RemindersService:
 
     def post(self, title, description="", collection=None, due_date=None):
         """Adds a new reminder."""
+        req = self.session.post(
+            self._service_root + "/rd/reminders/tasks",
+            data=self.session.codec.dumps(
+                self._get_reminder_data(title, description, collection, due_date)
+            ),
+            params=self._get_params(),
+        )
+        return req.ok
+
+    def _get_reminder_data(self, title, description, collection, due_date):
+        """Returns the new reminder request body."""
         pguid = "tasks"
         if collection:
             if collection in self.collections:
                 pguid = self.collections[collection]["guid"]
 
-        params_reminders = dict(self._params)
-        params_reminders.update(
-            {"clientVersion": "4.0", "lang": "en-us", "usertz": get_localzone_name()}
-        )
-
         due_dates = None
         if due_date:
             due_dates = [
@@ -90,34 +100,27 @@ class RemindersService:
                 due_date.minute,
             ]
 
-        req = self.session.post(
-            self._service_root + "/rd/reminders/tasks",
-            data=json.dumps(
-                {
-                    "Reminders": {
-                        "title": title,
-                        "description": description,
-                        "pGuid": pguid,
-                        "etag": None,
-                        "order": None,
-                        "priority": 0,
-                        "recurrence": None,
-                        "alarms": [],
-                        "startDate": None,
-                        "startDateTz": None,
-                        "startDateIsAllDay": False,
-                        "completedDate": None,
-                        "dueDate": due_dates,
-                        "dueDateIsAllDay": False,
-                        "lastModifiedDate": None,
-                        "createdDate": None,
-                        "isFamily": None,
-                        "createdDateExtended": int(time.time() * 1000),
-                        "guid": str(uuid.uuid4()),
-                    },
-                    "ClientState": {"Collections": list(self.collections.values())},
-                }
-            ),
-            params=params_reminders,
-        )
-        return req.ok
+        return {
+            "Reminders": {
+                "title": title,
+                "description": description,
+                "pGuid": pguid,
+                "etag": None,
+                "order": None,
+                "priority": 0,
+                "recurrence": None,
+                "alarms": [],
+                "startDate": None,
+                "startDateTz": None,
+                "startDateIsAllDay": False,
+                "completedDate": None,
+                "dueDate": due_dates,
+                "dueDateIsAllDay": False,
+                "lastModifiedDate": None,
+                "createdDate": None,
+                "isFamily": None,
+                "createdDateExtended": int(time.time() * 1000),
+                "guid": str(uuid.uuid4()),
+            },
+            "ClientState": {"Collections": list(self.collections.values())},
+        }
@@ -0,0 +1,273 @@
+"""Session stores."""
+import http.cookiejar as cookielib
+import json
+from os import path, mkdir, fdopen, replace, unlink
+from re import match
+from tempfile import mkstemp
+import threading
+import time
+
+from pyicloud.utils import _SQLiteConnections
+
+# Attributes of the cookies, as named by the http.cookiejar.Cookie arguments
+_COOKIE_ATTRIBUTES = (
+    "version",
+    "name",
+    "value",
+    "port",
+    "port_specified",
+    "domain",
+    "domain_specified",
+    "domain_initial_dot",
+    "path",
+    "path_specified",
+    "secure",
+    "expires",
+    "discard",
+    "comment",
+    "comment_url",
+    "rfc2109",
+)
+
+
+def _atomic_write(filename, content):
+    """Write content to filename through a temporary file and a rename."""
+    directory, basename = path.split(filename)
+    fd, tmp_path = mkstemp(prefix=".%s." % basename, suffix=".tmp", dir=directory)
+    try:
+        with fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(content)
+        replace(tmp_path, filename)
+    except BaseException:
+        unlink(tmp_path)
+        raise
+
+
+def dump_cookies(cookies):
+    """Serializes the cookies of a cookie jar to a JSON string."""
+    return json.dumps(
+        [
+            dict(
+                {name: getattr(cookie, name) for name in _COOKIE_ATTRIBUTES},
+                rest=cookie._rest,  # pylint: disable=protected-access
+            )
+            for cookie in cookies
+        ]
+    )
+
+
+def load_cookies(cookies, data):
+    """Adds the cookies serialized by `dump_cookies` to a cookie jar."""
+    for attributes in json.loads(data):
+        cookies.set_cookie(cookielib.Cookie(**attributes))
+
+
+class SessionStore:
+    """Storage of the session data, cookies and account data of accounts.
+
+    Stores save documents (JSON strings) by account and kind ("session",
+    "cookies", "account" or "sync"): subclasses implement `load` and `save`.
+    """
+
+    def load(self, account, kind):
+        """Returns a document of an account, None if there is none."""
+        raise NotImplementedError
+
+    def save(self, account, kind, document):
+        """Saves a document of an account."""
+        raise NotImplementedError
+
+    def delete(self, account):
+        """Deletes the documents of an account."""
+        raise NotImplementedError
+
+    def load_session_data(self, account):
+        """Returns the session data of an account, None if there is none."""
+        document = self.load(account, "session")
+        return json.loads(document) if document is not None else None
+
+    def save_session_data(self, account, session_data):
+        """Saves the session data of an account."""
+        self.save(account, "session", json.dumps(session_data))
+
+    def load_cookies(self, account, cookies):
+        """Loads the cookies of an account in a cookie jar.
+
+        Returns False if there are none.
+        """
+        document = self.load(account, "cookies")
+        if document is None:
+            return False
+        load_cookies(cookies, document)
+        return True
+
+    def save_cookies(self, account, cookies):
+        """Saves the cookies of an account from a cookie jar."""
+        self.save(account, "cookies", dump_cookies(cookies))
+
+    def load_account_data(self, account):
+        """Returns the saved account data of an account, None if there is
+        none."""
+        document = self.load(account, "account")
+        return json.loads(document) if document is not None else None
+
+    def save_account_data(self, account, account_data):
+        """Saves the account data of an account."""
+        self.save(account, "account", json.dumps(account_data))
+
+    def load_sync_tokens(self, account):
+        """Returns the sync tokens of an account, by service."""
+        document = self.load(account, "sync")
+        return json.loads(document) if document is not None else {}
+
+    def save_sync_tokens(self, account, sync_tokens):
+        """Saves the sync tokens of an account, by service."""
+        self.save(account, "sync", json.dumps(sync_tokens))
+
+    def close(self):
+        """Releases the resources of the store."""
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+
+class FileSessionStore(SessionStore):
+    """Stores each account in files of a directory: `<account>` for the
+    cookies (LWP format), `<account>.session` for the session data and
+    `<account>.account` for the account data and `<account>.sync` for the
+    sync tokens.
+
+    Files are written atomically, through a temporary file and a rename.
+    """
+
+    SUFFIXES = {
+        "cookies": "",
+        "session": ".session",
+        "account": ".account",
+        "sync": ".sync",
+    }
+
+    def __init__(self, directory):
+        self.directory = path.expanduser(path.normpath(directory))
+        if not path.exists(self.directory):
+            mkdir(self.directory, 0o700)
+
+    def get_path(self, account, kind):
+        """Returns the path of a document of an account."""
+        name = "".join([c for c in account if match(r"\w", c)])
+        return path.join(self.directory, name + self.SUFFIXES[kind])
+
+    def load(self, account, kind):
+        try:
+            with open(self.get_path(account, kind), encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, account, kind, document):
+        _atomic_write(self.get_path(account, kind), document)
+
+    def delete(self, account):
+        for kind in self.SUFFIXES:
+            try:
+                unlink(self.get_path(account, kind))
+            except FileNotFoundError:
+                pass
+
+    def load_cookies(self, account, cookies):
+        cookiejar_path = self.get_path(account, "cookies")
+        if not path.exists(cookiejar_path):
+            return False
+        cookies.load(cookiejar_path, ignore_discard=True, ignore_expires=True)
+        return True
+
+    def save_cookies(self, account, cookies):
+        # LWP format, readable by earlier versions
+        _atomic_write(
+            self.get_path(account, "cookies"),
+            "#LWP-Cookies-2.0\n"
+            + cookies.as_lwp_str(ignore_discard=True, ignore_expires=True),
+        )
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.directory}>"
+
+
+class MemorySessionStore(SessionStore):
+    """Stores the accounts in memory, for tests and short-lived processes."""
+
+    def __init__(self):
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    def load(self, account, kind):
+        with self._lock:
+            return self._documents.get((account, kind))
+
+    def save(self, account, kind, document):
+        with self._lock:
+            self._documents[(account, kind)] = document
+
+    def delete(self, account):
+        with self._lock:
+            for key in [key for key in self._documents if key[0] == account]:
+                del self._documents[key]
+
+
+class SQLiteSessionStore(SessionStore):
+    """Stores the accounts in a SQLite database, a row per document.
+
+    The database is in WAL mode: processes sharing it read concurrently,
+    and writes of different accounts only lock the database for a single
+    row update. A connection is opened per thread.
+    """
+
+    def __init__(self, filename, timeout=30):
+        self._connections = _SQLiteConnections(filename, timeout)
+        self.filename = self._connections.filename
+        self.timeout = timeout
+
+        connection = self._get_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "account TEXT NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "document TEXT NOT NULL, "
+            "updated REAL NOT NULL, "
+            "PRIMARY KEY (account, kind))"
+        )
+
+    def _get_connection(self):
+        return self._connections.get()
+
+    def load(self, account, kind):
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT document FROM documents WHERE account = ? AND kind = ?",
+                (account, kind),
+            )
+            .fetchone()
+        )
+        return row[0] if row is not None else None
+
+    def save(self, account, kind, document):
+        self._get_connection().execute(
+            "INSERT OR REPLACE INTO documents (account, kind, document, updated) "
+            "VALUES (?, ?, ?, ?)",
+            (account, kind, document, time.time()),
+        )
+
+    def delete(self, account):
+        self._get_connection().execute(
+            "DELETE FROM documents WHERE account = ?", (account,)
+        )
+
+    def close(self):
+        """Closes the connections of all the threads. Threads using the
+        store afterwards open new ones."""
+        self._connections.close()
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.filename}>"
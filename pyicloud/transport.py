@@ -0,0 +1,122 @@
+"""Transport configuration."""
+import socket
+
+from requests.adapters import HTTPAdapter
+
+
+class TransportConfig:
+    """Connection pooling and socket options of the iCloud sessions.
+
+    iCloud services live on many hosts (setup, auth, Find My iPhone, CloudKit
+    databases, Drive, photo contents...), so more host pools are kept than the
+    `requests` defaults, and connections stay open between requests.
+    """
+
+    def __init__(
+        self,
+        pool_connections=20,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        keep_alive_idle=None,
+        tcp_nodelay=True,
+    ):
+        # Number of hosts with a cached connection pool
+        self.pool_connections = pool_connections
+        # Number of connections kept open per host
+        self.pool_maxsize = pool_maxsize
+        # Wait for a pooled connection instead of opening a throwaway one
+        self.pool_block = pool_block
+        # Reuse connections, and probe idle ones after keep_alive_idle seconds
+        self.keep_alive = keep_alive
+        self.keep_alive_idle = keep_alive_idle
+        self.tcp_nodelay = tcp_nodelay
+
+    @property
+    def socket_options(self):
+        """Returns the options set on new sockets."""
+        options = []
+        if self.tcp_nodelay:
+            options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+        if self.keep_alive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if self.keep_alive_idle and hasattr(socket, "TCP_KEEPIDLE"):
+                options.append(
+                    (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keep_alive_idle)
+                )
+        return options
+
+    def create_adapter(self):
+        """Returns a new transport adapter with this configuration."""
+        return PyiCloudHTTPAdapter(self)
+
+    def __repr__(self):
+        return (
+            f"<TransportConfig: pool_connections={self.pool_connections}, "
+            f"pool_maxsize={self.pool_maxsize}, pool_block={self.pool_block}, "
+            f"keep_alive={self.keep_alive}, tcp_nodelay={self.tcp_nodelay}>"
+        )
+
+
+class PyiCloudHTTPAdapter(HTTPAdapter):
+    """Transport adapter tuned by a `TransportConfig`."""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["transport"]
+
+    def __init__(self, transport=None):
+        self.transport = transport or TransportConfig()
+        super().__init__(
+            pool_connections=self.transport.pool_connections,
+            pool_maxsize=self.transport.pool_maxsize,
+            pool_block=self.transport.pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", self.transport.socket_options)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault("socket_options", self.transport.socket_options)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def add_headers(self, request, **kwargs):
+        if not self.transport.keep_alive:
+            request.headers["Connection"] = "close"
+
+
+# Services answering quickly, which should not hold a worker for long
+DEFAULT_SERVICE_TIMEOUTS = {"findme": (5, 20)}
+
+
+class TimeoutConfig:
+    """Connect and read timeouts of the iCloud requests, in seconds.
+
+    `services` overrides them by service name: the webservice keys of the
+    account ("findme", "ckdatabasews", "drivews", "docws"...), "auth" and
+    "setup". Streamed downloads (photos, Drive files) use `stream_read`.
+    A timeout passed to a request takes precedence.
+    """
+
+    def __init__(self, connect=10, read=60, stream_read=300, services=None):
+        self.connect = connect
+        self.read = read
+        self.stream_read = stream_read
+        self.services = dict(DEFAULT_SERVICE_TIMEOUTS)
+        self.services.update(services or {})
+
+    def get(self, service=None, stream=False):
+        """Returns the (connect, read) timeout of a request."""
+        if stream:
+            return (self.connect, self.stream_read)
+        timeout = self.services.get(service)
+        if timeout is None:
+            return (self.connect, self.read)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (timeout, timeout)
+
+    def __repr__(self):
+        return (
+            f"<TimeoutConfig: connect={self.connect}, read={self.read}, "
+            f"stream_read={self.stream_read}, services={self.services}>"
+        )
@@ -1,7 +1,8 @@
 """Utils."""
 import getpass
-import keyring
+import os
 import sys
+import threading
 
 from .exceptions import PyiCloudNoStoredPasswordAvailableException
 
@@ -36,6 +37,8 @@ def password_exists_in_keyring(username):
 
 def get_password_from_keyring(username):
     """Get the password from a username."""
+    import keyring  # pylint: disable=import-outside-toplevel
+
     result = keyring.get_password(KEYRING_SYSTEM, username)
     if result is None:
         raise PyiCloudNoStoredPasswordAvailableException(
@@ -52,6 +55,8 @@ def get_password_from_keyring(username):
 
 def store_password_in_keyring(username, password):
     """Store the password of a username."""
+    import keyring  # pylint: disable=import-outside-toplevel
+
     return keyring.set_password(
         KEYRING_SYSTEM,
         username,
@@ -61,6 +66,8 @@ def store_password_in_keyring(username, password):
 
 def delete_password_in_keyring(username):
     """Delete the password of a username."""
+    import keyring  # pylint: disable=import-outside-toplevel
+
     return keyring.delete_password(
         KEYRING_SYSTEM,
         username,
@@ -74,3 +81,54 @@ def underscore_to_camelcase(word, initial_capital=False):
         words[0] = words[0].lower()
 
     return "".join(words)
+
+
+class _SQLiteConnections:
+    """Connections to a SQLite database, one per thread, in autocommit mode.
+
+    `~` is expanded in `filename`, and its directory created if needed.
+    Iterating returns the open connections of all the threads.
+    """
+
+    def __init__(self, filename, timeout=30):
+        self.filename = os.path.expanduser(filename)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, 0o700)
+
+    def get(self):
+        """Returns the connection of the current thread, opening it if
+        needed."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            import sqlite3  # pylint: disable=import-outside-toplevel
+
+            connection = sqlite3.connect(
+                self.filename,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                self._connections.append(connection)
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """Closes the connections of all the threads. Threads getting a
+        connection afterwards open new ones."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._connections))
@@ -1,6 +1,7 @@
 """Library tests."""
 import json
 from requests import Response
+from requests.adapters import BaseAdapter
 
 from pyicloud import base
 
@@ -53,6 +54,39 @@ class ResponseMock(Response):
         return json.dumps(self.result)
 
 
+class AdapterMock(BaseAdapter):
+    """Mocked transport adapter, answering with queued responses."""
+
+    def __init__(self, *responses):
+        """Set up adapter mock."""
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+        self.timeouts = []
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send the request."""
+        self.requests.append(request)
+        self.timeouts.append(kwargs.get("timeout"))
+        result, status_code, headers = self.responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        response = Response()
+        response.status_code = status_code
+        response.reason = "Reason"
+        response.headers.update({"Content-Type": "application/json"})
+        response.headers.update(headers)
+        response._content = json.dumps(  # pylint: disable=protected-access
+            result
+        ).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        """Close the adapter."""
+
+
 class PyiCloudSessionMock(base.PyiCloudSession):
     """Mocked PyiCloudSession."""
 
@@ -161,6 +195,8 @@ class PyiCloudSessionMock(base.PyiCloudSession):
 class PyiCloudServiceMock(base.PyiCloudService):
     """Mocked PyiCloudService."""
 
+    session_class = PyiCloudSessionMock
+
     def __init__(
         self,
         apple_id,
@@ -170,9 +206,17 @@ class PyiCloudServiceMock(base.PyiCloudService):
         client_id=None,
         with_family=True,
         china_mainland=False,
+        **kwargs,
     ):
         """Set up pyicloud service mock."""
-        base.PyiCloudSession = PyiCloudSessionMock
         base.PyiCloudService.__init__(
-            self, apple_id, password, cookie_directory, verify, client_id, with_family, china_mainland
+            self,
+            apple_id,
+            password,
+            cookie_directory,
+            verify,
+            client_id,
+            with_family,
+            china_mainland,
+            **kwargs,
         )
@@ -0,0 +1,650 @@
+"""Offline iCloud server, serving the test fixtures over real HTTP.
+
+The server answers the authentication, setup, Find My iPhone, account,
+CloudKit photos, Drive, calendar, contacts and reminders endpoints, with
+an optional latency, injected errors and a synthetic photo library.
+
+Usage:
+    with MockICloudServer(latency=0.01, photo_count=10000) as server:
+        api = server.create_service()
+        server.fail("/refreshClient", 503, count=2)
+        api.devices
+"""
+
+import base64
+import copy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from pyicloud.base import PyiCloudService
+
+from .const import (
+    AUTHENTICATED_USER,
+    VALID_PASSWORD,
+    VALID_USERS,
+)
+from .const_account import ACCOUNT_DEVICES_WORKING, ACCOUNT_STORAGE_WORKING
+from .const_account_family import ACCOUNT_FAMILY_WORKING
+from .const_drive import (
+    DRIVE_FILE_DOWNLOAD_WORKING,
+    DRIVE_FOLDER_WORKING,
+    DRIVE_ROOT_INVALID,
+    DRIVE_ROOT_WORKING,
+    DRIVE_SUBFOLDER_WORKING,
+)
+from .const_findmyiphone import FMI_FAMILY_WORKING
+from .const_login import AUTH_OK, LOGIN_WORKING
+
+AUTH_COOKIE = "X-APPLE-WEBAUTH-TOKEN"
+
+DRIVE_FOLDERS = {
+    "FOLDER::com.apple.CloudDocs::root": DRIVE_ROOT_WORKING,
+    "FOLDER::com.apple.CloudDocs::documents": DRIVE_ROOT_INVALID,
+    "FOLDER::com.apple.CloudDocs::1C7F1760-D940-480F-8C4F-005824A4E05B": (
+        DRIVE_FOLDER_WORKING
+    ),
+    "FOLDER::com.apple.CloudDocs::D5AA0425-E84F-4501-AF5D-60F1D92648CF": (
+        DRIVE_SUBFOLDER_WORKING
+    ),
+}
+
+
+# Resolutions of the synthetic photos: (prefix, width, height, size ratio)
+PHOTO_RESOLUTIONS = (
+    ("resOriginal", 4032, 3024, 1),
+    ("resJPEGFull", 4032, 3024, 0.5),
+    ("resJPEGLarge", 2048, 1536, 0.25),
+    ("resJPEGMed", 1280, 960, 0.1),
+    ("resJPEGThumb", 240, 180, 0.01),
+)
+
+
+def photo_records(index, base_url, photo_size, desired_keys=None):
+    """Returns the asset and master records of a synthetic photo, with the
+    `desired_keys` fields only if given."""
+    master_name = f"master-{index}"
+    filename = base64.b64encode(f"IMG_{index:06d}.JPG".encode()).decode()
+    date = 1600000000000 + index * 1000
+    master_fields = {
+        "filenameEnc": {"value": filename, "type": "ENCRYPTED_BYTES"},
+        "itemType": {"value": "public.jpeg", "type": "STRING"},
+        "dataClassType": {"value": 1, "type": "INT64"},
+        "originalOrientation": {"value": 1, "type": "INT64"},
+    }
+    for prefix, width, height, ratio in PHOTO_RESOLUTIONS:
+        version = prefix[3:].lower().replace("jpeg", "")
+        master_fields.update(
+            {
+                f"{prefix}Width": {"value": width, "type": "INT64"},
+                f"{prefix}Height": {"value": height, "type": "INT64"},
+                f"{prefix}FileType": {"value": "public.jpeg", "type": "STRING"},
+                f"{prefix}Fingerprint": {
+                    "value": f"{prefix}-{index:032d}",
+                    "type": "STRING",
+                },
+                f"{prefix}Res": {
+                    "value": {
+                        "size": max(int(photo_size * ratio), 1),
+                        "downloadURL": f"{base_url}/photos/{master_name}/{version}",
+                        "fileChecksum": f"checksum-{index:032d}",
+                        "wrappingKey": "d3JhcHBpbmdfa2V5",
+                        "referenceChecksum": f"reference-{index:032d}",
+                    },
+                    "type": "ASSETID",
+                },
+            }
+        )
+    master = {
+        "recordName": master_name,
+        "recordType": "CPLMaster",
+        "recordChangeTag": "1",
+        "fields": master_fields,
+    }
+
+    location = base64.b64encode(bytes(index % 256 for _ in range(192))).decode()
+    asset = {
+        "recordName": f"asset-{index}",
+        "recordType": "CPLAsset",
+        "recordChangeTag": "1",
+        "fields": {
+            "masterRef": {
+                "value": {"recordName": master_name, "action": "DELETE_SELF"},
+                "type": "REFERENCE",
+            },
+            "assetDate": {"value": date, "type": "TIMESTAMP"},
+            "addedDate": {"value": date, "type": "TIMESTAMP"},
+            "isFavorite": {"value": 0, "type": "INT64"},
+            "isHidden": {"value": 0, "type": "INT64"},
+            "isDeleted": {"value": 0, "type": "INT64"},
+            "orientation": {"value": 1, "type": "INT64"},
+            "timeZoneOffset": {"value": 3600, "type": "INT64"},
+            "assetSubtypeV2": {"value": 0, "type": "INT64"},
+            "locationEnc": {"value": location, "type": "ENCRYPTED_BYTES"},
+            "adjustmentRenderType": {"value": 0, "type": "INT64"},
+        },
+    }
+
+    if desired_keys is not None:
+        for record in (master, asset):
+            record["fields"] = {
+                key: value
+                for key, value in record["fields"].items()
+                if key in desired_keys
+            }
+    return asset, master
+
+
+class _Failure:
+    """An error injected in the responses of the matching paths."""
+
+    __slots__ = ("path", "status", "count", "headers", "body")
+
+    def __init__(self, path, status, count, headers, body):
+        self.path = path
+        self.status = status
+        self.count = count
+        self.headers = headers
+        self.body = body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Dispatches the requests to the server routes."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "MockICloud/1.0"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answers a GET request."""
+        self.server.icloud.handle(self, "GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Answers a POST request."""
+        self.server.icloud.handle(self, "POST")
+
+
+class MockICloudServer:
+    """Local stand-in for the iCloud web services.
+
+    `latency` delays each response, in seconds. `photo_count` is the size of
+    the synthetic photo library, `photo_size` the size of its downloads, and
+    `drive_item_count` adds synthetic files to the Drive root folder.
+
+    The photo library changes with `add_photos`, `update_photo`,
+    `update_master` and `delete_photo`, reported by its changes feed: deleted photos are still
+    listed by the albums.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0,
+        photo_count=100,
+        photo_size=4096,
+        drive_item_count=0,
+    ):
+        self.latency = latency
+        self.photo_count = photo_count
+        self.photo_size = photo_size
+        self.drive_item_count = drive_item_count
+        self.requests = []
+
+        # Changes of the photo library after its `photo_count` first photos
+        self._initial_photo_count = photo_count
+        self._photo_changes = []
+        self._failures = []
+        self._tokens = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.icloud = self
+        self._thread = None
+
+        self._routes = [
+            ("POST", "/appleauth/auth/signin", self._signin, False),
+            ("GET", "/appleauth/auth/2sv/trust", self._no_content, False),
+            ("POST", "/setup/ws/1/accountLogin", self._account_login, False),
+            ("POST", "/setup/ws/1/validate", self._validate, False),
+            ("GET", "/setup/ws/1/storageUsageInfo", self._storage, True),
+            ("GET", "/setup/web/device/getDevices", self._devices, True),
+            ("GET", "/setup/web/family/getFamilyDetails", self._family, True),
+            ("POST", "/fmipservice/client/web/refreshClient", self._fmip, True),
+            ("POST", "/fmipservice/client/web/", self._empty, True),
+            ("POST", "/records/query/batch", self._photos_batch, True),
+            ("POST", "/records/query", self._photos_query, True),
+            ("POST", "/records/modify", self._photos_modify, True),
+            ("POST", "/records/lookup", self._photos_lookup, True),
+            ("POST", "/changes/zone", self._photos_changes, True),
+            ("GET", "/photos/", self._photo_download, False),
+            ("POST", "/retrieveItemDetailsInFolders", self._drive_folders, True),
+            ("GET", "/ws/com.apple.CloudDocs/download/by_id", self._drive_file, True),
+            ("GET", "/content/", self._drive_content, False),
+            ("GET", "/ca/startup", self._calendar, True),
+            ("GET", "/ca/events", self._calendar_events, True),
+            ("GET", "/co/startup", self._contacts, True),
+            ("GET", "/co/contacts", self._contacts, True),
+            ("GET", "/rd/startup", self._reminders, True),
+            ("POST", "/rd/reminders/tasks", self._empty, True),
+        ]
+
+    @property
+    def url(self):
+        """Returns the root URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves the requests from a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            args=(0.05,),
+            name="mock-icloud",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving, and closes the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def create_service(
+        self, apple_id=AUTHENTICATED_USER, password=VALID_PASSWORD, **kwargs
+    ):
+        """Returns a `PyiCloudService` authenticated against the server."""
+        service_class = type(
+            "MockICloudService",
+            (PyiCloudService,),
+            {
+                "AUTH_ENDPOINT": f"{self.url}/appleauth/auth",
+                "HOME_ENDPOINT": self.url,
+                "SETUP_ENDPOINT": f"{self.url}/setup/ws/1",
+            },
+        )
+        return service_class(apple_id, password, **kwargs)
+
+    def fail(self, path, status=503, count=1, headers=None, body=None):
+        """Answers the next `count` requests of the paths containing `path`
+        with an error."""
+        with self._lock:
+            self._failures.append(
+                _Failure(path, status, count, headers or {}, body or {})
+            )
+
+    def add_photos(self, count=1):
+        """Adds photos to the library."""
+        with self._lock:
+            for _ in range(count):
+                self._photo_changes.append(("added", self.photo_count))
+                self.photo_count += 1
+
+    def update_photo(self, index):
+        """Updates the asset of a photo."""
+        with self._lock:
+            self._photo_changes.append(("updated", index))
+
+    def update_master(self, index):
+        """Updates the master of a photo."""
+        with self._lock:
+            self._photo_changes.append(("master", index))
+
+    def delete_photo(self, index):
+        """Deletes a photo."""
+        with self._lock:
+            self._photo_changes.append(("deleted", index))
+
+    def expire_sessions(self):
+        """Invalidates the sessions: requests then fail with a 421 until
+        the clients authenticate again."""
+        with self._lock:
+            self._tokens.clear()
+
+    def handle(self, handler, method):
+        """Answers a request."""
+        split = urlsplit(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        with self._lock:
+            self.requests.append((method, split.path))
+            failure = self._pop_failure(split.path)
+
+        if self.latency:
+            time.sleep(self.latency)
+        if failure is not None:
+            self._respond(handler, failure.status, failure.body, failure.headers)
+            return
+
+        for route_method, path, route, authenticated in self._routes:
+            if route_method == method and path in split.path:
+                if authenticated and not self._is_authenticated(handler.headers):
+                    self._respond(handler, 421, {"error": "Misdirected Request"})
+                    return
+                request = {
+                    "path": split.path,
+                    "params": {
+                        key: values[0] for key, values in parse_qs(split.query).items()
+                    },
+                    "body": body,
+                    "headers": handler.headers,
+                }
+                response = route(request)
+                self._respond(handler, *response)
+                return
+        self._respond(handler, 404, {"error": "Not Found"})
+
+    def _pop_failure(self, path):
+        for failure in self._failures:
+            if failure.path in path:
+                failure.count -= 1
+                if failure.count <= 0:
+                    self._failures.remove(failure)
+                return failure
+        return None
+
+    def _is_authenticated(self, headers):
+        cookies = SimpleCookie(headers.get("Cookie", ""))
+        token = cookies.get(AUTH_COOKIE)
+        with self._lock:
+            return token is not None and token.value in self._tokens
+
+    def _respond(self, handler, status, content, headers=None):
+        if isinstance(content, bytes):
+            payload, content_type = content, "application/octet-stream"
+        else:
+            payload, content_type = json.dumps(content).encode(), "application/json"
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        for header, value in (headers or {}).items():
+            handler.send_header(header, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    # Authentication
+
+    def _signin(self, request):
+        data = json.loads(request["body"])
+        if (
+            data.get("accountName") not in VALID_USERS
+            or data.get("password") != VALID_PASSWORD
+        ):
+            return 401, {"serviceErrors": [{"code": "-20101"}]}
+        headers = {
+            "X-Apple-Session-Token": f"session-{time.monotonic_ns()}",
+            "X-Apple-ID-Session-Id": "session_id",
+            "scnt": "scnt",
+        }
+        return 200, AUTH_OK, headers
+
+    def _account_login(self, request):
+        data = json.loads(request["body"])
+        if not data.get("dsWebAuthToken") and not data.get("password"):
+            return 421, {"error": "Missing token"}
+        token = f"token-{time.monotonic_ns()}"
+        with self._lock:
+            self._tokens.add(token)
+        return 200, self._login_data(), {"Set-Cookie": f"{AUTH_COOKIE}={token}; Path=/"}
+
+    def _validate(self, request):
+        if not self._is_authenticated(request["headers"]):
+            return 421, {"error": "Session expired"}
+        return 200, self._login_data()
+
+    def _login_data(self):
+        """Returns the account data, its web services served by the server."""
+        data = copy.deepcopy(LOGIN_WORKING)
+        data["hsaChallengeRequired"] = False
+        data["hsaTrustedBrowser"] = True
+        for webservice in data["webservices"].values():
+            if "url" in webservice:
+                webservice["url"] = self.url
+        return data
+
+    @staticmethod
+    def _no_content(request):  # pylint: disable=unused-argument
+        return 204, b""
+
+    @staticmethod
+    def _empty(request):  # pylint: disable=unused-argument
+        return 200, {}
+
+    # Account and Find My iPhone
+
+    @staticmethod
+    def _storage(request):  # pylint: disable=unused-argument
+        return 200, ACCOUNT_STORAGE_WORKING
+
+    @staticmethod
+    def _devices(request):  # pylint: disable=unused-argument
+        return 200, ACCOUNT_DEVICES_WORKING
+
+    @staticmethod
+    def _family(request):  # pylint: disable=unused-argument
+        return 200, ACCOUNT_FAMILY_WORKING
+
+    @staticmethod
+    def _fmip(request):  # pylint: disable=unused-argument
+        return 200, FMI_FAMILY_WORKING
+
+    # Photos
+
+    def _photos_batch(self, request):
+        """Answers the album counts, and the asset queries by master."""
+        batch = []
+        for query in json.loads(request["body"])["batch"]:
+            if query["query"]["recordType"] != "CPLAsset":
+                count = {"itemCount": {"value": self.photo_count, "type": "INT64"}}
+                batch.append({"records": [{"fields": count}]})
+                continue
+            desired_keys = query.get("desiredKeys")
+            if desired_keys is not None:
+                desired_keys = set(desired_keys)
+            master_name = query["query"]["filterBy"][0]["fieldValue"]["value"][
+                "recordName"
+            ]
+            index = int(master_name[len("master-") :])
+            asset, _ = photo_records(index, self.url, self.photo_size, desired_keys)
+            batch.append({"records": [asset]})
+        return 200, {"batch": batch}
+
+    def _photos_query(self, request):
+        query = json.loads(request["body"])
+        record_type = query["query"]["recordType"]
+        if record_type == "CheckIndexingState":
+            state = {"state": {"value": "FINISHED", "type": "STRING"}}
+            return 200, {"records": [{"fields": state}], "syncToken": "sync"}
+        if record_type == "CPLAlbumByPositionLive":
+            return 200, {"records": self._photo_folders()}
+
+        filters = {item["fieldName"]: item for item in query["query"]["filterBy"]}
+        offset = filters["startRank"]["fieldValue"]["value"]
+        descending = filters["direction"]["fieldValue"]["value"] == "DESCENDING"
+        page_size = query.get("resultsLimit", 200) // 2
+        if descending:
+            indexes = range(min(offset, self.photo_count - 1), -1, -1)
+        else:
+            indexes = range(max(offset, 0), self.photo_count)
+
+        desired_keys = query.get("desiredKeys")
+        if desired_keys is not None:
+            desired_keys = set(desired_keys)
+        records = []
+        for index in indexes[:page_size]:
+            records.extend(
+                photo_records(index, self.url, self.photo_size, desired_keys)
+            )
+        return 200, {"records": records}
+
+    def _photos_lookup(self, request):
+        query = json.loads(request["body"])
+        desired_keys = query.get("desiredKeys")
+        if desired_keys is not None:
+            desired_keys = set(desired_keys)
+        records = []
+        for item in query["records"]:
+            name = item["recordName"]
+            if name.startswith("master-"):
+                index = int(name[len("master-") :])
+                _, master = photo_records(
+                    index, self.url, self.photo_size, desired_keys
+                )
+                records.append(master)
+            else:
+                records.append(
+                    {
+                        "recordName": name,
+                        "serverErrorCode": "NOT_FOUND",
+                        "reason": "Record not found",
+                    }
+                )
+        return 200, {"records": records}
+
+    def _photos_changes(self, request):
+        zone = json.loads(request["body"])["zones"][0]
+        zone_id = {"zoneName": "PrimarySync"}
+        sync_token = zone.get("syncToken", "sync-0")
+        if not sync_token.startswith("sync-"):
+            return 200, {
+                "zones": [
+                    {
+                        "zoneID": zone_id,
+                        "serverErrorCode": "BAD_REQUEST",
+                        "reason": "Unknown sync token",
+                    }
+                ]
+            }
+        desired_keys = zone.get("desiredKeys")
+        if desired_keys is not None:
+            desired_keys = set(desired_keys)
+        with self._lock:
+            changes = self._photo_changes[:]
+        change_count = self._initial_photo_count + len(changes)
+
+        position = int(sync_token[len("sync-") :])
+        records = []
+        while position < change_count and len(records) < zone.get("resultsLimit", 200):
+            if position < self._initial_photo_count:
+                kind, index = "added", position
+            else:
+                kind, index = changes[position - self._initial_photo_count]
+            position += 1
+
+            asset, master = photo_records(
+                index, self.url, self.photo_size, desired_keys
+            )
+            if kind == "added":
+                records.extend((master, asset))
+            elif kind == "updated":
+                records.append(asset)
+            elif kind == "master":
+                records.append(master)
+            else:
+                records.append({"recordName": asset["recordName"], "deleted": True})
+                records.append({"recordName": master["recordName"], "deleted": True})
+        return 200, {
+            "zones": [
+                {
+                    "zoneID": zone_id,
+                    "records": records,
+                    "syncToken": f"sync-{position}",
+                    "moreComing": position < change_count,
+                }
+            ]
+        }
+
+    @staticmethod
+    def _photo_folders():
+        folders = [{"recordName": "----Root-Folder----", "fields": {}}]
+        for index in range(3):
+            name = base64.b64encode(f"Album {index}".encode()).decode()
+            folders.append(
+                {
+                    "recordName": f"album-{index}",
+                    "fields": {"albumNameEnc": {"value": name}},
+                }
+            )
+        return folders
+
+    @staticmethod
+    def _photos_modify(request):  # pylint: disable=unused-argument
+        return 200, {"records": []}
+
+    def _photo_download(self, request):
+        version = request["path"].rsplit("/", 1)[-1]
+        for prefix, _, _, ratio in PHOTO_RESOLUTIONS:
+            if prefix[3:].lower().replace("jpeg", "") == version:
+                return 200, bytes(max(int(self.photo_size * ratio), 1))
+        return 404, {"error": "Not Found"}
+
+    # Drive
+
+    def _drive_folders(self, request):
+        data = json.loads(request["body"])
+        folder = DRIVE_FOLDERS.get(data[0].get("drivewsid"))
+        if folder is None:
+            return 200, DRIVE_ROOT_INVALID
+        if folder is DRIVE_ROOT_WORKING and self.drive_item_count:
+            folder = copy.deepcopy(folder)
+            items = folder[0]["items"]
+            for index in range(self.drive_item_count):
+                items.append(
+                    {
+                        "drivewsid": f"FILE::com.apple.CloudDocs::file-{index}",
+                        "docwsid": f"file-{index}",
+                        "zone": "com.apple.CloudDocs",
+                        "name": f"file-{index}",
+                        "extension": "txt",
+                        "parentId": "FOLDER::com.apple.CloudDocs::root",
+                        "dateCreated": "2020-04-27T21:37:36Z",
+                        "dateModified": "2020-04-27T21:37:36Z",
+                        "dateChanged": "2020-04-27T21:37:36Z",
+                        "size": 1024,
+                        "etag": "1",
+                        "type": "FILE",
+                    }
+                )
+            folder[0]["numberOfItems"] = len(items)
+        return 200, folder
+
+    def _drive_file(self, request):  # pylint: disable=unused-argument
+        data = copy.deepcopy(DRIVE_FILE_DOWNLOAD_WORKING)
+        data["data_token"]["url"] = f"{self.url}/content/Scanned+document+1.pdf"
+        return 200, data
+
+    def _drive_content(self, request):  # pylint: disable=unused-argument
+        return 200, bytes(self.photo_size)
+
+    # Calendar, contacts and reminders
+
+    @staticmethod
+    def _calendar(request):  # pylint: disable=unused-argument
+        return 200, {"Collection": [], "Event": []}
+
+    @staticmethod
+    def _calendar_events(request):  # pylint: disable=unused-argument
+        return 200, {"Event": []}
+
+    @staticmethod
+    def _contacts(request):  # pylint: disable=unused-argument
+        return 200, {"prefToken": "pref", "syncToken": "sync", "contacts": []}
+
+    @staticmethod
+    def _reminders(request):  # pylint: disable=unused-argument
+        return 200, {"Collections": [], "Reminders": []}
@@ -0,0 +1,309 @@
+"""asyncio client tests."""
+import asyncio
+import threading
+from copy import deepcopy
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pyicloud.aio import AsyncPyiCloudService
+from pyicloud.base import PASSWORD_FILTER
+from pyicloud.exceptions import PyiCloudFailedLoginException
+from pyicloud.store import MemorySessionStore
+
+from .const import AUTHENTICATED_USER, VALID_COOKIE, VALID_PASSWORD, VALID_TOKEN
+from .const_drive import DRIVE_ROOT_WORKING
+from .const_findmyiphone import FMI_FAMILY_WORKING
+from .const_login import AUTH_OK, LOGIN_WORKING
+from .server import MockICloudServer
+
+
+class ICloudServerStub:
+    """Local HTTP server answering like iCloud."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.refreshes = 0
+        self.server = None
+
+        app = web.Application()
+        app.router.add_post("/appleauth/auth/signin", self.signin)
+        app.router.add_post("/setup/ws/1/accountLogin", self.account_login)
+        app.router.add_post("/setup/ws/1/validate", self.account_login)
+        app.router.add_post(
+            "/fmipservice/client/web/refreshClient", self.refresh_client
+        )
+        app.router.add_post("/retrieveItemDetailsInFolders", self.retrieve_items)
+        app.router.add_get("/ws/{dsid}/{variant}/{node_id}", self.ubiquity_node)
+        self.app = app
+
+    @property
+    def url(self):
+        """Returns the server root URL."""
+        return str(self.server.make_url("")).rstrip("/")
+
+    async def start(self):
+        """Starts the server."""
+        self.server = TestServer(self.app)
+        await self.server.start_server()
+
+    async def close(self):
+        """Stops the server."""
+        await self.server.close()
+
+    async def signin(self, request):
+        """Answers the signin request."""
+        data = await request.json()
+        if data["password"] != VALID_PASSWORD:
+            return web.json_response({"error": "Unknown reason"}, status=401)
+        response = web.json_response(
+            AUTH_OK, headers={"X-Apple-Session-Token": VALID_TOKEN}
+        )
+        response.set_cookie("X-APPLE-WEBAUTH-TOKEN", VALID_COOKIE)
+        return response
+
+    async def account_login(self, request):
+        """Answers the account login and validate requests."""
+        if request.cookies.get("X-APPLE-WEBAUTH-TOKEN") != VALID_COOKIE:
+            return web.json_response({"error": "Session expired"}, status=421)
+        login = deepcopy(LOGIN_WORKING)
+        for webservice in login["webservices"].values():
+            if "url" in webservice:
+                webservice["url"] = self.url
+        return web.json_response(login)
+
+    async def refresh_client(self, request):  # pylint: disable=unused-argument
+        """Answers the Find My iPhone refresh, slowly."""
+        self.refreshes += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return web.json_response(FMI_FAMILY_WORKING)
+
+    async def ubiquity_node(self, request):
+        """Answers the Ubiquity node requests."""
+        variant = request.match_info["variant"]
+        if variant == "file":
+            return web.Response(body=b"content")
+        node = {"item_id": request.match_info["node_id"], "type": "folder"}
+        if variant == "item":
+            return web.json_response(dict(node, name=""))
+        item = {"item_id": "1", "name": "notes.txt", "type": "file", "size": "7"}
+        return web.json_response({"item_list": [item]})
+
+    async def retrieve_items(self, request):  # pylint: disable=unused-argument
+        """Answers the Drive items request."""
+        return web.json_response(DRIVE_ROOT_WORKING)
+
+
+class AsyncPyiCloudServiceTest(TestCase):
+    """asyncio client tests."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        """Tear down tests."""
+        self._directory.cleanup()
+
+    def _run(self, test, **kwargs):
+        async def run():
+            server = ICloudServerStub()
+            await server.start()
+            api = AsyncPyiCloudService(
+                AUTHENTICATED_USER,
+                VALID_PASSWORD,
+                cookie_directory=self._directory.name,
+                **kwargs,
+            )
+            api.AUTH_ENDPOINT = f"{server.url}/appleauth/auth"
+            api.SETUP_ENDPOINT = f"{server.url}/setup/ws/1"
+            try:
+                async with api:
+                    await test(api, server)
+            finally:
+                await server.close()
+
+        asyncio.run(run())
+
+    def test_authenticate(self):
+        """Tests authentication, sharing the session data and cookies."""
+
+        async def test(api, server):  # pylint: disable=unused-argument
+            assert api.session_data["session_token"] == VALID_TOKEN
+            assert api.data["dsInfo"]["dsid"]
+            await api._validate_token()  # pylint: disable=protected-access
+
+        self._run(test)
+
+    def test_failed_login(self):
+        """Tests that a failed login closes the session, and stops hiding
+        the password."""
+
+        async def run():
+            server = ICloudServerStub()
+            await server.start()
+            api = AsyncPyiCloudService(
+                AUTHENTICATED_USER,
+                "wrong password",
+                cookie_directory=self._directory.name,
+            )
+            api.AUTH_ENDPOINT = f"{server.url}/appleauth/auth"
+            api.SETUP_ENDPOINT = f"{server.url}/setup/ws/1"
+            try:
+                api.session._get_client()  # pylint: disable=protected-access
+                with self.assertRaises(PyiCloudFailedLoginException):
+                    async with api:
+                        pass
+                assert api.session._client.closed  # pylint: disable=protected-access
+                passwords = PASSWORD_FILTER._counts  # pylint: disable=protected-access
+                assert "wrong password" not in passwords
+            finally:
+                await server.close()
+
+        asyncio.run(run())
+
+    def test_devices(self):
+        """Tests the Find My iPhone service."""
+
+        async def test(api, server):  # pylint: disable=unused-argument
+            devices = await api.devices
+            assert len(devices.keys()) == 13
+            assert (await api.iphone)["name"]
+
+        self._run(test)
+
+    def test_max_concurrency(self):
+        """Tests that concurrent requests are bounded."""
+
+        async def test(api, server):
+            devices = await api.devices
+            await asyncio.gather(*(devices.refresh_client() for _ in range(8)))
+            assert server.max_in_flight == 2
+
+        self._run(test, max_concurrency=2)
+
+    def test_coalesce_requests(self):
+        """Tests that concurrent identical requests are sent once."""
+
+        async def test(api, server):
+            devices = await api.devices
+            await asyncio.gather(*(devices.refresh_client() for _ in range(8)))
+            assert server.refreshes == 2
+            assert api.session.coalesced_requests == 7
+            assert len(devices.keys()) == 13
+
+        self._run(test, coalesce_requests=True)
+
+    def test_service_created_once(self):
+        """Tests that concurrent accesses to a service create it once."""
+
+        async def test(api, server):
+            managers = await asyncio.gather(*(api.devices for _ in range(8)))
+            assert server.refreshes == 1
+            assert all(manager is managers[0] for manager in managers)
+
+        self._run(test)
+
+    def test_drive(self):
+        """Tests the Drive service."""
+
+        async def test(api, server):  # pylint: disable=unused-argument
+            root = await api.drive.root
+            assert root.name == ""
+            assert await root.dir() == [
+                "Keynote",
+                "Numbers",
+                "Pages",
+                "Preview",
+                "pyiCloud",
+            ]
+
+        self._run(test)
+
+    def test_photo_changes(self):
+        """Tests the photo library changes."""
+
+        async def run():
+            with MockICloudServer(photo_count=150) as server:
+                api = AsyncPyiCloudService(
+                    AUTHENTICATED_USER,
+                    VALID_PASSWORD,
+                    session_store=MemorySessionStore(),
+                )
+                api.AUTH_ENDPOINT = f"{server.url}/appleauth/auth"
+                api.HOME_ENDPOINT = server.url
+                api.SETUP_ENDPOINT = f"{server.url}/setup/ws/1"
+                async with api:
+                    photos = await api.photos
+                    changes = [change async for change in photos.changes()]
+                    assert len(changes) == 150
+                    server.update_photo(7)
+                    server.update_master(9)
+                    changes = [change async for change in photos.changes()]
+                    assert changes[0].photo.filename == "IMG_000007.JPG"
+                    assert changes[1].photo.filename == "IMG_000009.JPG"
+                    assert photos.sync_token == "sync-152"
+
+        asyncio.run(run())
+
+    def test_photo_album(self):
+        """Tests listing a photo album."""
+
+        async def run():
+            with MockICloudServer(photo_count=150) as server:
+                api = AsyncPyiCloudService(
+                    AUTHENTICATED_USER,
+                    VALID_PASSWORD,
+                    session_store=MemorySessionStore(),
+                )
+                api.AUTH_ENDPOINT = f"{server.url}/appleauth/auth"
+                api.HOME_ENDPOINT = server.url
+                api.SETUP_ENDPOINT = f"{server.url}/setup/ws/1"
+                async with api:
+                    album = await (await api.photos).all
+                    assert album
+                    assert await album.length() == 150
+                    photos = [photo async for photo in album]
+                    assert len(photos) == 150
+                    assert photos[149].filename == "IMG_000149.JPG"
+
+        asyncio.run(run())
+
+    def test_persist_off_loop(self):
+        """Tests that the session is persisted outside the event loop thread."""
+
+        async def test(api, server):  # pylint: disable=unused-argument
+            threads = []
+            persist = api.session.persist
+
+            def record_persist(force=False):
+                threads.append(threading.current_thread())
+                persist(force)
+
+            api.session.persist = record_persist
+            await api.devices
+            assert threads
+            assert threading.current_thread() not in threads
+
+        self._run(test)
+
+    def test_files(self):
+        """Tests the Ubiquity service."""
+
+        async def test(api, server):  # pylint: disable=unused-argument
+            api.params["dsid"] = api.data["dsInfo"]["dsid"]
+            root = await api.files.root
+            assert await root.dir() == ["notes.txt"]
+            node = await root.get("notes.txt")
+            assert node.size == 7
+            assert (await node.open()).content == b"content"
+            with self.assertRaises(KeyError):
+                await root.get("missing")
+
+        self._run(test)
@@ -0,0 +1,59 @@
+"""Library base tests."""
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from . import PyiCloudServiceMock, PyiCloudSessionMock
+from .const import AUTHENTICATED_USER, VALID_PASSWORD
+
+
+class RestoreAccountDataTest(TestCase):
+    """Tests of the validation skipped with fresh account data."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.service = self._service()
+        self.service.session.flush()
+
+    def tearDown(self):
+        """Tear down tests."""
+        self._directory.cleanup()
+
+    def _service(self, **kwargs):
+        kwargs.setdefault("validate_max_age", 60)
+        return PyiCloudServiceMock(
+            AUTHENTICATED_USER,
+            VALID_PASSWORD,
+            cookie_directory=self._directory.name,
+            **kwargs,
+        )
+
+    def test_restored(self):
+        """Tests that fresh account data is restored without requests."""
+        with patch.object(
+            PyiCloudSessionMock,
+            "request",
+            autospec=True,
+            side_effect=PyiCloudSessionMock.request,
+        ) as request:
+            service = self._service()
+            request.assert_not_called()
+
+            assert not service.validated
+            assert service.data == self.service.data
+            assert len(service.devices.keys()) == 13
+
+    def test_not_restored(self):
+        """Tests that old, disabled or foreign account data is not restored."""
+        # pylint: disable=protected-access
+        assert self.service._restore_account_data()
+
+        with patch("pyicloud.base.time.time", return_value=2e9):
+            assert not self.service._restore_account_data()
+
+        self.service.session_data["session_token"] = "other token"
+        assert not self.service._restore_account_data()
+
+        self.service.validate_max_age = None
+        assert not self.service._restore_account_data()
@@ -0,0 +1,120 @@
+"""Response cache tests."""
+import os
+from tempfile import TemporaryDirectory
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyicloud.cache import (
+    CacheEntry,
+    MemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+)
+
+
+def _entry(content=b"{}", ttl=60, **headers):
+    return CacheEntry(200, headers, content, time.time() + ttl)
+
+
+class MemoryCacheBackendTest(TestCase):
+    """Memory cache backend tests."""
+
+    def test_lru_eviction(self):
+        """Tests that the least recently used entries are evicted beyond the
+        size cap."""
+        backend = MemoryCacheBackend(max_size=10)
+        backend.set("user", "a", _entry(b"aaaa"))
+        backend.set("user", "b", _entry(b"bbbb"))
+        backend.get("user", "a")
+        backend.set("user", "c", _entry(b"cccc"))
+
+        assert backend.get("user", "b") is None
+        assert backend.get("user", "a").content == b"aaaa"
+        assert backend.size == 8
+        assert backend.evictions == 1
+
+        backend.set("user", "d", _entry(b"d" * 11))
+        assert backend.get("user", "d") is None
+
+    def test_invalidate(self):
+        """Tests that invalidation drops the entries of an account only."""
+        backend = MemoryCacheBackend()
+        backend.set("user", "a", _entry())
+        backend.set("other", "a", _entry())
+        backend.invalidate("user")
+
+        assert backend.get("user", "a") is None
+        assert backend.get("other", "a") is not None
+        assert len(backend) == 1
+
+
+class SQLiteCacheBackendTest(TestCase):
+    """SQLite cache backend tests."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.filename = os.path.join(self._directory.name, "cache.db")
+
+    def tearDown(self):
+        """Tear down tests."""
+        self._directory.cleanup()
+
+    def test_shared(self):
+        """Tests that entries are shared by the backends of a database."""
+        backend = SQLiteCacheBackend(self.filename)
+        backend.set("user", "a", _entry(b'{"a": 1}', ETag='"1"'))
+        backend.close()
+
+        entry = SQLiteCacheBackend(self.filename).get("user", "a")
+        assert entry.content == b'{"a": 1}'
+        assert entry.etag == '"1"'
+        assert entry.is_fresh()
+
+    def test_home_directory(self):
+        """Tests that the database path is expanded, and its directory
+        created."""
+        with patch.dict(os.environ, {"HOME": self._directory.name}):
+            backend = SQLiteCacheBackend(os.path.join("~", ".pyicloud", "cache.db"))
+        backend.close()
+        assert backend.filename == os.path.join(
+            self._directory.name, ".pyicloud", "cache.db"
+        )
+        assert os.path.exists(backend.filename)
+
+    def test_purge(self):
+        """Tests that expired entries are purged, unless they have a
+        validator."""
+        backend = SQLiteCacheBackend(self.filename, purge_interval=3)
+        backend.set("user", "expired", _entry(ttl=-1))
+        backend.set("user", "validated", _entry(ttl=-1, ETag='"1"'))
+        backend.set("user", "fresh", _entry())
+
+        assert backend.get("user", "expired") is None
+        assert backend.get("user", "validated") is not None
+        assert backend.get("user", "fresh") is not None
+
+
+class ResponseCacheTest(TestCase):
+    """Response cache tests."""
+
+    def test_rules(self):
+        """Tests that only the URLs matching a rule are cached."""
+        cache = ResponseCache(rules={"/startup": 60})
+
+        assert cache.get_ttl("https://p31-calendarws.icloud.com/ca/startup?a=1") == 60
+        assert cache.get_ttl("https://p31-calendarws.icloud.com/ca/events") is None
+        assert ResponseCache().get_ttl("https://setup.icloud.com/storageUsageInfo")
+
+    def test_counters(self):
+        """Tests the hit and miss counters."""
+        cache = ResponseCache()
+        assert cache.lookup("user", "a") == (None, False)
+        cache.store("user", "a", 60, 200, {"Content-Type": "text/json"}, b"{}")
+        entry, fresh = cache.lookup("user", "a")
+
+        assert fresh and entry.headers == {"Content-Type": "text/json"}
+        assert cache.counters["hits"] == 1
+        assert cache.counters["misses"] == 1
+        assert cache.counters["stored"] == 1
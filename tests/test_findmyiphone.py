@@ -1,5 +1,8 @@
 """Find My iPhone service tests."""
 from unittest import TestCase
+from unittest.mock import patch
+
+from pyicloud.services.findmyiphone import FindMyiPhoneServiceManager
 
 from . import PyiCloudServiceMock
 from .const import AUTHENTICATED_USER, VALID_PASSWORD
@@ -86,3 +89,34 @@ class FindMyiPhoneServiceTest(TestCase):
             assert device.data["maxMsgChar"] is not None
             assert device.data["darkWake"] is not None
             assert device.data["remoteWipe"] is None
+
+    def test_devices_cached(self):
+        """Tests that the devices are fetched once, until invalidated."""
+        with patch.object(
+            FindMyiPhoneServiceManager,
+            "refresh_client",
+            autospec=True,
+            side_effect=FindMyiPhoneServiceManager.refresh_client,
+        ) as refresh_client:
+            devices = self.service.devices
+            assert self.service.devices is devices
+            assert self.service.iphone is devices[0]
+            assert refresh_client.call_count == 1
+
+            self.service.invalidate_services("devices")
+            assert self.service.devices is not devices
+            assert refresh_client.call_count == 2
+
+            devices = self.service.refresh_service("devices")
+            assert self.service.devices is devices
+            assert refresh_client.call_count == 3
+
+    def test_devices_ttl(self):
+        """Tests that the devices expire after their TTL."""
+        self.service.service_ttls["devices"] = 60
+        with patch("pyicloud.base.time.monotonic", return_value=1000):
+            devices = self.service.devices
+        with patch("pyicloud.base.time.monotonic", return_value=1059):
+            assert self.service.devices is devices
+        with patch("pyicloud.base.time.monotonic", return_value=1060):
+            assert self.service.devices is not devices
@@ -0,0 +1,63 @@
+"""Import time tests."""
+import subprocess
+import sys
+from unittest import TestCase
+
+# Modules only imported on first use
+LAZY_MODULES = (
+    "click",
+    "keyring",
+    "pickle",
+    "tzlocal",
+    "pyicloud.services.account",
+    "pyicloud.services.calendar",
+    "pyicloud.services.contacts",
+    "pyicloud.services.drive",
+    "pyicloud.services.findmyiphone",
+    "pyicloud.services.photos",
+    "pyicloud.services.reminders",
+    "pyicloud.services.ubiquity",
+)
+
+# Cumulative import time budget of the command line, in seconds. It is well
+# above the expected time (mostly requests), to allow for slow CI machines.
+CMDLINE_IMPORT_BUDGET = 1.0
+
+
+def _import_times(module_name):
+    """Returns the cumulative import time of each imported module, in
+    seconds, as reported by `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            import_times[name.strip()] = int(cumulative) / 1e6
+        except ValueError:
+            continue  # Header
+    return import_times
+
+
+class ImportTimeTest(TestCase):
+    """Import time tests."""
+
+    def test_package(self):
+        """Tests that importing the package imports no service."""
+        import_times = _import_times("pyicloud")
+        assert "pyicloud" in import_times
+        assert "pyicloud.base" not in import_times
+        assert "requests" not in import_times
+
+    def test_cmdline(self):
+        """Tests that the command line imports lazily, within its budget."""
+        import_times = _import_times("pyicloud.cmdline")
+        for module_name in LAZY_MODULES:
+            assert module_name not in import_times, module_name
+        assert import_times["pyicloud.cmdline"] < CMDLINE_IMPORT_BUDGET
@@ -0,0 +1,143 @@
+"""Photo index tests."""
+from datetime import datetime, timezone
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyicloud.photoindex import PhotoIndex
+from pyicloud.services.photos import PhotoAsset, PhotoChanges
+from pyicloud.store import MemorySessionStore
+
+from .server import MockICloudServer
+
+
+class PhotoIndexTest(TestCase):
+    """Photo index tests."""
+
+    def setUp(self):
+        """Set up a library of 250 photos, and an empty index."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._directory.cleanup)
+        self.server = MockICloudServer(photo_count=250).start()
+        self.addCleanup(self.server.stop)
+        self.api = self.server.create_service(session_store=MemorySessionStore())
+        self.addCleanup(self.api.close)
+        self.index = PhotoIndex(
+            os.path.join(self._directory.name, "photos.db"), self.api.photos
+        )
+        self.addCleanup(self.index.close)
+
+    def test_update(self):
+        """Tests indexing albums, and querying them."""
+        assert self.index.update(self.api.photos.albums["Album 0"]) == 250
+        assert self.index.update(self.api.photos.all) == 250
+        assert len(self.index) == 250
+        assert self.index.albums == ["Album 0", "All Photos"]
+        assert self.index.get_albums("master-3") == ["Album 0", "All Photos"]
+
+        photo = self.index.get("master-3")
+        assert isinstance(photo, PhotoAsset)
+        assert photo.is_compact
+        assert photo.filename == "IMG_000003.JPG"
+        assert photo.item_type == "public.jpeg"
+        assert photo.fingerprint == "resOriginal-" + "3".zfill(32)
+        assert photo.size == 4096
+        assert photo.dimensions == (4032, 3024)
+        assert photo.asset_date == datetime(
+            2020, 9, 13, 12, 26, 43, tzinfo=timezone.utc
+        )
+        assert photo.versions["thumb"]["url"].endswith("/photos/master-3/thumb")
+        assert photo.download("thumb").raw.read() == bytes(40)
+        assert self.index.get("master-250") is None
+
+    def test_update_batches(self):
+        """Tests that an update is committed a batch at a time, not locking
+        the database during the scan."""
+        reader = PhotoIndex(self.index.filename)
+        self.addCleanup(reader.close)
+        counts = []
+
+        def scan():
+            for index, photo in enumerate(self.api.photos.all.photos):
+                if index % 100 == 0:
+                    counts.append(len(reader))
+                yield photo
+
+        album = SimpleNamespace(name="All Photos", photos=scan())
+        with patch("pyicloud.photoindex.BATCH_SIZE", 100):
+            assert self.index.update(album) == 250
+        assert counts == [0, 100, 200]
+        assert reader.get_albums("master-3") == ["All Photos"]
+
+    def test_home_directory(self):
+        """Tests that the database path is expanded, and its directory
+        created."""
+        with patch.dict(os.environ, {"HOME": self._directory.name}):
+            index = PhotoIndex(os.path.join("~", ".pyicloud", "photos.db"))
+        index.close()
+        assert index.filename == os.path.join(
+            self._directory.name, ".pyicloud", "photos.db"
+        )
+        assert os.path.exists(index.filename)
+
+    def test_find(self):
+        """Tests the indexed queries."""
+        self.index.update(self.api.photos.all)
+        start = datetime(2020, 9, 13, 12, 26, 50)
+        photos = self.index.find(
+            after=start, before=datetime(2020, 9, 13, 12, 27, tzinfo=timezone.utc)
+        )
+        assert [photo.filename for photo in photos] == [
+            f"IMG_{index:06d}.JPG" for index in range(10, 20)
+        ]
+        assert len(self.index.find(min_size=4096)) == 250
+        assert not self.index.find(min_size=4097)
+        assert [photo.id for photo in self.index.find(filename="IMG_00010%")] == [
+            f"master-{index}" for index in range(100, 110)
+        ]
+        assert len(self.index.find(album="All Photos", limit=5)) == 5
+        assert not self.index.find(album="Album 0")
+        assert not self.index.find(item_type="public.mpeg-4")
+
+    def test_refresh(self):
+        """Tests refreshing the index from the library changes."""
+        assert self.index.sync_token is None
+        assert self.index.refresh() == 250
+        assert len(self.index) == 250
+        assert self.index.sync_token == "sync-250"
+        assert self.api.photos.sync_token is None
+
+        self.server.add_photos(2)
+        self.server.delete_photo(5)
+        assert self.index.refresh() == 4
+        assert len(self.index) == 251
+        assert self.index.get("master-5") is None
+        assert self.index.get("master-251").filename == "IMG_000251.JPG"
+        assert self.index.refresh() == 0
+
+    def test_refresh_pages(self):
+        """Tests that a refresh doesn't lock the database while fetching
+        the pages of changes."""
+        fetch_zone = PhotoChanges._fetch_zone  # pylint: disable=protected-access
+        sync_tokens = []
+
+        def write_then_fetch(changes, sync_token):
+            connection = sqlite3.connect(
+                self.index.filename, timeout=0, isolation_level=None
+            )
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO state (name, value) VALUES ('probe', ?)",
+                    (sync_token,),
+                )
+            finally:
+                connection.close()
+            sync_tokens.append(self.index.sync_token)
+            return fetch_zone(changes, sync_token)
+
+        with patch.object(PhotoChanges, "_fetch_zone", write_then_fetch):
+            assert self.index.refresh() == 250
+        assert sync_tokens == [None, "sync-100", "sync-200"]
@@ -0,0 +1,321 @@
+"""Photos service tests."""
+
+from datetime import datetime, timezone
+from itertools import islice
+import threading
+import time
+from unittest import TestCase
+
+import pytest
+
+from pyicloud.exceptions import PyiCloudAPIResponseException
+from pyicloud.services.photos import (
+    DESIRED_KEYS,
+    REQUIRED_KEYS,
+    PhotoAlbum,
+    PhotoAsset,
+    get_desired_keys,
+)
+from pyicloud.store import MemorySessionStore
+
+from .server import MockICloudServer, photo_records
+
+
+class PagedAlbum(PhotoAlbum):
+    """Album of `count` photos, the ranks, served without requests."""
+
+    def __init__(self, count, direction="ASCENDING", short_pages=(), **kwargs):
+        super().__init__(None, "Album", "List", "Object", direction, **kwargs)
+        self._len = count
+        self.count = count
+        self.short_pages = short_pages
+        self.fetched = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _fetch_page(self, offset):
+        with self._lock:
+            self.fetched.append(offset)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        size = self.page_size // 2 if offset in self.short_pages else self.page_size
+        if self.direction == "DESCENDING":
+            ranks = list(range(offset, max(offset - size, -1), -1))
+        else:
+            ranks = list(range(offset, min(offset + size, self.count)))
+        with self._lock:
+            self.in_flight -= 1
+        return ranks
+
+
+class PhotoAlbumPrefetchTest(TestCase):
+    """Photo album prefetching tests."""
+
+    def test_in_order(self):
+        """Tests that prefetched photos are yielded in order."""
+        album = PagedAlbum(1050, page_size=100, prefetch=4)
+        assert list(album.photos) == list(range(1050))
+        assert 1 < album.max_in_flight <= 4
+
+    def test_descending(self):
+        """Tests the albums listed from their last photo."""
+        album = PagedAlbum(250, direction="DESCENDING", page_size=100, prefetch=2)
+        assert list(album.photos) == list(range(249, -1, -1))
+
+    def test_short_pages(self):
+        """Tests that the photos missing from short pages are fetched."""
+        album = PagedAlbum(500, page_size=100, prefetch=3, short_pages=(100, 300))
+        assert list(album.photos) == list(range(500))
+        assert 150 in album.fetched and 350 in album.fetched
+
+    def test_bounded(self):
+        """Tests that pages are fetched at most `prefetch` pages ahead."""
+        album = PagedAlbum(10000, page_size=10, prefetch=2)
+        photos = album.photos
+        assert [next(photos) for _ in range(25)] == list(range(25))
+        time.sleep(0.05)
+        assert len(album.fetched) <= 5
+        photos.close()
+
+    def test_server(self):
+        """Tests prefetching pages over HTTP."""
+        with MockICloudServer(photo_count=1234) as server:
+            api = server.create_service(session_store=MemorySessionStore())
+            album = api.photos.all
+            api.photos.prefetch = 4
+            photos = [photo.filename for photo in album]
+            assert album.prefetch == 4
+            api.close()
+        assert photos == [f"IMG_{index:06d}.JPG" for index in range(1234)]
+
+
+class PhotoAlbumProjectionTest(TestCase):
+    """Photo listing projections tests."""
+
+    def test_desired_keys(self):
+        """Tests the fields of the projections."""
+        assert get_desired_keys("full") == list(DESIRED_KEYS)
+        assert "resOriginalRes" in get_desired_keys("originals-only")
+        assert "resJPEGThumbRes" not in get_desired_keys("originals-only")
+        assert "resOriginalRes" not in get_desired_keys("minimal")
+        assert get_desired_keys(["resJPEGThumbRes"]) == list(REQUIRED_KEYS) + [
+            "resJPEGThumbRes"
+        ]
+        with self.assertRaises(ValueError):
+            get_desired_keys("everything")
+
+    def test_server(self):
+        """Tests listing photos with the minimal projection over HTTP."""
+        with MockICloudServer(photo_count=150) as server:
+            api = server.create_service(session_store=MemorySessionStore())
+            album = api.photos.all
+            api.photos.projection = "minimal"
+            photos = list(album)
+            album.projection = "full"
+            assert list(album)[0].versions
+            api.close()
+        assert [photo.filename for photo in photos] == [
+            f"IMG_{index:06d}.JPG" for index in range(150)
+        ]
+        assert photos[0].asset_date.year == 2020
+        assert photos[0].versions == {}
+
+
+class PhotoAssetTest(TestCase):
+    """Photo asset tests."""
+
+    def setUp(self):
+        """Set up a photo."""
+        self.asset_record, self.master_record = photo_records(7, "https://photos", 4096)
+        self.photo = PhotoAsset(None, self.master_record, self.asset_record)
+
+    def test_values(self):
+        """Tests the decoded values, cached on first access."""
+        assert self.photo.id == "master-7"
+        filename = self.photo.filename
+        assert filename == "IMG_000007.JPG"
+        assert self.photo.filename is filename
+        assert self.photo.size == 4096
+        assert self.photo.dimensions == (4032, 3024)
+        assert self.photo.asset_date == datetime(
+            2020, 9, 13, 12, 26, 47, tzinfo=timezone.utc
+        )
+        assert self.photo.created == self.photo.asset_date
+        assert self.photo.added_date == self.photo.asset_date
+        assert set(self.photo.versions) == {"original", "medium", "thumb"}
+        assert self.photo.versions["thumb"] == {
+            "filename": "IMG_000007.JPG",
+            "width": 240,
+            "height": 180,
+            "size": 40,
+            "url": "https://photos/photos/master-7/thumb",
+            "type": "public.jpeg",
+        }
+        versions = self.photo.versions
+        assert self.photo.versions is versions
+        with pytest.raises(TypeError):
+            versions["thumb"]["url"] = None
+
+    def test_compact(self):
+        """Tests dropping the records of a photo."""
+        versions = self.photo.versions
+        assert self.photo.compact() is self.photo
+        assert self.photo.is_compact
+        assert self.photo.filename == "IMG_000007.JPG"
+        assert self.photo.size == 4096
+        assert self.photo.dimensions == (4032, 3024)
+        assert self.photo.asset_date.year == 2020
+        assert self.photo.versions == versions
+        with pytest.raises(AttributeError):
+            setattr(self.photo, "extra", True)
+
+    def test_compact_missing_fields(self):
+        """Tests compacting a photo listed with the minimal projection."""
+        asset_record, master_record = photo_records(
+            7, "https://photos", 4096, set(get_desired_keys("minimal"))
+        )
+        photo = PhotoAsset(None, master_record, asset_record).compact()
+        assert photo.filename == "IMG_000007.JPG"
+        assert photo.size is None
+        assert photo.dimensions is None
+        assert photo.versions == {}
+
+    def test_server(self):
+        """Tests listing compact photos over HTTP."""
+        with MockICloudServer(photo_count=150) as server:
+            api = server.create_service(session_store=MemorySessionStore())
+            album = api.photos.all
+            api.photos.keep_records = False
+            photos = list(album)
+            assert photos[149].download("thumb").raw.read() == bytes(40)
+            api.close()
+        assert all(photo.is_compact for photo in photos)
+        assert photos[149].filename == "IMG_000149.JPG"
+
+
+class PhotoChangesTest(TestCase):
+    """Photo library changes tests."""
+
+    def setUp(self):
+        """Set up a library of 250 photos."""
+        self.server = MockICloudServer(photo_count=250).start()
+        self.addCleanup(self.server.stop)
+        self.api = self.server.create_service(session_store=MemorySessionStore())
+        self.addCleanup(self.api.close)
+
+    def test_changes(self):
+        """Tests syncing the library, then its changes."""
+        photos = self.api.photos
+        assert photos.sync_token is None
+        changes = list(photos.changes(page_size=100))
+        assert [change.photo.filename for change in changes] == [
+            f"IMG_{index:06d}.JPG" for index in range(250)
+        ]
+        assert photos.sync_token == "sync-250"
+
+        self.server.add_photos(2)
+        self.server.update_photo(3)
+        self.server.delete_photo(5)
+        changes = list(photos.changes())
+        assert [change.record_name for change in changes] == [
+            "asset-250",
+            "asset-251",
+            "asset-3",
+            "asset-5",
+            "master-5",
+        ]
+        assert changes[2].photo.filename == "IMG_000003.JPG"
+        assert [change.deleted for change in changes] == [False] * 3 + [True] * 2
+        assert changes[3].photo is None
+        assert any(path.endswith("/records/lookup") for _, path in self.server.requests)
+        assert photos.sync_token == "sync-254"
+        assert not list(photos.changes())
+
+    def test_master_changes(self):
+        """Tests that the changes of a master are reported for its asset."""
+        photos = self.api.photos
+        list(photos.changes())
+        self.server.update_master(7)
+        changes = list(photos.changes())
+        assert [change.record_name for change in changes] == ["asset-7"]
+        assert changes[0].photo.filename == "IMG_000007.JPG"
+        assert photos.sync_token == "sync-251"
+
+    def test_deleted_master(self):
+        """Tests that an asset whose master was deleted since is reported
+        deleted."""
+        photos = self.api.photos
+        list(photos.changes())
+        self.server.update_photo(3)
+        self.server.fail(
+            "/records/lookup",
+            status=200,
+            body={
+                "records": [{"recordName": "master-3", "serverErrorCode": "NOT_FOUND"}]
+            },
+        )
+        changes = list(photos.changes())
+        assert [change.record_name for change in changes] == ["asset-3"]
+        assert changes[0].deleted
+        assert changes[0].photo is None
+
+    def test_failed_lookup(self):
+        """Tests that a failed master lookup raises, keeping the sync
+        token."""
+        photos = self.api.photos
+        list(photos.changes())
+        self.server.update_photo(3)
+        self.server.fail(
+            "/records/lookup",
+            status=200,
+            body={
+                "records": [
+                    {"recordName": "master-3", "serverErrorCode": "INTERNAL_ERROR"}
+                ]
+            },
+        )
+        with self.assertRaises(PyiCloudAPIResponseException):
+            list(photos.changes())
+        assert photos.sync_token == "sync-250"
+        assert [change.record_name for change in photos.changes()] == ["asset-3"]
+
+    def test_resume(self):
+        """Tests resuming an interrupted sync from its last iterated page."""
+        photos = self.api.photos
+        changes = photos.changes(page_size=100)
+        assert len(list(islice(changes, 120))) == 120
+        assert photos.sync_token == "sync-100"
+        assert len(list(photos.changes())) == 150
+
+        photos.sync_token = None
+        assert len(list(photos.changes())) == 250
+
+    def test_compact(self):
+        """Tests syncing compact photos."""
+        self.api.photos.keep_records = False
+        changes = list(self.api.photos.changes())
+        assert all(change.photo.is_compact for change in changes)
+
+    def test_stale_session(self):
+        """Tests that a restored session is validated once the photos
+        database rejects it."""
+        store = MemorySessionStore()
+        self.server.create_service(session_store=store, validate_max_age=60).close()
+        api = self.server.create_service(session_store=store, validate_max_age=60)
+        self.addCleanup(api.close)
+        assert not api.validated
+
+        self.server.fail(
+            "/records/query",
+            status=401,
+            body={"serverErrorCode": "AUTHENTICATION_FAILED", "reason": "Stale"},
+        )
+        assert len(list(api.photos.changes())) == 250
+        assert api.validated
+
+    def test_invalid_token(self):
+        """Tests syncing from an unknown token."""
+        with self.assertRaises(PyiCloudAPIResponseException):
+            list(self.api.photos.changes("invalid"))
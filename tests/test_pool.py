@@ -0,0 +1,168 @@
+"""Account pool tests."""
+from tempfile import TemporaryDirectory
+import threading
+import time
+from unittest import TestCase
+
+import pytest
+
+from pyicloud import base
+from pyicloud.pool import AccountPool
+from pyicloud.ratelimit import ConcurrencyLimiter
+
+from . import PyiCloudServiceMock
+from .const import APPLE_ID_EMAIL, AUTHENTICATED_USER, VALID_PASSWORD
+
+
+class AccountPoolMock(AccountPool):
+    """Account pool of mocked services."""
+
+    service_class = PyiCloudServiceMock
+
+
+class UnauthenticatedServiceMock(PyiCloudServiceMock):
+    """Mocked service of any account, never authenticated."""
+
+    def authenticate(self, force_refresh=False, service=None):
+        """Skips the authentication."""
+
+
+class AccountPoolTest(TestCase):
+    """Account pool tests."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.pool = AccountPoolMock(
+            max_concurrency=4,
+            max_concurrency_per_account=2,
+            cookie_directory=self._directory.name,
+        )
+
+    def tearDown(self):
+        """Tear down tests."""
+        self.pool.close()
+        self._directory.cleanup()
+
+    def test_shared_transport(self):
+        """Tests that the accounts share the pool adapter and limiter."""
+        first = self.pool.add(AUTHENTICATED_USER, VALID_PASSWORD)
+        second = self.pool.add(APPLE_ID_EMAIL, VALID_PASSWORD)
+
+        # pylint: disable=protected-access
+        assert first.session.get_adapter("https://") is self.pool._adapter
+        assert second.session.get_adapter("https://") is self.pool._adapter
+        assert first.session.concurrency_limiter is self.pool.concurrency_limiter
+        assert len(self.pool) == 2
+        assert AUTHENTICATED_USER in self.pool
+        assert self.pool[APPLE_ID_EMAIL] is second
+
+        with pytest.raises(ValueError):
+            self.pool.add(AUTHENTICATED_USER, VALID_PASSWORD)
+
+    def test_override(self):
+        """Tests that the arguments of an account override the pool ones."""
+        limiter = ConcurrencyLimiter(1)
+        service = self.pool.add(
+            AUTHENTICATED_USER, VALID_PASSWORD, concurrency_limiter=limiter
+        )
+        assert service.session.concurrency_limiter is limiter
+
+    def test_submit_all(self):
+        """Tests that functions run for every account."""
+        self.pool.add(AUTHENTICATED_USER, VALID_PASSWORD)
+        self.pool.add(APPLE_ID_EMAIL, VALID_PASSWORD)
+
+        futures = self.pool.submit_all(lambda api: api.user["accountName"])
+
+        results = {apple_id: future.result() for apple_id, future in futures.items()}
+        assert results == {
+            AUTHENTICATED_USER: AUTHENTICATED_USER,
+            APPLE_ID_EMAIL: APPLE_ID_EMAIL,
+        }
+
+    def test_no_leaks(self):
+        """Tests that removed and closed accounts stop hiding their password,
+        and leave the shared filter and connections in place."""
+        # pylint: disable=protected-access
+        counts = base.PASSWORD_FILTER._counts
+        request_logger = base.logging.getLogger("pyicloud.base.http")
+        filters = len(base.LOGGER.filters), len(request_logger.filters)
+        hidden = counts.get(VALID_PASSWORD, 0)
+
+        self.pool.add(AUTHENTICATED_USER, VALID_PASSWORD)
+        service = self.pool.add(APPLE_ID_EMAIL, VALID_PASSWORD)
+        assert counts[VALID_PASSWORD] == hidden + 2
+
+        self.pool.remove(APPLE_ID_EMAIL)
+        assert not service.session.adapters
+        assert counts[VALID_PASSWORD] == hidden + 1
+
+        with self.pool.concurrency_limiter.limit(AUTHENTICATED_USER):
+            pass
+        limiter_keys = self.pool.concurrency_limiter._key_semaphores
+        assert list(limiter_keys) == [AUTHENTICATED_USER]
+        self.pool.close()
+        assert len(self.pool) == 0
+        assert not limiter_keys
+        assert counts.get(VALID_PASSWORD, 0) == hidden
+        assert (len(base.LOGGER.filters), len(request_logger.filters)) == filters
+        with pytest.raises(RuntimeError):
+            self.pool.add(AUTHENTICATED_USER, VALID_PASSWORD)
+
+    def test_many_accounts(self):
+        """Tests that the accounts of a large pool share the password filter,
+        and still log."""
+        self.pool.service_class = UnauthenticatedServiceMock
+        request_logger = base.logging.getLogger("pyicloud.base.http")
+        for index in range(1000):
+            self.pool.add(f"user{index}@apple.com", f"password-{index:03d}")
+        for logger in (base.LOGGER, request_logger):
+            assert logger.filters == [base.PASSWORD_FILTER]
+
+        with self.assertLogs(base.LOGGER, base.logging.INFO) as logs:
+            base.LOGGER.info("password-000 %s", "password-999")
+        assert logs.records[0].getMessage() == "******** ********"
+
+        self.pool.remove("user0@apple.com")
+        self.pool.close()
+        assert not any(
+            password.startswith("password-")
+            for password in base.PASSWORD_FILTER.passwords
+        )
+
+
+class ConcurrencyLimiterTest(TestCase):
+    """Concurrency limiter tests."""
+
+    def _max_in_flight(self, limiter, keys):
+        lock = threading.Lock()
+        in_flight = {"total": 0, "max": 0}
+        in_flight_by_key = {key: 0 for key in keys}
+        max_by_key = dict(in_flight_by_key)
+
+        def request(key):
+            with limiter.limit(key):
+                with lock:
+                    in_flight["total"] += 1
+                    in_flight_by_key[key] += 1
+                    in_flight["max"] = max(in_flight["max"], in_flight["total"])
+                    max_by_key[key] = max(max_by_key[key], in_flight_by_key[key])
+                time.sleep(0.01)
+                with lock:
+                    in_flight["total"] -= 1
+                    in_flight_by_key[key] -= 1
+
+        threads = [threading.Thread(target=request, args=(key,)) for key in keys * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return in_flight["max"], max(max_by_key.values())
+
+    def test_limits(self):
+        """Tests that requests are bounded in total and by key."""
+        keys = ["a", "b", "c", "d"]
+        assert self._max_in_flight(ConcurrencyLimiter(3, 2), keys)[0] <= 3
+        assert self._max_in_flight(ConcurrencyLimiter(None, 1), keys)[1] == 1
+        assert self._max_in_flight(ConcurrencyLimiter(), keys)[0] > 3
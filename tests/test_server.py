@@ -0,0 +1,83 @@
+"""Mock iCloud server tests."""
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pytest
+
+from pyicloud.exceptions import PyiCloudFailedLoginException
+from pyicloud.retry import RetryPolicy
+
+from .server import MockICloudServer
+
+
+class MockICloudServerTest(TestCase):
+    """End to end tests, against the mock iCloud server."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.server = MockICloudServer(photo_count=250, drive_item_count=10).start()
+
+    def tearDown(self):
+        """Tear down tests."""
+        self.server.stop()
+        self._directory.cleanup()
+
+    def _service(self, **kwargs):
+        return self.server.create_service(
+            cookie_directory=self._directory.name, **kwargs
+        )
+
+    def test_services(self):
+        """Tests the services, served over HTTP."""
+        with self._service() as api:
+            assert len(api.devices.keys()) > 0
+            assert len(api.drive.dir()) > 10
+            document = api.drive["pyiCloud"]["Test"]["Scanned document 1.pdf"]
+            assert document.open().content
+            assert len(api.account.devices) > 0
+            assert api.reminders.lists == {}
+
+    def test_photos(self):
+        """Tests paging through the synthetic photo library."""
+        with self._service() as api:
+            photos = list(api.photos.all)
+            assert len(api.photos.all) == len(photos) == 250
+            assert photos[0].filename == "IMG_000000.JPG"
+            assert "Album 1" in api.photos.albums
+            assert len(photos[-1].download().content) == self.server.photo_size
+
+    def test_failures(self):
+        """Tests that injected errors are retried."""
+        retry_policy = RetryPolicy(backoff_factor=0, jitter=0)
+        with self._service(retry_policy=retry_policy) as api:
+            self.server.fail("/refreshClient", 503, count=2)
+            assert len(api.devices.keys()) > 0
+            assert retry_policy.counters["retries"] == 2
+
+    def test_expired_session(self):
+        """Tests that expired sessions authenticate again."""
+        with self._service() as api:
+            self.server.expire_sessions()
+            api.invalidate_services()
+            assert len(api.devices.keys()) > 0
+
+        logins = [path for _, path in self.server.requests if "accountLogin" in path]
+        assert len(logins) == 2
+
+    def test_service_created_once(self):
+        """Tests that threads accessing a service create it once."""
+        self.server.latency = 0.01
+        with self._service() as api:
+            with ThreadPoolExecutor(8) as executor:
+                managers = list(executor.map(lambda _: api.devices, range(8)))
+
+        assert all(manager is managers[0] for manager in managers)
+        refreshes = [path for _, path in self.server.requests if "refresh" in path]
+        assert len(refreshes) == 1
+
+    def test_invalid_password(self):
+        """Tests that invalid credentials are refused."""
+        with pytest.raises(PyiCloudFailedLoginException):
+            self._service(password="invalid")
@@ -0,0 +1,749 @@
+"""Session tests."""
+from concurrent.futures import ThreadPoolExecutor
+import http.cookiejar as cookielib
+import json
+import logging
+import os
+import socket
+from tempfile import TemporaryDirectory
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import Request, Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from pyicloud.base import PASSWORD_FILTER, PyiCloudPasswordFilter, PyiCloudSession
+from pyicloud.cache import ResponseCache
+from pyicloud.codec import CODECS, JSONCodec, get_codec
+from pyicloud.exceptions import PyiCloudAPIResponseException
+from pyicloud.instrumentation import LatencyHistogram, RequestEvent, get_endpoint
+from pyicloud.ratelimit import RateLimiter, TokenBucket
+from pyicloud.retry import RetryPolicy
+from pyicloud.store import FileSessionStore
+from pyicloud.transport import PyiCloudHTTPAdapter, TimeoutConfig, TransportConfig
+
+from . import AdapterMock
+from .const_findmyiphone import FMI_FAMILY_WORKING
+
+
+class ServiceStub:
+    """Minimal service the session depends on."""
+
+    AUTH_ENDPOINT = "https://idmsa.apple.com/appleauth/auth"
+    SETUP_ENDPOINT = "https://setup.icloud.com/setup/ws/1"
+
+    def __init__(self, directory, password="password"):
+        self.password_filter = PASSWORD_FILTER
+        self.password_filter.add_password(password)
+        self.password = password
+        self.requires_2sa = False
+        self.validated = True
+        self.authenticated = True
+        self.authentications = 0
+        self.user = {"accountName": "user"}
+        self.session_data = {"client_id": "client"}
+        self.session_store = FileSessionStore(directory)
+        self.session_path = os.path.join(directory, "user.session")
+        self.cookiejar_path = os.path.join(directory, "user")
+        self._webservices = {
+            "findme": {"url": "https://p31-fmipweb.icloud.com:443"},
+            "drivews": {"url": "https://p31-drivews.icloud.com:443"},
+        }
+
+    def authenticate(self, force_refresh=False, service=None):
+        """Authenticates the account."""
+
+    def _get_webservice_url(self, ws_key):
+        return self._webservices[ws_key]["url"]
+
+
+class SessionTestCase(TestCase):
+    """Base class of session tests."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.service = ServiceStub(self._directory.name)
+
+    def tearDown(self):
+        """Tear down tests."""
+        PASSWORD_FILTER.remove_password(self.service.password)
+        self._directory.cleanup()
+
+    def _session(self, **kwargs):
+        session = PyiCloudSession(self.service, **kwargs)
+        session.cookies = cookielib.LWPCookieJar(self.service.cookiejar_path)
+        return session
+
+
+class SessionPersistenceTest(SessionTestCase):
+    """Session persistence tests."""
+
+    def _read_session_data(self):
+        with open(self.service.session_path, encoding="utf-8") as session_f:
+            return json.load(session_f)
+
+    def test_persist_only_when_changed(self):
+        """Tests that unchanged state is not written again."""
+        session = self._session()
+        session.persist()
+        assert self._read_session_data() == {"client_id": "client"}
+        assert os.path.exists(self.service.cookiejar_path)
+
+        with patch("pyicloud.store._atomic_write") as atomic_write:
+            session.persist()
+            atomic_write.assert_not_called()
+
+            self.service.session_data["scnt"] = "scnt"
+            session.persist()
+            atomic_write.assert_called_once()
+
+    def test_persist_interval(self):
+        """Tests that writes are coalesced over the persist interval."""
+        session = self._session(persist_interval=3600)
+        session.persist()
+
+        self.service.session_data["session_token"] = "token"
+        session.persist()
+        assert "session_token" not in self._read_session_data()
+
+        session.close()
+        assert self._read_session_data()["session_token"] == "token"
+        assert sorted(os.listdir(self._directory.name)) == ["user", "user.session"]
+
+
+class SessionRequestTest(SessionTestCase):
+    """Session request tests."""
+
+    def test_request_logger(self):
+        """Tests that requests are logged to the calling module logger."""
+        session = self._session()
+        adapter = AdapterMock(({"ok": True}, 200, {"scnt": "scnt"}))
+        session.mount("https://", adapter)
+
+        with patch("inspect.stack", side_effect=AssertionError):
+            with self.assertLogs(f"{__name__}.http", "DEBUG") as logs:
+                response = session.get("https://example.com/path")
+
+        assert response.json() == {"ok": True}
+        assert self.service.session_data["scnt"] == "scnt"
+        assert "GET https://example.com/path" in logs.output[0]
+
+    def test_lazy_validation(self):
+        """Tests that restored account data is validated on first failure."""
+        self.service.validated = False
+        self.service.authenticate = MagicMock()
+        session = self._session()
+        session.mount_transport(
+            AdapterMock(({"error": "Gone"}, 421, {}), ({"ok": True}, 200, {}))
+        )
+
+        response = session.post("https://p31-drivews.icloud.com:443/retrieveItems")
+
+        assert response.json() == {"ok": True}
+        self.service.authenticate.assert_called_once_with()
+
+    def test_authentication_failed(self):
+        """Tests that restored account data is validated when a service
+        reports an authentication failure, once."""
+        self.service.validated = False
+        self.service.authenticate = MagicMock()
+        session = self._session()
+        failure = {"serverErrorCode": "AUTHENTICATION_FAILED", "reason": "Stale"}
+        session.mount_transport(AdapterMock((failure, 200, {}), (failure, 200, {})))
+
+        with pytest.raises(PyiCloudAPIResponseException):
+            session.post("https://p31-ckdatabasews.icloud.com:443/records/query")
+        self.service.authenticate.assert_called_once_with()
+
+        session.mount_transport(AdapterMock((failure, 401, {}), ({}, 200, {})))
+        session.post("https://p31-ckdatabasews.icloud.com:443/records/query")
+        assert self.service.authenticate.call_count == 2
+
+
+class PasswordFilterTest(SessionTestCase):
+    """Password filter tests."""
+
+    def test_lazy_redaction(self):
+        """Tests that messages are only formatted when emitted."""
+        to_str = MagicMock(return_value="secret: password")
+        payload = MagicMock()
+        payload.__str__ = to_str
+        record = logging.LogRecord(
+            "pyicloud", logging.DEBUG, __file__, 1, "%s", (payload,), None
+        )
+
+        assert self.service.password_filter.filter(record)
+        to_str.assert_not_called()
+
+        assert record.getMessage() == "secret: ********"
+        assert record.getMessage() == "secret: ********"
+        to_str.assert_called_once()
+
+    def test_nested_filters(self):
+        """Tests that filters hide their passwords in a single message."""
+        record = logging.LogRecord(
+            "pyicloud", logging.DEBUG, __file__, 1, "%s and %s", ("pw1", "pw2"), None
+        )
+        filters = [PyiCloudPasswordFilter(password) for password in ("pw1", "pw2")]
+        for password_filter in filters * 100:
+            assert password_filter.filter(record)
+
+        assert record.getMessage() == "******** and ********"
+        assert record.msg.passwords == ("pw1", "pw2")
+
+    def test_many_services(self):
+        """Tests that the services of many accounts share a single filter."""
+        services = [
+            ServiceStub(self._directory.name, f"password-{index:04d}")
+            for index in range(2000)
+        ]
+        try:
+            for service in services:
+                PyiCloudSession(service)
+            request_logger = logging.getLogger("pyicloud.base.http")
+            assert request_logger.filters.count(PASSWORD_FILTER) == 1
+
+            with self.assertLogs(request_logger, logging.DEBUG) as logs:
+                request_logger.debug("password-1999 %s", "password-0000")
+            assert logs.records[0].getMessage() == "******** ********"
+        finally:
+            for service in services:
+                PASSWORD_FILTER.remove_password(service.password)
+        assert "password-0000" not in PASSWORD_FILTER.passwords
+
+    def test_filter_attached_once(self):
+        """Tests that the service loggers get the filter at construction."""
+        self._session()
+        for module_name in ("pyicloud.base", "pyicloud.services.photos"):
+            request_logger = logging.getLogger(f"{module_name}.http")
+            assert request_logger.filters.count(self.service.password_filter) == 1
+
+
+class SessionTransportTest(SessionTestCase):
+    """Session transport tests."""
+
+    def test_default_transport(self):
+        """Tests that a tuned adapter is mounted by default."""
+        session = self._session()
+        adapter = session.get_adapter("https://setup.icloud.com")
+        assert isinstance(adapter, PyiCloudHTTPAdapter)
+        assert session.get_adapter("http://example.com") is adapter
+
+        pool_kwargs = adapter.poolmanager.connection_pool_kw
+        assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in pool_kwargs[
+            "socket_options"
+        ]
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool_kwargs[
+            "socket_options"
+        ]
+
+    def test_transport_config(self):
+        """Tests that the pools follow the transport configuration."""
+        transport = TransportConfig(
+            pool_connections=4,
+            pool_maxsize=32,
+            pool_block=True,
+            keep_alive=False,
+            tcp_nodelay=False,
+        )
+        session = self._session(transport=transport)
+        adapter = session.get_adapter("https://p31-drivews.icloud.com")
+        pool = adapter.poolmanager.connection_from_url("https://p31-drivews.icloud.com")
+
+        assert adapter._pool_connections == 4  # pylint: disable=protected-access
+        assert pool.pool.maxsize == 32
+        assert pool.block
+        assert adapter.poolmanager.connection_pool_kw["socket_options"] == []
+
+        request = session.prepare_request(Request("GET", "https://example.com"))
+        adapter.add_headers(request)
+        assert request.headers["Connection"] == "close"
+
+    def test_shared_adapter(self):
+        """Tests that sessions can share an adapter and its connections."""
+        session = self._session()
+        other_session = self._session()
+        other_session.mount_transport(session.get_adapter("https://"))
+        assert other_session.get_adapter("https://example.com") is (
+            session.get_adapter("https://example.com")
+        )
+
+
+class SessionTimeoutTest(SessionTestCase):
+    """Session timeout tests."""
+
+    def test_endpoint_service(self):
+        """Tests the resolution of the service of a URL."""
+        # pylint: disable=protected-access
+        service_of = self._session()._get_endpoint_service
+        assert service_of("https://p31-fmipweb.icloud.com:443/fmipservice") == "findme"
+        assert service_of("https://setup.icloud.com/setup/ws/1/validate") == "setup"
+        assert service_of("https://idmsa.apple.com/appleauth/auth/signin") == "auth"
+        assert service_of("https://cvws.icloud-content.com") is None
+
+    def test_timeouts(self):
+        """Tests that timeouts are set by service, unless given."""
+        session = self._session(
+            timeouts=TimeoutConfig(connect=3, read=30, stream_read=600)
+        )
+        adapter = AdapterMock(*[({}, 200, {})] * 4)
+        session.mount_transport(adapter)
+
+        session.post("https://p31-drivews.icloud.com:443/retrieveItemDetails")
+        session.post("https://p31-fmipweb.icloud.com:443/fmipservice/refreshClient")
+        session.get("https://cvws.icloud-content.com/B/photo", stream=True)
+        session.get("https://p31-drivews.icloud.com:443/items", timeout=1)
+
+        assert adapter.timeouts == [(3, 30), (5, 20), (3, 600), 1]
+
+
+class SessionRetryTest(SessionTestCase):
+    """Session retry tests."""
+
+    def setUp(self):
+        """Set up tests."""
+        super().setUp()
+        self.delays = []
+
+    def _retry_session(self, *responses, **kwargs):
+        retry_policy = RetryPolicy(**kwargs)
+        retry_policy.sleep = self.delays.append
+        session = self._session(retry_policy=retry_policy)
+        adapter = AdapterMock(*responses)
+        session.mount_transport(adapter)
+        return session, adapter
+
+    def test_backoff(self):
+        """Tests that unavailable services are retried after a backoff."""
+        session, adapter = self._retry_session(
+            ({"error": "Unavailable"}, 503, {}),
+            ({"error": "Unavailable"}, 503, {}),
+            ({"ok": True}, 200, {}),
+            backoff_factor=1,
+            jitter=0.5,
+        )
+
+        response = session.post("https://p31-drivews.icloud.com:443/retrieveItems")
+
+        assert response.json() == {"ok": True}
+        assert len(adapter.requests) == 3
+        assert 0.5 <= self.delays[0] <= 1
+        assert 1 <= self.delays[1] <= 2
+        assert session.retry_policy.counters["retries"] == 2
+
+    def test_retry_after(self):
+        """Tests that the Retry-After header is honoured."""
+        session, _ = self._retry_session(
+            ({"error": "Too many requests"}, 429, {"Retry-After": "7"}),
+            ({"ok": True}, 200, {}),
+        )
+
+        session.get("https://p31-drivews.icloud.com:443/items")
+
+        assert self.delays == [7.0]
+        assert session.retry_policy.counters["retry_after"] == 1
+
+    def test_close_retried(self):
+        """Tests that the responses of retried requests are closed."""
+        session, _ = self._retry_session(
+            ({"error": "Unavailable"}, 503, {}),
+            ({"errorCode": "ACCESS_DENIED", "reason": "Access denied"}, 200, {}),
+            ({"ok": True}, 200, {}),
+        )
+
+        with patch.object(Response, "close", autospec=True) as close:
+            response = session.get("https://p31-drivews.icloud.com:443/items")
+
+        assert [call.args[0].status_code for call in close.call_args_list] == [
+            503,
+            200,
+        ]
+        assert close.call_args_list[1].args[0] is not response
+
+    def test_throttling(self):
+        """Tests that Apple throttling errors are retried."""
+        session, adapter = self._retry_session(
+            ({"errorCode": "ACCESS_DENIED", "reason": "Access denied"}, 200, {}),
+            ({"ok": True}, 200, {}),
+        )
+
+        assert session.get("https://example.com/path").json() == {"ok": True}
+        assert len(adapter.requests) == 2
+
+    def test_exhausted(self):
+        """Tests that the error is raised once attempts are exhausted."""
+        session, adapter = self._retry_session(
+            *[({"error": "Unavailable"}, 503, {})] * 2, max_attempts=2
+        )
+
+        with pytest.raises(PyiCloudAPIResponseException, match="Unavailable"):
+            session.get("https://example.com/path")
+        assert len(adapter.requests) == 2
+        assert session.retry_policy.counters["exhausted"] == 1
+
+    def test_not_idempotent(self):
+        """Tests that requests changing the account are not retried."""
+        session, adapter = self._retry_session(({"error": "Unavailable"}, 503, {}))
+
+        with pytest.raises(PyiCloudAPIResponseException, match="Unavailable"):
+            session.post("https://p31-ckdatabasews.icloud.com:443/records/modify")
+        assert len(adapter.requests) == 1
+        assert not self.delays
+        assert session.retry_policy.counters["not_idempotent"] == 1
+
+    def test_connection_error(self):
+        """Tests that connection errors are retried."""
+        session, adapter = self._retry_session(
+            (RequestsConnectionError("Connection reset"), None, None),
+            ({"ok": True}, 200, {}),
+        )
+
+        assert session.get("https://example.com/path").json() == {"ok": True}
+        assert len(adapter.requests) == 2
+
+
+class SessionRateLimitTest(SessionTestCase):
+    """Session rate limit tests."""
+
+    def test_token_bucket(self):
+        """Tests that requests over the burst wait for tokens."""
+        bucket = TokenBucket(10, burst=2)
+        delays = [bucket.reserve() for _ in range(4)]
+        assert delays[:2] == [0, 0]
+        assert 0.09 < delays[2] <= 0.1
+        assert 0.19 < delays[3] <= 0.2
+
+    def test_rate_limit(self):
+        """Tests that requests are limited by service."""
+        rate_limiter = RateLimiter({"drivews": (1, 1)})
+        session = self._session(rate_limiter=rate_limiter)
+        session.mount_transport(AdapterMock(*[({}, 200, {})] * 4))
+
+        with patch("pyicloud.ratelimit.time.sleep") as sleep:
+            session.post("https://p31-drivews.icloud.com:443/retrieveItemDetails")
+            session.post("https://p31-fmipweb.icloud.com:443/fmipservice/refreshClient")
+            session.post("https://p31-fmipweb.icloud.com:443/fmipservice/refreshClient")
+            sleep.assert_not_called()
+
+            session.post("https://p31-drivews.icloud.com:443/retrieveItemDetails")
+            sleep.assert_called_once()
+            assert 0.9 < sleep.call_args[0][0] <= 1
+
+        counters = rate_limiter.counters
+        assert counters["requests"] == 4
+        assert counters["delayed"] == 1
+
+
+class CountingCodec(JSONCodec):
+    """Codec counting the parsed documents."""
+
+    def __init__(self):
+        self.loaded = 0
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+class SessionCodecTest(SessionTestCase):
+    """Session JSON codec tests."""
+
+    def test_codecs(self):
+        """Tests that the installed codecs agree with the standard library."""
+        assert get_codec() is get_codec()
+        assert isinstance(get_codec("json"), JSONCodec)
+        installed = []
+        for name in CODECS:
+            try:
+                codec = get_codec(name)
+            except ImportError:
+                continue
+            installed.append(name)
+            encoded = codec.dumps(FMI_FAMILY_WORKING)
+            assert isinstance(encoded, str)
+            assert codec.loads(encoded) == FMI_FAMILY_WORKING
+            assert codec.loads(encoded.encode()) == FMI_FAMILY_WORKING
+        # The fastest installed codec, by default
+        assert get_codec().name == installed[0]
+
+    def test_response_parsed_once(self):
+        """Tests that responses are parsed once, with the session codec."""
+        codec = CountingCodec()
+        session = self._session(codec=codec)
+        session.mount_transport(AdapterMock(({"content": [1, 2]}, 200, {})))
+
+        response = session.post("https://p31-fmipweb.icloud.com:443/refreshClient")
+
+        assert response.json() == {"content": [1, 2]}
+        assert response.json() is response.json()
+        assert codec.loaded == 1
+
+
+class SessionInstrumentationTest(SessionTestCase):
+    """Session instrumentation tests."""
+
+    def test_endpoint(self):
+        """Tests that identifiers are removed from endpoints."""
+        assert get_endpoint("https://p31-drivews.icloud.com:443") == "/"
+        assert (
+            get_endpoint(
+                "https://p31-ckdatabasews.icloud.com:443/database/1/com.apple.photos"
+                ".cloud/production/private/records/query?remapEnums=true"
+            )
+            == "/database/*/com.apple.photos.cloud/production/private/records/query"
+        )
+
+    def test_listener(self):
+        """Tests that listeners receive an event per request."""
+        events = []
+        retry_policy = RetryPolicy()
+        retry_policy.sleep = lambda seconds: None
+        session = self._session(retry_policy=retry_policy, listeners=[events.append])
+        session.mount_transport(
+            AdapterMock(
+                ({"error": "Unavailable"}, 503, {}),
+                ({"content": [1, 2]}, 200, {}),
+            )
+        )
+
+        session.post(
+            "https://p31-fmipweb.icloud.com:443/fmipservice/client/web/refreshClient",
+            data='{"clientContext": {}}',
+        )
+
+        assert len(events) == 1
+        event = events[0]
+        assert event.service == "findme"
+        assert event.endpoint == "/fmipservice/client/web/refreshClient"
+        assert event.method == "POST"
+        assert event.status_code == 200
+        assert event.retries == 1
+        assert event.bytes_sent == len('{"clientContext": {}}')
+        assert event.bytes_received == len(json.dumps({"content": [1, 2]}))
+        assert event.latency > 0
+        assert event.error is None
+
+    def test_listener_error(self):
+        """Tests that failing listeners do not fail requests, and that failed
+        requests are reported."""
+        events = []
+
+        def failing_listener(event):
+            raise ValueError(event)
+
+        session = self._session(
+            retry_policy=RetryPolicy(max_attempts=1),
+            listeners=[failing_listener, events.append],
+        )
+        session.mount_transport(
+            AdapterMock(
+                ({"ok": True}, 200, {}),
+                (RequestsConnectionError("Connection reset"), None, None),
+            )
+        )
+
+        assert session.get("https://example.com/path/42").json() == {"ok": True}
+        with pytest.raises(RequestsConnectionError):
+            session.get("https://example.com/path/42")
+
+        assert [event.service for event in events] == ["example.com"] * 2
+        assert events[0].endpoint == "/path/*"
+        assert isinstance(events[1].error, RequestsConnectionError)
+        assert events[1].status_code is None
+
+    def test_histogram(self):
+        """Tests the latency histogram."""
+        histogram = LatencyHistogram()
+        for latency in (0.003, 0.02, 0.02, 0.2, 1.5):
+            event = RequestEvent("drivews", "post", "https://host/retrieveItems")
+            event.finish(200, 10, 100)
+            event.latency = latency
+            histogram(event)
+        event = RequestEvent("drivews", "post", "https://host/retrieveItems")
+        event.finish(error=RequestsConnectionError())
+        event.latency = 0.02
+        histogram(event)
+
+        stats = histogram.snapshot()[("drivews", "/retrieveItems", "POST")]
+        assert stats["count"] == 6
+        assert stats["errors"] == 1
+        assert stats["bytes_received"] == 500
+        assert stats["statuses"] == {200: 5, None: 1}
+        assert stats["min"] == 0.003
+        assert stats["max"] == 1.5
+        assert stats["p50"] == 0.025
+        assert stats["p90"] == 1.5
+        assert stats["p99"] == 1.5
+
+        histogram.reset()
+        assert not histogram.snapshot()
+
+
+class ReauthenticationAdapter(AdapterMock):
+    """Adapter answering 421 until the service re-authenticated, once all
+    the threads sent their first request."""
+
+    def __init__(self, service, threads):
+        super().__init__()
+        self.service = service
+        self.barrier = threading.Barrier(threads)
+
+    def send(self, request, **kwargs):
+        if self.service.authenticated:
+            self.responses.append(({"ok": True}, 200, {}))
+        else:
+            self.barrier.wait(timeout=5)
+            self.responses.append(({"error": "Misdirected"}, 421, {}))
+        return super().send(request, **kwargs)
+
+
+class SessionThreadingTest(SessionTestCase):
+    """Tests of sessions shared by threads."""
+
+    def test_single_flight_reauthentication(self):
+        """Tests that concurrent requests failing on an expired session
+        re-authenticate once, then replay."""
+        threads = 8
+        self.service.authenticated = False
+
+        def authenticate(force_refresh=False, service=None):
+            assert force_refresh and service == "find"
+            time.sleep(0.05)
+            self.service.authentications += 1
+            self.service.authenticated = True
+
+        self.service.authenticate = authenticate
+        session = self._session()
+        session.mount_transport(ReauthenticationAdapter(self.service, threads))
+
+        url = "https://p31-fmipweb.icloud.com:443/fmipservice/client/web/refreshClient"
+        with ThreadPoolExecutor(threads) as executor:
+            responses = list(executor.map(lambda _: session.post(url), range(threads)))
+
+        assert [response.json() for response in responses] == [{"ok": True}] * threads
+        assert self.service.authentications == 1
+
+
+class SlowAdapter(AdapterMock):
+    """Adapter answering slowly, so that requests overlap."""
+
+    def send(self, request, **kwargs):
+        self.responses.append(({"content": [1, 2]}, 200, {}))
+        time.sleep(0.05)
+        return super().send(request, **kwargs)
+
+
+class SessionCoalescingTest(SessionTestCase):
+    """Request coalescing tests."""
+
+    def _concurrent_posts(self, session, urls, data):
+        with ThreadPoolExecutor(len(urls)) as executor:
+            return list(executor.map(lambda args: session.post(*args), zip(urls, data)))
+
+    def test_coalesce(self):
+        """Tests that identical concurrent reads share a response."""
+        session = self._session(coalesce_requests=True)
+        adapter = SlowAdapter()
+        session.mount_transport(adapter)
+
+        url = "https://p31-fmipweb.icloud.com:443/fmipservice/client/web/refreshClient"
+        responses = self._concurrent_posts(session, [url] * 8, ['{"a": 1}'] * 8)
+
+        assert len(adapter.requests) == 1
+        assert session.coalesced_requests == 7
+        assert all(response is responses[0] for response in responses)
+        assert responses[0].json() == {"content": [1, 2]}
+
+    def test_not_coalesced(self):
+        """Tests that different requests and writes are all sent."""
+        session = self._session(coalesce_requests=True)
+        adapter = SlowAdapter()
+        session.mount_transport(adapter)
+
+        url = "https://p31-fmipweb.icloud.com:443/fmipservice/client/web"
+        self._concurrent_posts(
+            session,
+            [f"{url}/refreshClient"] * 2 + [f"{url}/playSound"] * 2,
+            ['{"a": 1}', '{"a": 2}', '{"a": 1}', '{"a": 1}'],
+        )
+
+        assert len(adapter.requests) == 4
+        assert session.coalesced_requests == 0
+
+    def test_disabled(self):
+        """Tests that requests are not coalesced by default."""
+        session = self._session()
+        adapter = SlowAdapter()
+        session.mount_transport(adapter)
+
+        url = "https://p31-fmipweb.icloud.com:443/fmipservice/client/web/refreshClient"
+        self._concurrent_posts(session, [url] * 4, ["{}"] * 4)
+
+        assert len(adapter.requests) == 4
+
+
+class SessionCacheTest(SessionTestCase):
+    """Response cache tests."""
+
+    url = "https://p31-drivews.icloud.com:443/retrieveItemDetailsInFolders"
+
+    def test_fresh(self):
+        """Tests that fresh responses are served without a request."""
+        cache = ResponseCache(rules={"/retrieveItemDetailsInFolders": 60})
+        events = []
+        session = self._session(response_cache=cache, listeners=[events.append])
+        adapter = AdapterMock(({"items": [1]}, 200, {}), ({"items": [2]}, 200, {}))
+        session.mount_transport(adapter)
+
+        first = session.post(self.url, data='{"drivewsid": "root"}')
+        second = session.post(self.url, data='{"drivewsid": "root"}')
+        other = session.post(self.url, data='{"drivewsid": "other"}')
+
+        assert len(adapter.requests) == 2
+        assert [event.cached for event in events] == [False, True, False]
+        assert events[1].status_code == 200
+        assert events[1].bytes_received == len(second.content)
+        assert not first.from_cache and second.from_cache
+        assert second.json() == {"items": [1]}
+        assert other.json() == {"items": [2]}
+        assert cache.counters["hits"] == 1
+        assert cache.counters["misses"] == 2
+
+    def test_revalidate(self):
+        """Tests that stale responses are revalidated with their ETag."""
+        cache = ResponseCache(rules={"/retrieveItemDetailsInFolders": 0})
+        session = self._session(response_cache=cache)
+        adapter = AdapterMock(
+            ({"items": [1]}, 200, {"ETag": '"1"'}), (None, 304, {"ETag": '"1"'})
+        )
+        session.mount_transport(adapter)
+
+        session.post(self.url)
+        response = session.post(self.url)
+
+        assert adapter.requests[1].headers["If-None-Match"] == '"1"'
+        assert response.from_cache
+        assert response.status_code == 200
+        assert response.json() == {"items": [1]}
+        assert cache.counters["revalidated"] == 1
+
+    def test_write_invalidates(self):
+        """Tests that writes drop the cached responses of the account."""
+        cache = ResponseCache(rules={"/retrieveItemDetailsInFolders": 60})
+        session = self._session(response_cache=cache)
+        adapter = AdapterMock(
+            ({"items": [1]}, 200, {}), ({}, 200, {}), ({"items": [2]}, 200, {})
+        )
+        session.mount_transport(adapter)
+
+        session.post(self.url)
+        session.post("https://p31-drivews.icloud.com:443/renameItems")
+        response = session.post(self.url)
+
+        assert not response.from_cache
+        assert response.json() == {"items": [2]}
+        assert cache.counters["invalidated"] == 1
@@ -0,0 +1,163 @@
+"""Session store tests."""
+import http.cookiejar as cookielib
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+import threading
+from unittest import TestCase
+
+import pytest
+
+from pyicloud.store import FileSessionStore, MemorySessionStore, SQLiteSessionStore
+
+from . import PyiCloudServiceMock
+from .const import AUTHENTICATED_USER, VALID_PASSWORD
+
+ACCOUNT = "jappleseed@apple.com"
+
+
+def _cookie(name, value):
+    return cookielib.Cookie(
+        0,
+        name,
+        value,
+        None,
+        False,
+        ".icloud.com",
+        True,
+        True,
+        "/",
+        True,
+        True,
+        2000000000,
+        False,
+        None,
+        None,
+        {"HttpOnly": None},
+    )
+
+
+class SessionStoreTest(TestCase):
+    """Session store tests."""
+
+    def setUp(self):
+        """Set up tests."""
+        self._directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        """Tear down tests."""
+        self._directory.cleanup()
+
+    def _stores(self):
+        sqlite_store = SQLiteSessionStore(
+            os.path.join(self._directory.name, "sessions.db")
+        )
+        self.addCleanup(sqlite_store.close)
+        return (
+            FileSessionStore(os.path.join(self._directory.name, "files")),
+            MemorySessionStore(),
+            sqlite_store,
+        )
+
+    def test_documents(self):
+        """Tests that the stores save and load the account documents."""
+        for store in self._stores():
+            assert store.load_session_data(ACCOUNT) is None
+            assert store.load_account_data(ACCOUNT) is None
+            assert store.load_sync_tokens(ACCOUNT) == {}
+
+            store.save_session_data(ACCOUNT, {"session_token": "token"})
+            store.save_session_data(ACCOUNT, {"session_token": "token 2"})
+            store.save_account_data(ACCOUNT, {"data": {"dsInfo": {}}})
+            store.save_sync_tokens(ACCOUNT, {"photos": "sync"})
+            store.save_session_data("other@apple.com", {"session_token": "other"})
+
+            assert store.load_session_data(ACCOUNT) == {"session_token": "token 2"}
+            assert store.load_account_data(ACCOUNT) == {"data": {"dsInfo": {}}}
+            assert store.load_sync_tokens(ACCOUNT) == {"photos": "sync"}
+
+            store.delete(ACCOUNT)
+            assert store.load_session_data(ACCOUNT) is None
+            assert store.load_account_data(ACCOUNT) is None
+            assert store.load_sync_tokens(ACCOUNT) == {}
+            assert store.load_session_data("other@apple.com") == {
+                "session_token": "other"
+            }
+
+    def test_cookies(self):
+        """Tests that the stores save and load cookies."""
+        for store in self._stores():
+            cookies = cookielib.LWPCookieJar()
+            assert not store.load_cookies(ACCOUNT, cookies)
+
+            cookies.set_cookie(_cookie("X-APPLE-WEBAUTH-TOKEN", "token"))
+            cookies.set_cookie(_cookie("X-APPLE-DS-WEB-SESSION-TOKEN", "session"))
+            store.save_cookies(ACCOUNT, cookies)
+
+            loaded = cookielib.LWPCookieJar()
+            assert store.load_cookies(ACCOUNT, loaded)
+            assert sorted((c.name, c.value, c.domain) for c in loaded) == sorted(
+                (c.name, c.value, c.domain) for c in cookies
+            )
+            assert all(c.has_nonstandard_attr("HttpOnly") for c in loaded)
+
+    def test_file_layout(self):
+        """Tests that the file store keeps the files of earlier versions."""
+        store = FileSessionStore(self._directory.name)
+        cookies = cookielib.LWPCookieJar()
+        cookies.set_cookie(_cookie("X-APPLE-WEBAUTH-TOKEN", "token"))
+        store.save_cookies(ACCOUNT, cookies)
+        store.save_session_data(ACCOUNT, {})
+
+        assert sorted(os.listdir(self._directory.name)) == [
+            "jappleseedapplecom",
+            "jappleseedapplecom.session",
+        ]
+        legacy_cookies = cookielib.LWPCookieJar(
+            os.path.join(self._directory.name, "jappleseedapplecom")
+        )
+        legacy_cookies.load(ignore_discard=True, ignore_expires=True)
+        assert [c.value for c in legacy_cookies] == ["token"]
+
+    def test_sqlite_threads(self):
+        """Tests that the SQLite store is shared by threads and processes."""
+        filename = os.path.join(self._directory.name, "sessions.db")
+        store = SQLiteSessionStore(filename)
+        self.addCleanup(store.close)
+
+        def save(index):
+            store.save_session_data(f"user{index}@apple.com", {"index": index})
+
+        threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        connections = list(store._connections)  # pylint: disable=protected-access
+        assert len(connections) == 9
+        store.close()
+        for connection in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                connection.execute("SELECT 1")
+        assert store.load_session_data("user0@apple.com") == {"index": 0}
+        store.close()
+
+        other_store = SQLiteSessionStore(filename)
+        self.addCleanup(other_store.close)
+        for index in range(8):
+            assert other_store.load_session_data(f"user{index}@apple.com") == {
+                "index": index
+            }
+
+    def test_service(self):
+        """Tests that the service persists its session to its store."""
+        store = MemorySessionStore()
+        service = PyiCloudServiceMock(
+            AUTHENTICATED_USER, VALID_PASSWORD, session_store=store
+        )
+        service.session.flush()
+
+        assert service.session_path is None
+        assert store.load_session_data(AUTHENTICATED_USER)["session_token"]
+        assert not os.listdir(self._directory.name)